@@ -0,0 +1,266 @@
+"""
+Full-article text extraction for the crypto news bot.
+Downloads article pages and extracts the main text with trafilatura in a
+bounded process pool, caching results on disk by canonical URL. The cache
+keeps the most recently used articles only; failed extractions are retried
+after a short while instead of being cached for good.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import multiprocessing
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+def canonical_url(url):
+    """
+    Normalize an article URL for cache keys
+
+    Lowercases scheme and host, drops the fragment and tracking parameters,
+    sorts the remaining query and strips a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+def _download_and_extract(url, timeout):
+    """
+    Download a page and extract its main text (runs in a worker process)
+
+    Returns:
+        str: Extracted text, or '' when nothing usable was found
+    """
+    import requests
+    import trafilatura
+
+    response = requests.get(
+        url,
+        headers={'User-Agent': 'Mozilla/5.0 (compatible; CryptoNewsBot/1.0)'},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    text = trafilatura.extract(
+        response.text,
+        url=url,
+        include_comments=False,
+        include_tables=False
+    )
+    return text or ''
+
+class ArticleExtractor:
+    """Extracts article text off the posting thread and caches it on disk"""
+
+    def __init__(self, cache_dir='article_cache', max_workers=2, timeout=20, max_chars=6000,
+                 max_entries=2000, failure_ttl=900):
+        """
+        Args:
+            cache_dir (str): Directory holding one JSON file per article
+            max_workers (int): Worker processes for download + extraction
+            timeout (float): Download timeout and longest wait for a result
+            max_chars (int): Extracted text is cut to this length
+            max_entries (int): Articles kept on disk, least recently used go first
+            failure_ttl (float): Seconds before a failed extraction is tried again
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self.max_entries = max_entries
+        self.failure_ttl = failure_ttl
+        # Cache file paths in least recently used order
+        self.entries = OrderedDict()
+        self.enabled = trafilatura is not None
+        self.executor = None
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+
+        if not self.enabled:
+            logger.warning("trafilatura not installed, article extraction disabled")
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')]
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            self.entries[entry.path] = None
+        self._evict()
+
+    def _evict(self):
+        """Delete the least recently used cache files beyond max_entries"""
+        with self.lock:
+            stale = []
+            while len(self.entries) > self.max_entries:
+                stale.append(self.entries.popitem(last=False)[0])
+            self.evictions += len(stale)
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _touch(self, path):
+        """Mark a cache file as recently used"""
+        with self.lock:
+            self.entries[path] = None
+            self.entries.move_to_end(path)
+
+    def _cache_path(self, url):
+        """Path of the cache file for a URL"""
+        key = hashlib.sha256(canonical_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, url):
+        """Read extracted text from disk, None when not cached or a failure is due for a retry"""
+        path = self._cache_path(url)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('failed') and time.time() - data.get('failed_at', 0) >= self.failure_ttl:
+                    return None
+                self._touch(path)
+                return data.get('text', '')
+        except Exception as e:
+            logger.error(f"Error reading extraction cache for {url}: {e}")
+        return None
+
+    def _save_cached(self, url, text, failed=False):
+        """Write extracted text to disk; a failure is stored as empty text with a retry time"""
+        path = self._cache_path(url)
+        data = {
+            'url': canonical_url(url),
+            'text': text,
+            'extracted_at': datetime.now().isoformat()
+        }
+        if failed:
+            data.update(failed=True, failed_at=time.time())
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error writing extraction cache for {url}: {e}")
+            return
+        self._touch(path)
+        self._evict()
+
+    def _submit(self, url):
+        """Start extraction for a URL unless it is cached or already running"""
+        with self.lock:
+            if url in self.in_flight:
+                return self.in_flight[url]
+            if self.executor is None:
+                # spawn avoids forking a process that already runs Flask and worker threads
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            future = self.executor.submit(_download_and_extract, url, self.timeout)
+            self.in_flight[url] = future
+        # Outside the lock: the callback runs right here if the future is already done
+        future.add_done_callback(lambda done: self._finish(url, done))
+        return future
+
+    def _finish(self, url, future):
+        """Cache a finished extraction and drop it from in_flight, even if nobody waits for it"""
+        if not future.cancelled():
+            error = future.exception()
+            if error is not None:
+                with self.lock:
+                    self.failures += 1
+                logger.error(f"Article extraction failed for {url}: {error}")
+            # A failure is remembered for failure_ttl so the page is not fetched on every call
+            if error is None:
+                self._save_cached(url, future.result())
+            else:
+                self._save_cached(url, '', failed=True)
+        with self.lock:
+            if self.in_flight.get(url) is future:
+                del self.in_flight[url]
+
+    def prefetch(self, articles):
+        """
+        Queue extraction for articles that will be summarized soon
+
+        Args:
+            articles (list): Article dicts with a 'link'
+        """
+        if not self.enabled:
+            return
+        for article in articles:
+            link = article.get('link')
+            if link and self._load_cached(link) is None:
+                self._submit(link)
+
+    def get_text(self, url, timeout=None):
+        """
+        Get the extracted main text of an article
+
+        Args:
+            url (str): Article URL
+            timeout (float): Longest wait for a running extraction
+
+        Returns:
+            str: Extracted text, or None when extraction is unavailable or failed
+        """
+        if not self.enabled or not url:
+            return None
+
+        cached = self._load_cached(url)
+        with self.lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return cached[:self.max_chars] or None
+
+        future = self._submit(url)
+        try:
+            text = future.result(timeout=timeout if timeout is not None else self.timeout)
+        except TimeoutError:
+            # The done callback still caches the text once the extraction finishes
+            logger.warning(f"Article extraction still running, using feed summary: {url}")
+            return None
+        except Exception:
+            # Counted and logged by _finish
+            return None
+        return text[:self.max_chars] or None
+
+    def get_stats(self):
+        """Get extraction cache statistics"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'failures': self.failures,
+                'cached_articles': len(self.entries),
+                'evictions': self.evictions,
+                'in_flight': len(self.in_flight)
+            }
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
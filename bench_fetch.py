@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline benchmark for the fetch -> parse -> dedupe path.
+Serves synthetic RSS/Atom feeds from a local HTTP server and reports latency
+percentiles, throughput and peak memory for each fetcher. Throughput counts
+the items each cycle actually returned (the streaming scenario stops at the
+first known item), except for the not_modified scenario where nothing is
+parsed and it is requests/sec.
+
+Usage:
+    python bench_fetch.py --sizes 10,100,1000,10000 --iterations 20
+    python bench_fetch.py --format atom --scenarios rss_fetcher,streaming
+"""
+
+import os
+import sys
+import math
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import logging
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ('rss_fetcher', 'streaming', 'multi_feed', 'not_modified', 'crypto_bot_main')
+
+def make_feed(item_count, feed_format='rss'):
+    """
+    Build a synthetic feed document, newest item first
+
+    Args:
+        item_count (int): Number of items/entries
+        feed_format (str): 'rss' or 'atom'
+
+    Returns:
+        bytes: UTF-8 encoded feed
+    """
+    now = time.time()
+    parts = []
+    if feed_format == 'atom':
+        parts.append('<?xml version="1.0" encoding="utf-8"?>'
+                     '<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>')
+        for i in range(item_count):
+            updated = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now - i * 60))
+            parts.append(
+                f'<entry><id>urn:bench:{i}</id><title>Bitcoin market update number {i}</title>'
+                f'<link rel="alternate" href="https://bench.local/news/{i}"/>'
+                f'<updated>{updated}</updated>'
+                f'<summary>Bitcoin traded at ${60000 + i}.5 after {i} large transfers, '
+                f'according to on-chain data from analytics firm number {i % 17}.</summary></entry>'
+            )
+        parts.append('</feed>')
+    else:
+        parts.append('<?xml version="1.0" encoding="utf-8"?>'
+                     '<rss version="2.0"><channel><title>Bench</title>')
+        for i in range(item_count):
+            parts.append(
+                f'<item><title>Bitcoin market update number {i}</title>'
+                f'<link>https://bench.local/news/{i}</link><guid>urn:bench:{i}</guid>'
+                f'<pubDate>{formatdate(now - i * 60, usegmt=True)}</pubDate>'
+                f'<description>&lt;p&gt;Bitcoin traded at ${60000 + i}.5 after {i} large transfers, '
+                f'according to on-chain data from analytics firm number {i % 17}.&lt;/p&gt;</description></item>'
+            )
+        parts.append('</channel></rss>')
+    return ''.join(parts).encode('utf-8')
+
+class FeedServer:
+    """Local stand-in feed server serving /<format>/<items>[/<feed number>]"""
+
+    def __init__(self):
+        self.bodies = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = self.path.strip('/').split('/')
+                try:
+                    feed_format, item_count = parts[0], int(parts[1])
+                except (IndexError, ValueError):
+                    self.send_error(404)
+                    return
+
+                body, etag = server.body(feed_format, item_count)
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        # The streaming fetcher hangs up mid-body on purpose; keep the table readable
+        self.httpd.handle_error = lambda request, client_address: None
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def body(self, feed_format, item_count):
+        """Get (and memoize) a feed body with its ETag"""
+        key = (feed_format, item_count)
+        with self.lock:
+            if key not in self.bodies:
+                body = make_feed(item_count, feed_format)
+                self.bodies[key] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            return self.bodies[key]
+
+    def url(self, feed_format, item_count, feed_number=0):
+        """URL of a synthetic feed"""
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/{feed_format}/{item_count}/{feed_number}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def dedupe(articles, posted_ids, index):
+    """The bot's dedupe step: exact id check, then near-duplicate lookup"""
+    from near_duplicate import article_fingerprint
+    fresh = []
+    for article in articles:
+        if article['id'] in posted_ids:
+            continue
+        fingerprint = article_fingerprint(article)
+        if index.find(fingerprint) is None:
+            index.add(article['id'], fingerprint)
+            fresh.append(article)
+    return fresh
+
+def build_scenario(name, server, item_count, feed_format, feeds):
+    """
+    Build a zero-argument callable running one fetch -> parse -> dedupe cycle
+
+    Returns:
+        callable: Returns the number of items the cycle parsed and handed on
+    """
+    from near_duplicate import NearDuplicateIndex
+    from rss_fetcher import RSSFetcher
+    from feed_cache import FeedValidatorCache
+
+    url = server.url(feed_format, item_count)
+    # Steady state: everything except the newest five items was posted before
+    posted_ids = {f"urn:bench:{i}" for i in range(5, item_count)}
+
+    if name == 'rss_fetcher':
+        fetcher = RSSFetcher([url], max_articles=item_count)
+        return lambda: len(dedupe(fetcher.fetch_latest(), set(), NearDuplicateIndex()))
+
+    if name == 'streaming':
+        fetcher = RSSFetcher([url], max_articles=item_count, streaming=True)
+        return lambda: len(dedupe(
+            fetcher.fetch_latest(is_known=posted_ids.__contains__), posted_ids, NearDuplicateIndex()
+        ))
+
+    if name == 'multi_feed':
+        urls = [server.url(feed_format, item_count, n) for n in range(feeds)]
+        fetcher = RSSFetcher(urls, max_articles=item_count, max_workers=feeds)
+        return lambda: len(dedupe(fetcher.fetch_latest(), set(), NearDuplicateIndex()))
+
+    if name == 'not_modified':
+        cache = FeedValidatorCache(os.path.join(tempfile.mkdtemp(), 'validators.json'))
+        fetcher = RSSFetcher([url], max_articles=item_count, validator_cache=cache)
+        fetcher.fetch_latest()
+        cache.commit()
+        return lambda: len(fetcher.fetch_latest())
+
+    if name == 'crypto_bot_main':
+        # Import inside a scratch directory: the bot reads and writes JSON state in cwd
+        os.chdir(tempfile.mkdtemp())
+        from crypto_bot_main import CryptoNewsBot
+        bot = CryptoNewsBot()
+        bot.rss_url = url
+
+        def run():
+            articles = bot.fetch_rss_news() or []
+            fresh = [a for a in articles if not bot.is_article_posted(a['id'])]
+            return len(fresh)
+        return run
+
+    raise ValueError(f"unknown scenario: {name}")
+
+def run_benchmark(name, server, item_count, feed_format, iterations, feeds):
+    """
+    Time one scenario
+
+    Returns:
+        dict: Latency percentiles in ms, what one cycle handled and the
+            throughput per second with its unit (items the cycle returned, or
+            requests for not_modified) and peak traced memory in KiB
+    """
+    cycle = build_scenario(name, server, item_count, feed_format, feeds)
+    cycle()  # warm-up: connection pool, imports, caches
+
+    latencies = []
+    handled = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        handled += cycle()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if name == 'not_modified':
+        # A 304 reply parses nothing, so count requests rather than items
+        handled, unit = iterations, 'req'
+    else:
+        unit = 'items'
+    return {
+        'p50_ms': percentile(latencies, 0.50),
+        'p90_ms': percentile(latencies, 0.90),
+        'p99_ms': percentile(latencies, 0.99),
+        'per_cycle': handled / iterations if iterations else 0.0,
+        'per_sec': handled / elapsed if elapsed else 0.0,
+        'unit': unit,
+        'peak_kib': peak / 1024
+    }
+
+def main(argv=None):
+    """Parse arguments, run every scenario/size pair and print a table"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,100,1000,10000', help='comma-separated items per feed')
+    parser.add_argument('--iterations', type=int, default=20, help='timed cycles per scenario')
+    parser.add_argument('--format', dest='feed_format', choices=('rss', 'atom'), default='rss')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS[:4]),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument('--feeds', type=int, default=30, help='feeds in the multi_feed scenario')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    scenarios = [name for name in args.scenarios.split(',') if name]
+
+    header = f"{'scenario':<16}{'items':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'per cycle':>11}{'per sec':>12}{'unit':>6}{'peak KiB':>11}"
+    print(header)
+    print('-' * len(header))
+    with FeedServer() as server:
+        for name in scenarios:
+            for item_count in sizes:
+                result = run_benchmark(name, server, item_count, args.feed_format, args.iterations, args.feeds)
+                print(
+                    f"{name:<16}{item_count:>7}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['per_cycle']:>11.0f}{result['per_sec']:>12.0f}{result['unit']:>6}{result['peak_kib']:>11.0f}"
+                )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
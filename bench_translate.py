@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latency benchmark for the translation backends.
+Translates a synthetic crypto-news corpus with each backend and reports
+latency percentiles, throughput and failures.
+
+Usage:
+    python bench_translate.py --backends dictionary
+    python bench_translate.py --backends dictionary --glossary my_glossary.json
+    python bench_translate.py --backends google,dictionary --dest ps --texts 50 --concurrency 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from bench_fetch import percentile
+from translation_backends import create_translation_backends, TranslationBackendError
+
+TEMPLATES = (
+    "Bitcoin price rose {n}% to ${p} on {day}, according to data from exchanges.",
+    "Ethereum developers confirmed the next network upgrade for block {p}.",
+    "Crypto market capitalization fell {n}% as traders moved to stablecoins.",
+    "The exchange reported {n} million dollars in daily trading volume on {day}.",
+)
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+# Seed glossary shipped with the bot; it covers the en-ps corpus above
+DEFAULT_GLOSSARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translation_glossary.json')
+
+def make_corpus(count):
+    """Build count distinct news-like sentences"""
+    return [
+        TEMPLATES[i % len(TEMPLATES)].format(n=i % 17 + 1, p=60000 + i * 13, day=DAYS[i % len(DAYS)])
+        for i in range(count)
+    ]
+
+def run_backend(backend, texts, dest, concurrency):
+    """
+    Translate every text with one backend
+
+    Returns:
+        dict: Latency percentiles in ms, texts/sec and failure count
+    """
+    def timed(text):
+        t0 = time.perf_counter()
+        try:
+            backend.translate(text, dest)
+            ok = True
+        except TranslationBackendError:
+            ok = False
+        return (time.perf_counter() - t0) * 1000, ok
+
+    try:
+        backend.translate(texts[0], dest)  # warm-up: worker start, imports
+    except TranslationBackendError:
+        pass
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, texts))
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for ms, _ in results]
+    return {
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'texts_per_sec': len(texts) / elapsed if elapsed else 0.0,
+        'failures': sum(1 for _, ok in results if not ok)
+    }
+
+def main(argv=None):
+    """Parse arguments, benchmark each backend and print a table"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', default='dictionary', help='comma-separated backend names')
+    parser.add_argument('--dest', default='ps', help='target language code')
+    parser.add_argument('--texts', type=int, default=200, help='sentences to translate')
+    parser.add_argument('--concurrency', type=int, default=4, help='callers translating at once')
+    parser.add_argument('--timeout', type=float, default=10, help='per-call timeout in seconds')
+    parser.add_argument('--glossary', default=DEFAULT_GLOSSARY, help='glossary for the dictionary backend')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    texts = make_corpus(args.texts)
+
+    header = f"{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'texts/s':>10}{'failed':>8}"
+    print(header)
+    print('-' * len(header))
+    for backend in create_translation_backends(
+        args.backends, timeout=args.timeout, max_concurrency=args.concurrency, glossary_path=args.glossary
+    ):
+        try:
+            result = run_backend(backend, texts, args.dest, args.concurrency)
+        finally:
+            backend.close()
+        print(
+            f"{backend.name:<12}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}{result['texts_per_sec']:>10.1f}{result['failures']:>8}"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,117 +8,370 @@ import threading
 import logging
 from datetime import datetime
 from rss_fetcher import RSSFetcher
+from feed_cache import FeedValidatorCache
+from poll_scheduler import AdaptivePollScheduler
+from websub import WebSubSubscriber
+from circuit_breaker import get_breaker_registry
+from near_duplicate import NearDuplicateIndex, article_fingerprint, batch_duplicates
+from persistent_cache import PersistentCache
+from translation_backends import create_translation_backends
+from translation import TranslationService, NOT_TRANSLATED
+from rate_governor import TranslationDeferred
+from message_renderer import MessageRenderer, MessageRenderError, escape
+from deadline import Deadline, DeadlineExceeded
+from send_queue import create_send_queue, create_telegram_sender
+from broadcast import BroadcastRouter
 from storage import NewsStorage
 from config import Config
-import requests
-from googletrans import Translator
+from http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 class TelegramAPI:
     """Handles Telegram Bot API interactions"""
     
-    def __init__(self, bot_token):
+    def __init__(self, bot_token, http_client=None, breakers=None, send_queue=None):
         self.bot_token = bot_token
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.http = http_client or get_http_client()
+        self.breakers = breakers or get_breaker_registry()
+        self.send_queue = send_queue
+        # Validation, breaker, deadline and 429 handling shared with the other bots
+        self.send = create_telegram_sender(self.base_url, send_queue, self.http, self.breakers)
     
-    def send_message(self, chat_id, text, parse_mode='HTML'):
-        """Send message to Telegram chat/channel"""
-        url = f"{self.base_url}/sendMessage"
-        data = {
-            'chat_id': chat_id,
-            'text': text,
-            'parse_mode': parse_mode,
-            'disable_web_page_preview': False
-        }
+    def is_available(self, chat_id):
+        """Check whether the chat's circuit currently accepts messages"""
+        return not self.breakers.get(f"telegram:{chat_id}").is_open()
+    
+    def send_message(self, chat_id, text, parse_mode='HTML', deadline=None):
+        """
+        Send message to Telegram chat/channel
         
-        try:
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send message to Telegram: {e}")
-            return None
+        Returns:
+            dict: Telegram's reply, None when nothing was sent
+            
+        Raises:
+            DeadlineExceeded: When the article's time budget is already spent
+        """
+        return self.send(chat_id, text, deadline, parse_mode)
 
 class CryptoNewsBot:
     """Main bot class that coordinates RSS fetching and Telegram posting"""
     
     def __init__(self):
         self.config = Config()
-        self.rss_fetcher = RSSFetcher(self.config.RSS_URL)
+        self.http = get_http_client()
+        self.breakers = get_breaker_registry()
+        self.feed_cache = FeedValidatorCache()
+        self.pipeline_lock = threading.Lock()
+        self.websub = None
+        if self.config.WEBSUB_CALLBACK_URL:
+            self.websub = WebSubSubscriber(
+                self.config.WEBSUB_CALLBACK_URL, self.handle_pushed_articles, http_client=self.http
+            )
+        self.rss_fetcher = RSSFetcher(
+            self.config.RSS_URLS,
+            timeout=self.config.FEED_TIMEOUT,
+            max_workers=self.config.FEED_WORKERS,
+            max_articles=self.config.MAX_ARTICLES_PER_CHECK,
+            validator_cache=self.feed_cache,
+            http_client=self.http,
+            websub=self.websub,
+            breakers=self.breakers,
+            streaming=self.config.STREAMING_PARSE
+        )
+        self.scheduler = AdaptivePollScheduler(
+            default_interval=self.config.CHECK_INTERVAL,
+            min_interval=self.config.MIN_CHECK_INTERVAL,
+            max_interval=self.config.MAX_CHECK_INTERVAL
+        )
         self.storage = NewsStorage()
-        self.telegram = TelegramAPI(self.config.BOT_TOKEN)
-        self.translator = Translator()
+        self.near_duplicates = NearDuplicateIndex(self.config.NEAR_DUPLICATE_DISTANCE)
+        self.near_duplicates.rebuild(self.storage.posted_articles)
+        # Per-chat and global Telegram rate limits replace fixed sleeps between posts
+        self.send_queue = create_send_queue()
+        self.telegram = TelegramAPI(self.config.BOT_TOKEN, self.http, self.breakers, self.send_queue)
+        self.translation_backends = create_translation_backends(
+            self.config.TRANSLATION_BACKEND,
+            timeout=self.config.TRANSLATION_TIMEOUT,
+            max_concurrency=self.config.TRANSLATION_CONCURRENCY,
+            glossary_path=self.config.TRANSLATION_GLOSSARY
+        )
+        self.translation_cache = PersistentCache(
+            self.config.TRANSLATION_CACHE_FILE,
+            max_entries=self.config.TRANSLATION_CACHE_SIZE,
+            max_age=self.config.TRANSLATION_CACHE_DAYS * 24 * 3600
+        )
+        self.translation = TranslationService(
+            self.translation_backends, self.translation_cache, self.breakers,
+            max_workers=self.config.TRANSLATION_WORKERS
+        )
+        self.language_channels = self.config.LANGUAGE_CHANNELS
+        # One processed article fans out to every matching channel
+        if self.config.BROADCAST_CHANNELS:
+            self.broadcast = BroadcastRouter(self.config.BROADCAST_CHANNELS)
+        else:
+            self.broadcast = BroadcastRouter.from_language_channels(self.language_channels)
+        self.renderer = MessageRenderer()
         self.running = False
         
-    def translate_to_pashto(self, text):
-        """Translate text to Pashto using Google Translate"""
-        try:
-            # Google Translate API call to translate to Pashto
-            translation = self.translator.translate(text, dest='ps', src='en')
-            return translation.text
-        except Exception as e:
-            logger.error(f"Translation error: {e}")
+    def translate_text(self, text, language='ps', deadline=None, translated=NOT_TRANSLATED):
+        """
+        Translate English text to a target language
+        
+        A translated result the caller already has (None when it failed) is
+        used as is instead of asking the backends again.
+        """
+        # Cached translations (including ones pre-translated in a batch) cost no request
+        if translated is NOT_TRANSLATED:
+            translated = self.translation.translate(text, dest=language, deadline=deadline)
+        if translated is None:
             # Return original text if translation fails
             return f"[Translation unavailable] {text}"
+        return translated
+    
+    def translate_to_pashto(self, text):
+        """Translate text to Pashto with the configured backends"""
+        return self.translate_text(text, 'ps')
     
-    def format_news_message(self, article):
-        """Format article data into Telegram message with English and Pashto"""
+    def format_news_message(self, article, language='ps', translated=NOT_TRANSLATED, deadline=None):
+        """Format article data into Telegram message with English and translated title"""
         title_en = article.get('title', 'No title')
         link = article.get('link', '')
         
-        # Translate title to Pashto
-        title_ps = self.translate_to_pashto(title_en)
+        # Translate title (unless translated already; a failed result is final)
+        title_translated = self.translate_text(title_en, language, deadline, translated)
         
-        # Create message with new format: English title, Pashto title, link
+        # Create message with new format: English title, translated title, link
         message = f"""
-📰 {title_en}
-📘 {title_ps}
-🔗 {link}
+📰 {escape(title_en)}
+📘 {escape(title_translated)}
+🔗 {escape(link)}
         """.strip()
         
         return message
     
-    def post_article(self, article):
-        """Post single article to Telegram channel"""
+    def pending_channels(self, article_id):
+        """Channels this article has not been posted to yet"""
+        return self.storage.pending_channels(article_id, self.broadcast.channels)
+    
+    def is_posted(self, article_id):
+        """Check whether an article reached every channel it is meant for"""
+        return not self.pending_channels(article_id)
+    
+    def any_channel_available(self):
+        """Check whether at least one target channel accepts messages"""
+        return any(self.telegram.is_available(channel) for channel in self.broadcast.channels)
+    
+    def pretranslate_titles(self, articles):
+        """
+        Translate the titles of all postable articles, one batch per language in parallel
+        
+        The results, failures included, are kept in article['translations']
+        so posting does not ask the backends again.
+        """
+        if not self.any_channel_available():
+            return
+        postable = [
+            a for a in articles
+            if not self.is_posted(a.get('id') or a.get('link', ''))
+            and not self.is_near_duplicate(a.get('id') or a.get('link', ''), a)
+        ]
+        if not postable:
+            return
         try:
-            message = self.format_news_message(article)
-            result = self.telegram.send_message(
-                self.config.CHANNEL_USERNAME, 
-                message
+            batches = self.translation.translate_batch_many(
+                [a.get('title', 'No title') for a in postable], self.broadcast.languages
             )
+        except TranslationDeferred as e:
+            # Each article will ask again and be deferred if the budget is still spent
+            logger.warning(f"Title pre-translation deferred: {e}")
+            return
+        for language, translations in batches.items():
+            for article, translated in zip(postable, translations):
+                article.setdefault('translations', {})[language] = translated
+    
+    def is_near_duplicate(self, article_id, article):
+        """Find the posted story this article duplicates, if any"""
+        duplicate_of = self.near_duplicates.find(article_fingerprint(article))
+        # An article already posted to some channels matches itself
+        return duplicate_of if duplicate_of != article_id else None
+    
+    def drop_batch_duplicates(self, articles):
+        """
+        Keep only the first copy of a story that several feeds delivered at once
+        
+        Later copies are left out before translation; once the first copy is
+        posted, a later fetch records them as near-duplicates of it.
+        """
+        copies = batch_duplicates(
+            [a for a in articles if not self.is_posted(a.get('id') or a.get('link', ''))],
+            self.config.NEAR_DUPLICATE_DISTANCE
+        )
+        if copies:
+            logger.info(f"Leaving out {len(copies)} copies of stories in this batch")
+        return [a for a in articles if (a.get('id') or a.get('link', '')) not in copies]
+    
+    def skip_if_near_duplicate(self, article_id, article):
+        """Record and skip a story that another source already delivered"""
+        duplicate_of = self.is_near_duplicate(article_id, article)
+        if not duplicate_of:
+            return False
+        self.storage.mark_as_duplicate(article_id, article, duplicate_of)
+        logger.info(f"Skipping near-duplicate of {duplicate_of}: {article.get('title', 'Unknown')}")
+        return True
+    
+    def mark_posted(self, article_id, article, channel=None, targets=None):
+        """Store a posted article and index its fingerprint"""
+        fingerprint = article_fingerprint(article)
+        self.storage.mark_as_posted(article_id, article, fingerprint, channel, targets)
+        self.near_duplicates.add(article_id, fingerprint)
+    
+    def post_article(self, article):
+        """
+        Broadcast single article to every matching channel still missing it
+        
+        The title translations for all pending languages run concurrently.
+        Each language is rendered once and sent to all of its channels
+        concurrently through the send queue, each channel at its own rate and
+        with its own posted state. Rendered messages are kept until delivered,
+        so a retry skips the translation and resumes after the last sent part.
+        Translation and sending share one ARTICLE_TIME_BUDGET deadline; an
+        article that runs out of time is left for the next check.
+        
+        Returns:
+            bool: True once the article reached every channel
             
-            if result and result.get('ok'):
-                logger.info(f"Successfully posted: {article.get('title', 'Unknown')}")
+        Raises:
+            TranslationDeferred: When the translation budget is spent; nothing
+                was sent and the article should be retried later
+        """
+        deadline = Deadline(self.config.ARTICLE_TIME_BUDGET)
+        try:
+            article_id = article.get('id') or article.get('link', '')
+            targets = self.broadcast.channels_for(article)
+            if not targets:
+                # No channel's topics match: record it so it is not checked again
+                self.mark_posted(article_id, article, targets=[])
+                logger.info(f"No channel wants this article: {article.get('title', 'Unknown')}")
                 return True
-            else:
-                logger.error(f"Failed to post article: {result}")
-                return False
+            routes = self.broadcast.route(article, self.pending_channels(article_id))
+            languages = list(routes)
+            rendered = {language: self.renderer.get((article_id, language)) for language in languages}
+            missing = [language for language in languages if rendered[language] is None]
+            if missing:
+                # Batch results, failed ones included, are not asked for again
+                translations = dict(article.get('translations', {}))
+                untried = [language for language in missing if language not in translations]
+                if untried:
+                    translations.update(self.translation.translate_many(article.get('title', 'No title'), untried, deadline))
+                for language in missing:
+                    message = self.format_news_message(article, language, translations.get(language), deadline)
+                    try:
+                        rendered[language] = self.renderer.render((article_id, language), message)
+                    except MessageRenderError as e:
+                        logger.error(f"Could not render {language} message: {e}")
+            
+            def send(channel, part):
+                result = self.telegram.send_message(channel, part, deadline=deadline)
+                if not (result and result.get('ok')):
+                    logger.error(f"Failed to post article to {channel}: {result}")
+                    return False
+                return True
+            
+            posted_all = True
+            deliveries = {}
+            for language, channels in routes.items():
+                entry = rendered[language]
+                for channel in channels:
+                    if entry is None or not self.telegram.is_available(channel):
+                        posted_all = False
+                        continue
+                    deliveries[(language, channel)] = self.send_queue.submit(
+                        channel, entry['parts'][entry['sent'].get(channel, 0):],
+                        lambda part, channel=channel: send(channel, part)
+                    )
+            
+            for (language, channel), delivery in deliveries.items():
+                entry = rendered[language]
+                # A retry resumes after the last delivered part
+                entry['sent'][channel] = entry['sent'].get(channel, 0) + delivery.result()
+                if entry['sent'][channel] == len(entry['parts']):
+                    self.mark_posted(article_id, article, channel, targets)
+                    logger.info(f"Successfully posted to {channel}: {article.get('title', 'Unknown')}")
+                else:
+                    posted_all = False
+            
+            # A rendering is dropped once every channel of its language has it
+            for language, channels in routes.items():
+                entry = rendered[language]
+                if entry is not None and all(entry['sent'].get(channel, 0) == len(entry['parts']) for channel in channels):
+                    self.renderer.forget((article_id, language))
+            return posted_all
                 
+        except TranslationDeferred:
+            raise
+        except DeadlineExceeded as e:
+            logger.warning(f"Article time budget spent, retrying next check: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error posting article: {e}")
             return False
     
-    def check_and_post_news(self):
-        """Check RSS feed and post new articles"""
+    def check_and_post_news(self, feed_urls=None):
+        """Check RSS feeds (all, or only the given due feeds) and post new articles"""
         try:
             logger.info("Checking for new crypto news...")
-            articles = self.rss_fetcher.fetch_latest()
+            feed_urls = feed_urls if feed_urls is not None else self.config.RSS_URLS
+            articles = self.rss_fetcher.fetch_latest(feed_urls, is_known=self.is_posted)
+            
+            # Feed publish times drive each feed's next poll
+            for url in feed_urls:
+                self.scheduler.observe(
+                    url,
+                    [a for a in articles if a.get('source') == url],
+                    push_active=bool(self.websub and self.websub.is_active(url))
+                )
             
             if not articles:
-                logger.warning("No articles fetched from RSS feed")
+                self.feed_cache.commit()
+                logger.info("No new articles fetched from RSS feeds")
                 return
             
+            articles = self.drop_batch_duplicates(articles)
+            self.pretranslate_titles(articles)
+            
             new_count = 0
+            failed_count = 0
             for article in articles:
                 article_id = article.get('id') or article.get('link', '')
                 
-                if not self.storage.is_duplicate(article_id):
-                    if self.post_article(article):
-                        self.storage.mark_as_posted(article_id, article)
+                if not self.is_posted(article_id):
+                    # Near-duplicates are dropped before the translate call
+                    if self.skip_if_near_duplicate(article_id, article):
+                        continue
+                    # Don't translate articles when every chat is failing
+                    if not self.any_channel_available():
+                        logger.warning("Telegram circuit open, deferring remaining articles")
+                        failed_count += 1
+                        break
+                    try:
+                        posted = self.post_article(article)
+                    except TranslationDeferred as e:
+                        # Better late than untranslated: retry on a later check
+                        logger.warning(f"Translation budget spent ({e}), deferring remaining articles")
+                        failed_count += 1
+                        break
+                    if posted:
                         new_count += 1
-                        # Add delay between posts to avoid rate limiting
-                        time.sleep(2)
+                    else:
+                        failed_count += 1
+            
+            # Only trust 304s once every article of this fetch was posted
+            if failed_count:
+                self.feed_cache.discard()
+            else:
+                self.feed_cache.commit()
             
             if new_count > 0:
                 logger.info(f"Posted {new_count} new articles")
@@ -128,13 +381,40 @@ class CryptoNewsBot:
         except Exception as e:
             logger.error(f"Error in check_and_post_news: {e}")
     
+    def handle_pushed_articles(self, feed_url, articles):
+        """Post articles delivered by a WebSub push"""
+        with self.pipeline_lock:
+            articles = self.drop_batch_duplicates(articles)
+            self.pretranslate_titles(articles)
+            new_count = 0
+            for article in articles:
+                article_id = article.get('id') or article.get('link', '')
+                if not self.any_channel_available():
+                    logger.warning("Telegram circuit open, pushed articles left for polling")
+                    break
+                if self.is_posted(article_id) or self.skip_if_near_duplicate(article_id, article):
+                    continue
+                try:
+                    posted = self.post_article(article)
+                except TranslationDeferred as e:
+                    logger.warning(f"Translation budget spent ({e}), pushed articles left for polling")
+                    break
+                if posted:
+                    new_count += 1
+            logger.info(f"Posted {new_count} pushed articles from {feed_url}")
+    
     def run_periodic_check(self):
-        """Run periodic RSS checks every 10 minutes"""
+        """Poll each feed when the adaptive scheduler says it is due"""
         while self.running:
             try:
-                self.check_and_post_news()
-                # Wait 10 minutes (600 seconds)
-                time.sleep(600)
+                due_feeds = self.scheduler.due_feeds(self.config.RSS_URLS)
+                if due_feeds:
+                    with self.pipeline_lock:
+                        self.check_and_post_news(due_feeds)
+                
+                delay = self.scheduler.seconds_until_next(self.config.RSS_URLS)
+                logger.debug(f"Next feed due in {delay:.0f}s")
+                time.sleep(max(1, delay))
             except Exception as e:
                 logger.error(f"Error in periodic check: {e}")
                 # Wait 1 minute before retrying on error
@@ -155,8 +435,9 @@ class CryptoNewsBot:
         
         self.running = True
         
-        # Do initial check
-        self.check_and_post_news()
+        # Do initial check (also seeds the scheduler for every feed)
+        with self.pipeline_lock:
+            self.check_and_post_news()
         
         # Start periodic checking
         self.run_periodic_check()
@@ -165,3 +446,6 @@ class CryptoNewsBot:
         """Stop the bot"""
         logger.info("Stopping Crypto News Bot...")
         self.running = False
+        self.rss_fetcher.close()
+        self.translation.close()
+        self.send_queue.close()
@@ -0,0 +1,128 @@
+"""
+Broadcast routing for the crypto news bot.
+Maps one processed article to every channel that should receive it. Each
+channel has a language and optional topic keywords, so an article is
+summarized and translated once, rendered once per language and fanned out
+to all matching channels.
+"""
+
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BroadcastTarget:
+    """One channel with its language and the topics it wants (none = everything)"""
+
+    def __init__(self, language, channel, topics=()):
+        """
+        Args:
+            language (str): Language code the channel is posted in
+            channel (str): Chat id or @username
+            topics (iterable): Keywords an article must mention, empty for all
+        """
+        self.language = language
+        self.channel = channel
+        self.topics = tuple(topic.lower() for topic in topics if topic)
+        self.pattern = None
+        if self.topics:
+            self.pattern = re.compile(
+                r'\b(?:' + '|'.join(re.escape(topic) for topic in self.topics) + r')\b',
+                re.IGNORECASE
+            )
+
+    def matches(self, article):
+        """Check whether the article's title or summary mentions one of the topics"""
+        if self.pattern is None:
+            return True
+        text = f"{article.get('title', '')} {article.get('summary', '')}"
+        return bool(self.pattern.search(text))
+
+    def describe(self):
+        """Target as a dict for /stats"""
+        return {'channel': self.channel, 'language': self.language, 'topics': list(self.topics)}
+
+def parse_broadcast_channels(value):
+    """
+    Parse a BROADCAST_CHANNELS setting such as
+    "ps:@news_ps,ps:@btc_ps:bitcoin|btc,fa:@news_fa"
+
+    Each entry is language:channel with an optional :topic|topic suffix.
+    A language may appear any number of times; a channel only once.
+
+    Args:
+        value (str): Comma-separated entries
+
+    Returns:
+        list: BroadcastTarget per channel, in configured order (empty when
+            the setting is empty)
+    """
+    targets = []
+    seen = set()
+    for entry in (value or '').split(','):
+        if not entry.strip():
+            continue
+        language, _, rest = entry.strip().partition(':')
+        # Outside a t.me URL's scheme, the next ':' starts the topic list
+        scheme, separator, address = rest.partition('://')
+        if separator:
+            address, _, topics = address.partition(':')
+            channel = scheme + separator + address
+        else:
+            channel, _, topics = rest.partition(':')
+        language, channel = language.strip(), channel.strip()
+        if not language or not channel:
+            logger.warning(f"Ignoring malformed broadcast channel entry: {entry!r}")
+            continue
+        if channel in seen:
+            logger.warning(f"Channel {channel} is configured more than once, keeping the first entry")
+            continue
+        seen.add(channel)
+        targets.append(BroadcastTarget(language, channel, [t.strip() for t in topics.split('|')]))
+    return targets
+
+class BroadcastRouter:
+    """Decides which channels, grouped by language, receive an article"""
+
+    def __init__(self, targets):
+        """
+        Args:
+            targets (list): BroadcastTarget instances
+        """
+        self.targets = list(targets)
+        self.channels = [target.channel for target in self.targets]
+        # Unique languages in configured order
+        self.languages = list(dict.fromkeys(target.language for target in self.targets))
+
+    @classmethod
+    def from_language_channels(cls, language_channels):
+        """Router with one channel per language and no topics (LANGUAGE_CHANNELS)"""
+        return cls(BroadcastTarget(language, channel) for language, channel in language_channels.items())
+
+    def channels_for(self, article):
+        """Channels whose topics match the article"""
+        return [target.channel for target in self.targets if target.matches(article)]
+
+    def route(self, article, pending=None):
+        """
+        Group the article's channels by language
+
+        Args:
+            article (dict): Article with title and summary
+            pending (iterable): Only keep these channels, None keeps all
+
+        Returns:
+            dict: Language -> list of channels, in configured order
+        """
+        pending = None if pending is None else set(pending)
+        routes = {}
+        for target in self.targets:
+            if pending is not None and target.channel not in pending:
+                continue
+            if target.matches(article):
+                routes.setdefault(target.language, []).append(target.channel)
+        return routes
+
+    def get_stats(self):
+        """Get the configured targets for /stats"""
+        return [target.describe() for target in self.targets]
@@ -0,0 +1,218 @@
+"""
+Circuit breakers for the crypto news bot's external endpoints.
+Stops calling a failing feed, Telegram chat, translator or LLM until a
+jittered exponential backoff has passed, then lets one probe call through.
+"""
+
+import os
+import time
+import random
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its circuit is open"""
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one external endpoint"""
+
+    def __init__(self, name, failure_threshold=3, base_delay=30, max_delay=1800):
+        """
+        Args:
+            name (str): Endpoint name shown in logs and stats
+            failure_threshold (int): Consecutive failures that open the circuit
+            base_delay (float): First open period in seconds
+            max_delay (float): Longest open period in seconds
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+
+    def _backoff(self):
+        """Exponential backoff with equal jitter (half fixed, half random)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** self.open_count))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def is_open(self):
+        """
+        Check without side effects whether calls would be refused right now
+
+        Returns:
+            bool: True while open and the backoff has not yet expired
+        """
+        with self.lock:
+            if self.state == OPEN:
+                return time.time() < self.open_until
+            return self.state == HALF_OPEN and self.probe_in_flight
+
+    def allow(self):
+        """
+        Ask permission for a call
+
+        After the backoff expires the breaker goes half-open and admits exactly
+        one probe call; its result closes or re-opens the circuit.
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self.lock:
+            if self.state == OPEN and time.time() >= self.open_until:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+                logger.info(f"Circuit {self.name} half-open, probing")
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+
+            self.total_rejected += 1
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.open_count = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        """Count a failed call and open the circuit when the threshold is hit"""
+        with self.lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._open(self._backoff())
+
+    def release(self):
+        """
+        End a call whose outcome says nothing about the endpoint's health
+
+        Neither closes nor opens the circuit; a half-open breaker lets the
+        next call probe instead.
+        """
+        with self.lock:
+            self.probe_in_flight = False
+
+    def trip(self, delay, reason=''):
+        """
+        Open the circuit right away for a known period
+
+        Used when the endpoint says how long to stay away (quota exhausted,
+        Retry-After) instead of waiting for the failure threshold.
+
+        Args:
+            delay (float): Seconds to keep the circuit open
+            reason (str): Why, for the log
+        """
+        with self.lock:
+            self.total_failures += 1
+            self.state = OPEN
+            self.open_until = time.time() + delay
+            self.probe_in_flight = False
+            logger.warning(f"Circuit {self.name} tripped for {delay:.0f}s{': ' + reason if reason else ''}")
+
+    def _open(self, delay):
+        """Open the circuit for the given number of seconds (lock held)"""
+        self.state = OPEN
+        self.open_until = time.time() + delay
+        self.open_count += 1
+        self.probe_in_flight = False
+        logger.warning(f"Circuit {self.name} open for {delay:.0f}s after {self.consecutive_failures} failures")
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func through the breaker
+
+        Raises:
+            CircuitOpenError: When the circuit refuses the call
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"circuit {self.name} is open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def get_stats(self):
+        """Get breaker state for /stats"""
+        with self.lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in': max(0, round(self.open_until - time.time())) if self.state == OPEN else 0,
+                'total_failures': self.total_failures,
+                'total_rejected': self.total_rejected
+            }
+
+class CircuitBreakerRegistry:
+    """Creates and tracks one breaker per endpoint name"""
+
+    def __init__(self, failure_threshold=3, base_delay=30, max_delay=1800):
+        self.defaults = {
+            'failure_threshold': failure_threshold,
+            'base_delay': base_delay,
+            'max_delay': max_delay
+        }
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def get(self, name, **overrides):
+        """
+        Get the breaker for an endpoint, creating it on first use
+
+        Args:
+            name (str): Endpoint name such as 'feed:<url>' or 'telegram:<chat>'
+            **overrides: Settings that differ from the registry defaults
+        """
+        with self.lock:
+            if name not in self.breakers:
+                settings = dict(self.defaults, **overrides)
+                self.breakers[name] = CircuitBreaker(name, **settings)
+            return self.breakers[name]
+
+    def get_stats(self):
+        """Get the state of every breaker"""
+        return {name: breaker.get_stats() for name, breaker in list(self.breakers.items())}
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_breaker_registry():
+    """
+    Get the process-wide breaker registry
+
+    Defaults come from BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_DELAY and
+    BREAKER_MAX_DELAY environment variables.
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = CircuitBreakerRegistry(
+                failure_threshold=int(os.getenv('BREAKER_FAILURE_THRESHOLD', '3')),
+                base_delay=float(os.getenv('BREAKER_BASE_DELAY', '30')),
+                max_delay=float(os.getenv('BREAKER_MAX_DELAY', '1800'))
+            )
+        return _shared_registry
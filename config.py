@@ -5,6 +5,8 @@ Handles environment variables and default settings.
 
 import os
 import logging
+from translation import parse_language_channels
+from broadcast import parse_broadcast_channels
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +20,47 @@ class Config:
         
         # RSS Feed Configuration
         self.RSS_URL = os.getenv('RSS_URL', 'https://cointelegraph.com/rss')
+        self.RSS_URLS = self._parse_list(os.getenv('RSS_URLS', '')) or [self.RSS_URL]
+        self.FEED_TIMEOUT = int(os.getenv('FEED_TIMEOUT', '15'))
+        self.FEED_WORKERS = int(os.getenv('FEED_WORKERS', '8'))
+        self.STREAMING_PARSE = os.getenv('STREAMING_PARSE', 'false').lower() == 'true'
+        
+        # WebSub push configuration (public URL of the /websub route, empty disables push)
+        self.WEBSUB_CALLBACK_URL = os.getenv('WEBSUB_CALLBACK_URL', '')
         
         # Bot Behavior Configuration
         self.CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', '600'))  # 10 minutes
+        self.MIN_CHECK_INTERVAL = int(os.getenv('MIN_CHECK_INTERVAL', '60'))
+        self.MAX_CHECK_INTERVAL = int(os.getenv('MAX_CHECK_INTERVAL', '1800'))
         self.MAX_ARTICLES_PER_CHECK = int(os.getenv('MAX_ARTICLES_PER_CHECK', '10'))
         
+        # Near-duplicate detection (max SimHash bit distance between copies of a story)
+        self.NEAR_DUPLICATE_DISTANCE = int(os.getenv('NEAR_DUPLICATE_DISTANCE', '7'))
+        
+        # Target languages, each posted to its own channel ("ps:@news_ps,fa:@news_fa,ur:@news_ur")
+        self.LANGUAGE_CHANNELS = parse_language_channels(
+            os.getenv('LANGUAGE_CHANNELS', ''), self.CHANNEL_USERNAME
+        )
+        self.TRANSLATION_WORKERS = int(os.getenv('TRANSLATION_WORKERS', '3'))
+        
+        # Broadcast: several channels per language, optionally limited to topics
+        # ("ps:@news_ps,ps:@btc_ps:bitcoin|btc,fa:@news_fa"); empty uses LANGUAGE_CHANNELS
+        self.BROADCAST_CHANNELS = parse_broadcast_channels(os.getenv('BROADCAST_CHANNELS', ''))
+        
+        # Translation backends, tried in order (google, dictionary)
+        self.TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND', 'google')
+        self.TRANSLATION_TIMEOUT = float(os.getenv('TRANSLATION_TIMEOUT', '10'))
+        self.TRANSLATION_CONCURRENCY = int(os.getenv('TRANSLATION_CONCURRENCY', '4'))
+        self.TRANSLATION_GLOSSARY = os.getenv('TRANSLATION_GLOSSARY', 'translation_glossary.json')
+        
+        # Translation cache (SQLite, survives restarts)
+        self.TRANSLATION_CACHE_FILE = os.getenv('TRANSLATION_CACHE_FILE', 'translation_cache.db')
+        self.TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '20000'))
+        self.TRANSLATION_CACHE_DAYS = int(os.getenv('TRANSLATION_CACHE_DAYS', '30'))
+        
+        # Time budget per article across translate and send (seconds)
+        self.ARTICLE_TIME_BUDGET = float(os.getenv('ARTICLE_TIME_BUDGET', '45'))
+        
         # Storage Configuration
         self.STORAGE_FILE = os.getenv('STORAGE_FILE', 'posted_news.json')
         self.CLEANUP_DAYS = int(os.getenv('CLEANUP_DAYS', '30'))
@@ -34,6 +72,11 @@ class Config:
         # Validate critical configuration
         self._validate_config()
     
+    @staticmethod
+    def _parse_list(value):
+        """Split a comma-separated environment value into a list"""
+        return [item.strip() for item in value.split(',') if item.strip()]
+    
     def _validate_config(self):
         """Validate critical configuration values"""
         if not self.BOT_TOKEN:
@@ -45,10 +88,17 @@ class Config:
         if self.CHECK_INTERVAL < 60:
             logger.warning(f"CHECK_INTERVAL is very low ({self.CHECK_INTERVAL}s), consider increasing")
         
+        if self.MIN_CHECK_INTERVAL > self.MAX_CHECK_INTERVAL:
+            logger.warning("MIN_CHECK_INTERVAL is above MAX_CHECK_INTERVAL, using MAX_CHECK_INTERVAL for both")
+            self.MIN_CHECK_INTERVAL = self.MAX_CHECK_INTERVAL
+        
         logger.info(f"Configuration loaded:")
-        logger.info(f"  RSS URL: {self.RSS_URL}")
+        logger.info(f"  RSS feeds: {len(self.RSS_URLS)} ({', '.join(self.RSS_URLS[:3])}{'...' if len(self.RSS_URLS) > 3 else ''})")
         logger.info(f"  Channel: {self.CHANNEL_USERNAME}")
-        logger.info(f"  Check interval: {self.CHECK_INTERVAL}s")
+        logger.info(f"  Language channels: {', '.join(f'{lang}={chan}' for lang, chan in self.LANGUAGE_CHANNELS.items())}")
+        if self.BROADCAST_CHANNELS:
+            logger.info(f"  Broadcast channels: {', '.join(f'{t.language}={t.channel}' for t in self.BROADCAST_CHANNELS)}")
+        logger.info(f"  Check interval: {self.CHECK_INTERVAL}s (adaptive {self.MIN_CHECK_INTERVAL}-{self.MAX_CHECK_INTERVAL}s)")
         logger.info(f"  Max articles per check: {self.MAX_ARTICLES_PER_CHECK}")
     
     def get_env_template(self):
@@ -60,11 +110,62 @@ CHANNEL_USERNAME=@YourChannelUsername
 
 # RSS Feed Configuration (optional)
 RSS_URL=https://cointelegraph.com/rss
+RSS_URLS=https://cointelegraph.com/rss,https://decrypt.co/feed
+FEED_TIMEOUT=15
+FEED_WORKERS=8
+STREAMING_PARSE=false
+
+# WebSub push delivery (optional, public URL of the /websub route)
+WEBSUB_CALLBACK_URL=https://your-repl-name.replit.app/websub
+
+# HTTP connection pooling (optional)
+HTTP_POOL_CONNECTIONS=10
+HTTP_POOL_MAXSIZE=10
+HTTP_TIMEOUT=30
 
 # Bot Behavior (optional)
 CHECK_INTERVAL=600
+MIN_CHECK_INTERVAL=60
+MAX_CHECK_INTERVAL=1800
 MAX_ARTICLES_PER_CHECK=10
 
+# Near-duplicate detection (optional)
+NEAR_DUPLICATE_DISTANCE=7
+
+# Target languages and their channels (optional, defaults to Pashto on CHANNEL_USERNAME)
+LANGUAGE_CHANNELS=ps:@YourPashtoChannel,fa:@YourDariChannel,ur:@YourUrduChannel
+TRANSLATION_WORKERS=3
+
+# Broadcast to several channels per language, optionally by topic (optional, replaces LANGUAGE_CHANNELS)
+BROADCAST_CHANNELS=ps:@YourPashtoChannel,ps:@YourBitcoinChannel:bitcoin|btc,fa:@YourDariChannel
+
+# Translation backends (optional, comma-separated fallback order: google, dictionary)
+TRANSLATION_BACKEND=google,dictionary
+TRANSLATION_TIMEOUT=10
+TRANSLATION_CONCURRENCY=4
+TRANSLATION_GLOSSARY=translation_glossary.json
+
+# Translation rate and quota limits for remote backends (optional, 0 quota = unlimited)
+TRANSLATION_RATE_PER_MINUTE=60
+TRANSLATION_BURST=10
+TRANSLATION_CHAR_QUOTA=500000
+TRANSLATION_QUOTA_PERIOD=86400
+TRANSLATION_MAX_WAIT=30
+
+# Translation cache (optional)
+TRANSLATION_CACHE_FILE=translation_cache.db
+TRANSLATION_CACHE_SIZE=20000
+TRANSLATION_CACHE_DAYS=30
+
+# Time budget per article in seconds (optional)
+ARTICLE_TIME_BUDGET=45
+
+# Telegram send queue: per-chat and bot-wide rate limits (optional)
+SEND_WORKERS=4
+TELEGRAM_CHAT_RATE_PER_MINUTE=20
+TELEGRAM_CHAT_BURST=3
+TELEGRAM_GLOBAL_RATE_PER_SECOND=30
+
 # Storage (optional)
 STORAGE_FILE=posted_news.json
 CLEANUP_DAYS=30
@@ -12,11 +12,28 @@ import time
 import threading
 import logging
 import re
+import html
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, jsonify, render_template_string, request
 import feedparser
-import requests
-from googletrans import Translator
+from feed_cache import FeedValidatorCache
+from http_client import get_http_client
+from poll_scheduler import AdaptivePollScheduler
+from websub import WebSubSubscriber
+from circuit_breaker import get_breaker_registry
+from article_extractor import ArticleExtractor
+from near_duplicate import NearDuplicateIndex, article_fingerprint, batch_duplicates
+from persistent_cache import PersistentCache
+from translation_backends import create_translation_backends
+from translation import TranslationService, NOT_TRANSLATED, parse_language_channels
+from rate_governor import TranslationDeferred
+from feed_stream import fetch_new_entries
+from summarizer import SummaryService
+from extractive_summarizer import summarize as extractive_summarize
+from message_renderer import MessageRenderer, MessageRenderError, escape
+from deadline import Deadline, DeadlineExceeded, cap
+from send_queue import create_send_queue, create_telegram_sender
+from broadcast import BroadcastRouter, parse_broadcast_channels
 # OpenAI import - will be used if available
 
 # د لاګنګ تنظیمات - Logging configuration
@@ -45,8 +62,44 @@ class CryptoNewsBot:
         # د RSS فیډ URL - RSS feed URL
         self.rss_url = "https://cointelegraph.com/rss"
         
-        # د ژباړې خدماتو جوړول - Translation service setup
-        self.translator = Translator()
+        # د فیډ د خپرولو د سرعت سره سم کتنه - Adaptive polling from feed cadence
+        self.poll_scheduler = AdaptivePollScheduler(
+            default_interval=int(os.getenv('CHECK_INTERVAL', '600')),
+            min_interval=int(os.getenv('MIN_CHECK_INTERVAL', '60')),
+            max_interval=int(os.getenv('MAX_CHECK_INTERVAL', '1800'))
+        )
+        
+        # ګډ HTTP client د keep-alive اړیکو سره - Shared keep-alive HTTP client
+        self.http = get_http_client()
+        
+        # د WebSub له لارې د خبرونو ترلاسه کول - WebSub push ingestion (optional)
+        self.pipeline_lock = threading.Lock()
+        websub_callback_url = os.getenv('WEBSUB_CALLBACK_URL')
+        self.websub = None
+        if websub_callback_url:
+            self.websub = WebSubSubscriber(
+                websub_callback_url, self.handle_pushed_articles, http_client=self.http
+            )
+        
+        # د تدریجي تحلیل حالت - Streaming parse stops at the first posted article
+        self.streaming_parse = os.getenv('STREAMING_PARSE', 'false').lower() == 'true'
+        
+        # د هر بهرني خدمت لپاره circuit breaker - Circuit breaker per external endpoint
+        self.breakers = get_breaker_registry()
+        
+        # د ژباړې خدماتو جوړول - Translation backends (TRANSLATION_BACKEND="google,dictionary")
+        self.translation_backends = create_translation_backends()
+        
+        # د ژباړو دایمي cache - Persistent translation cache (survives restarts and retries)
+        self.translation_cache = PersistentCache(
+            os.getenv('TRANSLATION_CACHE_FILE', 'translation_cache.db'),
+            max_entries=int(os.getenv('TRANSLATION_CACHE_SIZE', '20000')),
+            max_age=int(os.getenv('TRANSLATION_CACHE_DAYS', '30')) * 24 * 3600
+        )
+        self.translation = TranslationService(
+            self.translation_backends, self.translation_cache, self.breakers,
+            max_workers=int(os.getenv('TRANSLATION_WORKERS', '3'))
+        )
         
         # د OpenAI client پیل کول - Initialize OpenAI client
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -65,19 +118,97 @@ class CryptoNewsBot:
         else:
             logger.warning("د OpenAI API key نشته - OpenAI API key not provided")
         
+        # د لنډیزونو دایمي cache - Summaries cached by content hash, model and prompt version
+        self.summary_cache = PersistentCache(
+            os.getenv('SUMMARY_CACHE_FILE', 'summary_cache.db'),
+            max_entries=int(os.getenv('SUMMARY_CACHE_SIZE', '5000')),
+            max_age=int(os.getenv('SUMMARY_CACHE_DAYS', '7')) * 24 * 3600
+        )
+        self.summarizer = SummaryService(
+            self.openai_client, self.summary_cache, self.breakers.get('openai'),
+            model=os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo'),
+            quota_cooldown=float(os.getenv('OPENAI_QUOTA_COOLDOWN', '900')),
+            max_quota_cooldown=float(os.getenv('OPENAI_MAX_QUOTA_COOLDOWN', '21600')),
+            batch_size=int(os.getenv('SUMMARY_BATCH_SIZE', '10')),
+            max_input_tokens=int(os.getenv('SUMMARY_MAX_INPUT_TOKENS', '1500'))
+        )
+        
+        # جوړ شوي پیغامونه د بیا هڅې لپاره - Rendered messages kept so retries skip summarize/translate
+        self.renderer = MessageRenderer()
+        
+        # د لېږلو کتار د هر چینل له نرخ محدودیت سره - Send queue with per-chat and global Telegram rate limits
+        self.send_queue = create_send_queue()
+        
+        # د هر خبر د وخت بودیجه - Time budget per article across summarize, translate and send
+        self.article_budget = float(os.getenv('ARTICLE_TIME_BUDGET', '45'))
+        
+        # د بشپړې مقالې متن اخیستل (اختیاري) - Full-article extraction (optional)
+        self.article_extractor = None
+        if os.getenv('ARTICLE_EXTRACTION', 'false').lower() == 'true':
+            self.article_extractor = ArticleExtractor(
+                cache_dir=os.getenv('ARTICLE_CACHE_DIR', 'article_cache'),
+                max_workers=int(os.getenv('ARTICLE_WORKERS', '2')),
+                max_entries=int(os.getenv('ARTICLE_CACHE_SIZE', '2000'))
+            )
+        
         # د ډېټا ساتنې فایل - Data storage file
         self.storage_file = 'posted_articles.json'
         self.posted_articles = self.load_posted_articles()
         
+        # د ورته خبرونو موندل - Near-duplicate index over posted stories
+        self.near_duplicates = NearDuplicateIndex(int(os.getenv('NEAR_DUPLICATE_DISTANCE', '7')))
+        self.near_duplicates.rebuild(self.posted_articles)
+        
+        # د ETag/Last-Modified ساتنه - Conditional GET validator cache
+        self.feed_cache = FeedValidatorCache('feed_validators.json')
+        
         # د بوټ حالت - Bot status
         self.running = False
         
         # د تلیګرام API URL - Telegram API URL
         if self.bot_token:
             self.telegram_api_url = f"https://api.telegram.org/bot{self.bot_token}"
+            # کتنه، breaker، وخت او 429 له نورو بوټونو سره شریک - Validation, breaker, deadline and 429 handling shared by all bots
+            self.telegram_send = create_telegram_sender(
+                self.telegram_api_url, self.send_queue, self.http, self.breakers
+            )
         
         # د تنظیماتو تصدیق - Configuration validation
         self.validate_config()
+        
+        # د هرې ژبې لپاره جلا چینل - Target language -> channel routing (LANGUAGE_CHANNELS="ps:@a,fa:@b")
+        self.language_channels = {
+            language: self.normalize_channel(channel)
+            for language, channel in parse_language_channels(
+                os.getenv('LANGUAGE_CHANNELS', ''), self.channel_username
+            ).items()
+        }
+        logger.info(f"د ژبو چینلونه - Language channels: {self.language_channels}")
+        
+        # د خپرونې چینلونه - Broadcast targets: several channels per language, optionally per topic
+        # (BROADCAST_CHANNELS="ps:@a,ps:@b:bitcoin|btc,fa:@c"); defaults to LANGUAGE_CHANNELS
+        targets = parse_broadcast_channels(os.getenv('BROADCAST_CHANNELS', ''))
+        for target in targets:
+            target.channel = self.normalize_channel(target.channel)
+        self.broadcast = BroadcastRouter(targets) if targets else BroadcastRouter.from_language_channels(self.language_channels)
+        if targets:
+            logger.info(f"د خپرونې چینلونه - Broadcast channels: {self.broadcast.get_stats()}")
+    
+    @staticmethod
+    def normalize_channel(channel):
+        """د چینل نوم سمول - Normalize a channel name, URL or numeric id"""
+        if not channel:
+            return channel
+        if channel.startswith('https://t.me/'):
+            # د بشپړ URL څخه یوازې د چینل نوم اخیستل - Extract channel name from full URL
+            channel = f"@{channel.split('/')[-1]}"
+        elif not channel.startswith('@') and not channel.startswith('-'):
+            channel = f"@{channel}"
+        
+        # د اضافي @ نښو پاکول - Remove extra @ symbols
+        if channel.startswith('@@'):
+            channel = channel[1:]
+        return channel
     
     def validate_config(self):
         """د تنظیماتو تصدیق - Configuration validation"""
@@ -90,16 +221,7 @@ class CryptoNewsBot:
             return False
         
         # د چینل نوم سمول - Channel name correction
-        if self.channel_username.startswith('https://t.me/'):
-            # د بشپړ URL څخه یوازې د چینل نوم اخیستل - Extract channel name from full URL
-            channel_name = self.channel_username.split('/')[-1]
-            self.channel_username = f"@{channel_name}"
-        elif not self.channel_username.startswith('@') and not self.channel_username.startswith('-'):
-            self.channel_username = f"@{self.channel_username}"
-        
-        # د اضافي @ نښو پاکول - Remove extra @ symbols
-        if self.channel_username.startswith('@@'):
-            self.channel_username = self.channel_username[1:]
+        self.channel_username = self.normalize_channel(self.channel_username)
         
         logger.info(f"د بوټ تنظیمات تصدیق شول - Bot configuration validated")
         logger.info(f"چینل: {self.channel_username} - Channel: {self.channel_username}")
@@ -144,27 +266,60 @@ class CryptoNewsBot:
             removed_count = original_count - len(self.posted_articles)
             if removed_count > 0:
                 self.save_posted_articles()
+                self.near_duplicates.rebuild(self.posted_articles)
                 logger.info(f"{removed_count} زړ ثبتونه پاک شول - {removed_count} old entries cleaned")
         except Exception as e:
             logger.error(f"د زړو ثبتونو پاکولو کې تیروتنه: {e} - Error cleaning old entries: {e}")
     
     def fetch_rss_news(self):
-        """د RSS څخه خبرونو اخیستل - Fetch news from RSS"""
+        """د RSS څخه خبرونو اخیستل - Fetch news from RSS
+        
+        Returns None when the feed answered 304 Not Modified or its circuit is open.
+        """
+        feed_breaker = self.breakers.get(f"feed:{self.rss_url}")
+        if not feed_breaker.allow():
+            logger.warning("د RSS circuit خلاص دی، کتنه پریښودل شوه - RSS circuit open, skipping fetch")
+            return None
+        
         try:
             logger.info(f"د RSS څخه خبرونو اخیستل - Fetching news from RSS: {self.rss_url}")
             
             headers = {
                 'User-Agent': 'Mozilla/5.0 (compatible; CryptoNewsBot/1.0)'
             }
+            headers.update(self.feed_cache.conditional_headers(self.rss_url))
+            
+            response = self.http.get(self.rss_url, headers=headers, stream=self.streaming_parse)
+            
+            # د فیډ بدلون نه دی شوی - Feed unchanged, skip parsing
+            if response.status_code == 304:
+                feed_breaker.record_success()
+                logger.info("RSS فیډ بدل شوی نه دی - RSS feed not modified (304)")
+                response.close()
+                return None
             
-            response = requests.get(self.rss_url, headers=headers, timeout=30)
             response.raise_for_status()
+            feed_breaker.record_success()
+            self.feed_cache.remember(self.rss_url, response)
+            
+            if self.streaming_parse:
+                # یوازې نوي خبرونه لوستل - Read only until the first posted article
+                if self.websub:
+                    self.websub.discover(self.rss_url, response)
+                entries = fetch_new_entries(response, self.is_article_posted, max_articles=10)
+                articles = [a for a in entries if a['link'] and a['title']]
+                logger.info(f"{len(articles)} نوي خبرونه واخیستل شول - Streamed {len(articles)} new articles")
+                return articles
             
             feed = feedparser.parse(response.content)
             
             if feed.bozo:
                 logger.warning(f"د RSS تحلیل کې ستونزه - RSS parsing issue: {feed.bozo_exception}")
             
+            # د فیډ hub موندل - Subscribe to the feed's WebSub hub if it has one
+            if self.websub:
+                self.websub.discover(self.rss_url, response, feed)
+            
             articles = []
             for entry in feed.entries[:10]:  # د وروستیو ۱۰ خبرونو اخیستل - Get latest 10 articles
                 article = {
@@ -182,155 +337,332 @@ class CryptoNewsBot:
             return articles
             
         except Exception as e:
+            feed_breaker.record_failure()
             logger.error(f"د RSS اخیستلو کې تیروتنه: {e} - Error fetching RSS: {e}")
             return []
     
+    def translate_text(self, text, language='ps', deadline=None, translated=NOT_TRANSLATED):
+        """د انګلیسي متن ژباړل - Translate English text to a target language
+        
+        A translated result the caller already has (None when it failed) is
+        used as is instead of asking the backends again.
+        """
+        # په batch کې دمخه ژباړل شوي متنونه له cache څخه راځي - Pre-translated batches are served from cache
+        if translated is NOT_TRANSLATED:
+            translated = self.translation.translate(text, dest=language, deadline=deadline)
+        if translated is None:
+            return f"[د ژباړې کې ستونزه] {text}"
+        return translated
+    
     def translate_to_pashto(self, text):
         """د انګلیسي متن پښتو ته ژباړل - Translate English text to Pashto"""
-        try:
-            translation = self.translator.translate(text, dest='ps', src='en')
-            if translation and translation.text:
-                logger.debug(f"ژباړه بریالۍ وه - Translation successful")
-                return translation.text
-            else:
-                return f"[د ژباړې کې ستونزه] {text}"
-        except Exception as e:
-            logger.error(f"د ژباړې کې تیروتنه: {e} - Translation error: {e}")
-            return f"[د ژباړې کې ستونزه] {text}"
+        return self.translate_text(text, 'ps')
     
-    def send_telegram_message(self, text):
-        """د تلیګرام پیغام لېږل - Send Telegram message"""
-        try:
-            url = f"{self.telegram_api_url}/sendMessage"
-            
-            payload = {
-                'chat_id': self.channel_username,
-                'text': text,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': False
-            }
-            
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get('ok'):
-                logger.info("پیغام بریالیتوب سره ولېږل شو - Message sent successfully")
-                return True
-            else:
-                logger.error(f"د پیغام لېږلو کې تیروتنه: {result} - Message sending error: {result}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"د تلیګرام API کې تیروتنه: {e} - Telegram API error: {e}")
-            return False
+    def telegram_breaker(self, channel=None):
+        """د چینل circuit breaker - Circuit breaker for a target chat"""
+        return self.breakers.get(f"telegram:{channel or self.channel_username}")
+    
+    def any_channel_available(self):
+        """ایا کوم چینل پیغام منلی شي - Whether at least one target channel accepts messages"""
+        return any(not self.telegram_breaker(channel).is_open() for channel in self.broadcast.channels)
+    
+    def send_telegram_message(self, text, channel=None, deadline=None):
+        """د تلیګرام پیغام لېږل - Send Telegram message
+        
+        Raises DeadlineExceeded when the article's time budget is already spent.
+        """
+        channel = channel or self.channel_username
+        result = self.telegram_send(channel, text, deadline)
+        if result and result.get('ok'):
+            logger.info(f"پیغام بریالیتوب سره ولېږل شو - Message sent successfully to {channel}")
+            return True
+        if result:
+            logger.error(f"د پیغام لېږلو کې تیروتنه: {result} - Message sending error: {result}")
+        return False
     
-    def generate_detailed_summary(self, article):
-        """د تفصیلي تشریح جوړول - Generate detailed summary"""
+    def article_content(self, article, deadline=None):
+        """د لنډیز لپاره د خبر متن - Title and cleaned text to summarize"""
+        # د اصلي مواد اخیستل - Get original content
+        summary = article.get('summary', '')
+        title = article.get('title', '')
+        
+        # د HTML tags پاکول - Remove HTML tags
+        if summary:
+            clean_summary = html.unescape(re.sub(r'<[^>]+>', '', summary)).strip()
+        else:
+            clean_summary = title
+        
+        # د بشپړې مقالې متن غوره دی - Prefer the extracted article body when available
+        if self.article_extractor:
+            # کم وخت کې د RSS لنډیز بس دی - Short on time, the feed summary will do
+            article_text = self.article_extractor.get_text(
+                article.get('link'), timeout=cap(deadline, self.article_extractor.timeout)
+            )
+            if article_text:
+                clean_summary = article_text
+        return title, clean_summary
+    
+    def fallback_summary(self, title, clean_summary):
+        """د AI پرته لنډیز - Local summary when no AI summary is available"""
+        # د fallback په توګه د RSS content کارول - Use RSS content as fallback
+        if clean_summary and len(clean_summary) > 20:
+            # د مهمو ۳ جملو غوره کول - Pick the 3 most central sentences
+            return extractive_summarize(clean_summary, max_sentences=3) or clean_summary
+        else:
+            return title if title else "No content available"
+    
+    def generate_detailed_summary(self, article, deadline=None):
+        """د تفصیلي تشریح جوړول - Generate detailed summary
+        
+        With too little of the deadline left for an LLM call the local
+        extractive summary is used.
+        """
         try:
-            # د اصلي مواد اخیستل - Get original content
-            summary = article.get('summary', '')
-            title = article.get('title', '')
+            title, clean_summary = self.article_content(article, deadline)
             
-            # د HTML tags پاکول - Remove HTML tags
-            if summary:
-                clean_summary = re.sub(r'<[^>]+>', '', summary).strip()
-            else:
-                clean_summary = title
-            
-            # د OpenAI سره د تفصیلي تشریح جوړول - Generate detailed summary with OpenAI
-            if self.openai_client and clean_summary:
-                try:
-                    prompt = f"""Create a detailed and comprehensive summary of this cryptocurrency news article in English. Make it informative and engaging (2-3 sentences), focusing on key developments, market impact, and significance to the crypto ecosystem.
-
-Title: {title}
-Content: {clean_summary}
-
-Requirements:
-- Write in clear, professional English
-- Focus on facts and impact
-- 2-3 sentences maximum
-- No promotional language
-- Include specific details when available
-
-Provide only the summary text without any formatting or labels."""
-
-                    response = self.openai_client.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "You are a professional cryptocurrency news analyst. Create detailed, factual summaries of crypto news articles that highlight key information and market significance."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=150,
-                        temperature=0.7
-                    )
-                    
-                    ai_summary = response.choices[0].message.content.strip()
-                    logger.info(f"د AI سره تفصیلي تشریح جوړ شو - Detailed AI summary generated")
-                    return ai_summary
-                    
-                except Exception as e:
-                    logger.error(f"د AI کې تیروتنه: {e} - AI error, using fallback")
-            
-            # د fallback په توګه د RSS content کارول - Use RSS content as fallback
-            if clean_summary and len(clean_summary) > 20:
-                # د لومړیو ۳ جملو اخیستل - Get first 3 sentences for better summary
-                sentences = clean_summary.split('.')
-                if len(sentences) > 3:
-                    enhanced_summary = '. '.join(sentences[:3]) + '.'
-                else:
-                    enhanced_summary = clean_summary
-                return enhanced_summary
-            else:
-                return title if title else "No content available"
+            # د OpenAI سره د تفصیلي تشریح جوړول - Generate detailed summary with OpenAI (cached)
+            ai_summary = self.summarizer.summarize(title, clean_summary, deadline)
+            if ai_summary:
+                logger.info(f"د AI سره تفصیلي تشریح جوړ شو - Detailed AI summary generated")
+                return ai_summary
+            return self.fallback_summary(title, clean_summary)
             
         except Exception as e:
             logger.error(f"د تشریح جوړولو کې تیروتنه: {e} - Summary generation error: {e}")
             return article.get('title', 'No content available')
+    
+    def generate_detailed_summaries(self, articles, deadline=None):
+        """د ډېرو خبرونو ګډ لنډیز - Summarize many articles in batched LLM requests
+        
+        Sets article['summary_en'] on every article that lacks one; a backlog of
+        articles costs one LLM round trip per batch instead of one per article.
+        """
+        todo = [a for a in articles if not a.get('summary_en')]
+        if not todo:
+            return
+        try:
+            contents = [self.article_content(a, deadline) for a in todo]
+            summaries = self.summarizer.summarize_batch(contents, deadline)
+            for article, (title, clean_summary), summary in zip(todo, contents, summaries):
+                article['summary_en'] = summary or self.fallback_summary(title, clean_summary)
+            logger.info(f"د {len(todo)} خبرونو لنډیز جوړ شو - Summarized {len(todo)} articles")
+        except Exception as e:
+            logger.error(f"د ګډ لنډیز کې تیروتنه: {e} - Batch summary error: {e}")
+            for article in todo:
+                if not article.get('summary_en'):
+                    article['summary_en'] = self.generate_detailed_summary(article, deadline)
 
-    def format_news_message(self, article):
-        """د خبر د پیغام تشکیل - Format news message"""
-        # د تفصیلي تشریح جوړول - Generate detailed summary
-        detailed_summary_en = self.generate_detailed_summary(article)
+    def format_news_message(self, article, language='ps', translated=NOT_TRANSLATED, deadline=None):
+        """د خبر د پیغام تشکیل - Format news message for one target language"""
+        # د تفصیلي تشریح جوړول - Generate detailed summary (unless prepared already)
+        detailed_summary_en = article.get('summary_en') or self.generate_detailed_summary(article, deadline)
         
-        # د تشریح پښتو ته ژباړل - Translate summary to Pashto
-        summary_ps = self.translate_to_pashto(detailed_summary_en)
+        # د تشریح ژباړل - Translate summary (unless translated already; a failed result is final)
+        summary_translated = self.translate_text(detailed_summary_en, language, deadline, translated)
         
         # د پیغام تشکیل یوازې د تفصیلي تشریح سره - Format message with detailed summary only
-        message = f"""📖 {detailed_summary_en}
-📗 {summary_ps}"""
+        message = f"""📖 {escape(detailed_summary_en)}
+📗 {escape(summary_translated)}"""
         
         return message
     
+    def prepare_articles(self, articles):
+        """د لېږلو مخکې لنډیز او ګډه ژباړه - Summarize, then translate all summaries in one batch
+        
+        Runs before sending starts so a cycle costs one LLM round trip per
+        summary batch and one translation round trip per batch and language,
+        with all languages translated in parallel. The whole step gets one
+        article time budget; whatever it leaves undone, each article does
+        within its own budget. The results, failures included, are kept in
+        article['translations'] so posting does not ask the backends again.
+        """
+        deadline = Deadline(self.article_budget)
+        self.generate_detailed_summaries(articles, deadline)
+        try:
+            batches = self.translation.translate_batch_many(
+                [a['summary_en'] for a in articles], self.broadcast.languages, deadline
+            )
+        except TranslationDeferred as e:
+            # هر خبر به بیا وپوښتي - Each article asks again and is deferred if the budget is still spent
+            logger.warning(f"د ژباړې بودیجه ختمه ده - Batch translation deferred: {e}")
+            return
+        except DeadlineExceeded as e:
+            logger.warning(f"ګډه ژباړه د وخت له امله ودرول شوه - Batch translation stopped: {e}")
+            return
+        for language, translations in batches.items():
+            for article, translated in zip(articles, translations):
+                article.setdefault('translations', {})[language] = translated
+    
+    def pending_channels(self, article_id):
+        """هغه چینلونه چې خبر لا نه دی ورته لېږل شوی - Channels the article was not yet posted to"""
+        data = self.posted_articles.get(article_id)
+        channels = self.broadcast.channels
+        if data is None:
+            return list(channels)
+        if 'channels' not in data:
+            # پخوانی ثبت یا ورته خبر - Record from before per-channel tracking, or a near-duplicate
+            return []
+        # یوازې هغه چینلونه چې موضوع یې برابره وه - Only the channels whose topics matched
+        targets = data.get('targets')
+        return [
+            channel for channel in channels
+            if (targets is None or channel in targets) and channel not in data['channels']
+        ]
+    
     def is_article_posted(self, article_id):
-        """د خبر د لېږل شوي وضعیت کتنه - Check if article was posted"""
-        return article_id in self.posted_articles
+        """د خبر د لېږل شوي وضعیت کتنه - Check if article was posted to every channel"""
+        return not self.pending_channels(article_id)
+    
+    def mark_article_as_posted(self, article, channel=None, targets=None):
+        """د خبر د لېږل شوي په توګه ثبتول - Mark article as posted to a channel
+        
+        targets lists every channel the article is meant for; once given,
+        the article counts as posted when those channels have it.
+        """
+        article_id = article.get('id') or article.get('link')
+        fingerprint = article_fingerprint(article)
+        if targets is None:
+            channel = channel or self.channel_username
+        
+        record = self.posted_articles.get(article_id)
+        if record is None or 'channels' not in record:
+            record = {
+                'title': article.get('title'),
+                'link': article.get('link'),
+                'posted_at': datetime.now().isoformat(),
+                'fingerprint': format(fingerprint, '016x'),
+                'channels': []
+            }
+            self.posted_articles[article_id] = record
+        if targets is not None:
+            record['targets'] = list(targets)
+        if channel and channel not in record['channels']:
+            record['channels'].append(channel)
+        self.near_duplicates.add(article_id, fingerprint)
+        
+        self.save_posted_articles()
+    
+    def drop_batch_duplicates(self, articles):
+        """د همدې کتنې ورته خبرونه لرې کول - Keep only the first copy of a story fetched several times this cycle
+        
+        Later copies are left out before summarize/translate; once the first
+        copy is posted, a later fetch records them as near-duplicates of it.
+        """
+        copies = batch_duplicates(
+            [a for a in articles if not self.is_article_posted(a.get('id') or a.get('link'))],
+            self.near_duplicates.max_distance
+        )
+        if copies:
+            logger.info(f"{len(copies)} ورته خبرونه په همدې کتنه کې - {len(copies)} copies of stories in this batch left out")
+        return [a for a in articles if (a.get('id') or a.get('link')) not in copies]
     
-    def mark_article_as_posted(self, article):
-        """د خبر د لېږل شوي په توګه ثبتول - Mark article as posted"""
+    def skip_if_near_duplicate(self, article):
+        """د ورته خبر کتنه او ثبتول - Record and skip a story already posted from another source
+        
+        Returns True when the article is a near-duplicate and must not be processed.
+        """
         article_id = article.get('id') or article.get('link')
+        duplicate_of = self.near_duplicates.find(article_fingerprint(article))
+        # په ځینو چینلونو کې لېږل شوی خبر له ځانه سره ورته دی - A partly posted article matches itself
+        if not duplicate_of or duplicate_of == article_id:
+            return False
         
         self.posted_articles[article_id] = {
             'title': article.get('title'),
             'link': article.get('link'),
-            'posted_at': datetime.now().isoformat()
+            'posted_at': datetime.now().isoformat(),
+            'duplicate_of': duplicate_of
         }
-        
         self.save_posted_articles()
+        logger.info(f"ورته خبر دمخه لېږل شوی - Near-duplicate of {duplicate_of}, skipped: {article.get('title', '')[:50]}")
+        return True
     
     def process_and_post_article(self, article):
-        """د خبر پروسس کول او لېږل - Process and post article"""
+        """د خبر پروسس کول او لېږل - Process and broadcast article to every pending channel
+        
+        The English summary is produced once and shared; the translations for
+        all languages run concurrently. Each language is rendered once and
+        sent to all of its channels (those whose topics match the article)
+        concurrently, each channel paced by its own bucket in the send queue
+        and tracked as posted on its own. Raises TranslationDeferred when the
+        translation budget is spent so the article waits instead of going out
+        untranslated. Rendered messages are kept until delivered, so a retry
+        skips summarize and translate and resumes after the last sent part.
+        
+        Every stage shares one deadline of ARTICLE_TIME_BUDGET seconds: the
+        summary falls back to the local one when time is short, translation
+        and send timeouts are capped by it, and the article is left for the
+        next cycle once it runs out.
+        """
+        deadline = Deadline(self.article_budget)
         try:
-            message = self.format_news_message(article)
+            article_id = article.get('id') or article.get('link')
+            targets = self.broadcast.channels_for(article)
+            if not targets:
+                # هېڅ چینل دا موضوع نه غواړي - No channel's topics match; nothing to send
+                self.mark_article_as_posted(article, targets=[])
+                logger.info(f"خبر هېڅ چینل ته نه ځي - Article matches no channel: {article.get('title', '')[:50]}")
+                return True
+            routes = self.broadcast.route(article, self.pending_channels(article_id))
+            languages = list(routes)
             
-            if self.send_telegram_message(message):
-                self.mark_article_as_posted(article)
+            rendered = {language: self.renderer.get((article_id, language)) for language in languages}
+            missing = [language for language in languages if rendered[language] is None]
+            if missing:
+                if not article.get('summary_en'):
+                    article['summary_en'] = self.generate_detailed_summary(article, deadline)
+                # د ګډې ژباړې پایلې، ناکامې هم - Batch results, failed ones included, are not asked for again
+                translations = dict(article.get('translations', {}))
+                untried = [language for language in missing if language not in translations]
+                if untried:
+                    translations.update(self.translation.translate_many(article['summary_en'], untried, deadline))
+                for language in missing:
+                    message = self.format_news_message(article, language, translations.get(language), deadline)
+                    try:
+                        rendered[language] = self.renderer.render((article_id, language), message)
+                    except MessageRenderError as e:
+                        logger.error(f"پیغام جوړ نه شو - Message for {language} could not be rendered: {e}")
+            
+            # ټول چینلونه په یو وخت، هر یو په خپل نرخ - All channels at once, each paced by its own bucket
+            posted_all = True
+            deliveries = {}
+            for language, channels in routes.items():
+                entry = rendered[language]
+                for channel in channels:
+                    if entry is None or self.telegram_breaker(channel).is_open():
+                        posted_all = False
+                        continue
+                    deliveries[(language, channel)] = self.send_queue.submit(
+                        channel, entry['parts'][entry['sent'].get(channel, 0):],
+                        lambda part, channel=channel: self.send_telegram_message(part, channel, deadline)
+                    )
+            
+            for (language, channel), delivery in deliveries.items():
+                entry = rendered[language]
+                # بیا هڅه له وروستۍ لېږل شوې برخې وروسته پیلیږي - A retry resumes after the last delivered part
+                entry['sent'][channel] = entry['sent'].get(channel, 0) + delivery.result()
+                if entry['sent'][channel] == len(entry['parts']):
+                    self.mark_article_as_posted(article, channel, targets)
+                else:
+                    posted_all = False
+            
+            # ژبه هغه وخت هېرېږي چې ټولو چینلونو ته ورسیږي - Drop a rendering once all its channels have it
+            for language, channels in routes.items():
+                entry = rendered[language]
+                if entry is not None and all(entry['sent'].get(channel, 0) == len(entry['parts']) for channel in channels):
+                    self.renderer.forget((article_id, language))
+            
+            if posted_all:
                 title_preview = article.get('title', '')[:50]
                 logger.info(f"خبر بریالیتوب سره ولېږل شو - Article posted successfully: {title_preview}...")
-                return True
-            else:
-                return False
+            return posted_all
                 
+        except TranslationDeferred:
+            raise
+        except DeadlineExceeded as e:
+            # پاتې کار بلې کتنې ته - Abort cleanly; rendered parts and posted channels are kept
+            logger.warning(f"د خبر وخت ختم شو - Article time budget spent, retrying next cycle: {e}")
+            return False
         except Exception as e:
             logger.error(f"د خبر پروسس کولو کې تیروتنه: {e} - Error processing article: {e}")
             return False
@@ -341,22 +673,70 @@ Provide only the summary text without any formatting or labels."""
             logger.info("د نویو کریپټو خبرونو کتنه - Checking for new crypto articles")
             
             articles = self.fetch_rss_news()
+            push_active = bool(self.websub and self.websub.is_active(self.rss_url))
+            self.poll_scheduler.observe(self.rss_url, articles or [], push_active=push_active)
+            if articles is None:
+                return
             if not articles:
-                logger.warning("د RSS څخه خبرونه و نه موندل شول - No articles found from RSS")
+                if self.streaming_parse:
+                    # د تدریجي تحلیل کې تش لیست یعنې نوي خبرونه نشته - Empty stream means nothing new
+                    self.feed_cache.commit()
+                    logger.info("د لېږلو لپاره نوي خبرونه نشته - No new articles to post")
+                else:
+                    logger.warning("د RSS څخه خبرونه و نه موندل شول - No articles found from RSS")
                 return
             
+            articles = self.drop_batch_duplicates(articles)
             new_articles_count = 0
+            failed_count = 0
+            
+            # د نویو مقالو متن مخکې له مخکې اخیستل - Start extraction for new articles in the background
+            if self.article_extractor:
+                self.article_extractor.prefetch([
+                    a for a in articles if not self.is_article_posted(a.get('id') or a.get('link'))
+                ])
+            
+            # ورته خبرونه مخکې له لنډیز او ژباړې پرېښودل - Drop near-duplicates before summarize/translate
+            pending = [
+                a for a in articles
+                if not self.is_article_posted(a.get('id') or a.get('link'))
+                and not self.skip_if_near_duplicate(a)
+            ]
+            if pending and self.any_channel_available():
+                self.prepare_articles(pending)
             
             for article in articles:
                 article_id = article.get('id') or article.get('link')
                 
                 if not self.is_article_posted(article_id):
-                    if self.process_and_post_article(article):
+                    # په همدې کتنه کې لېږل شوي ورته خبرونه - Near-duplicates posted earlier in this cycle
+                    if self.skip_if_near_duplicate(article):
+                        continue
+                    # ټول چینلونه خلاص circuit ولري نو پاتې خبرونه پرېږدو - Stop early when every channel is failing
+                    if not self.any_channel_available():
+                        logger.warning("د تلیګرام circuit خلاص دی، پاتې خبرونه بلې کتنې ته - Telegram circuit open, deferring remaining articles")
+                        failed_count += 1
+                        break
+                    try:
+                        posted = self.process_and_post_article(article)
+                    except TranslationDeferred as e:
+                        # بې ژباړې خبر نه لېږو - Never post untranslated; retry on a later check
+                        logger.warning(f"د ژباړې بودیجه ختمه ده، پاتې خبرونه بلې کتنې ته - Translation budget spent ({e}), deferring remaining articles")
+                        failed_count += 1
+                        break
+                    if posted:
                         new_articles_count += 1
-                        time.sleep(2)  # د نرخ محدودیت څخه مخنیوی - Rate limit prevention
+                    else:
+                        failed_count += 1
                 else:
                     logger.debug(f"خبر دمخه لېږل شوی - Article already posted")
             
+            # ناکام خبرونه باید بیا هڅه شي - Keep refetching until failed articles are posted
+            if failed_count:
+                self.feed_cache.discard()
+            else:
+                self.feed_cache.commit()
+            
             if new_articles_count > 0:
                 logger.info(f"{new_articles_count} نوي خبرونه ولېږل شول - {new_articles_count} new articles posted")
             else:
@@ -365,22 +745,53 @@ Provide only the summary text without any formatting or labels."""
         except Exception as e:
             logger.error(f"د خبرونو کتنې کې تیروتنه: {e} - Error checking articles: {e}")
     
+    def handle_pushed_articles(self, feed_url, articles):
+        """د WebSub له لارې راغلي خبرونه لېږل - Post articles delivered by a WebSub push"""
+        with self.pipeline_lock:
+            articles = self.drop_batch_duplicates(articles)
+            pending = [
+                a for a in articles
+                if not self.is_article_posted(a.get('id') or a.get('link'))
+                and not self.skip_if_near_duplicate(a)
+            ]
+            if pending and self.any_channel_available():
+                self.prepare_articles(pending)
+            posted_count = 0
+            for article in articles:
+                article_id = article.get('id') or article.get('link')
+                if not self.is_article_posted(article_id):
+                    if self.skip_if_near_duplicate(article):
+                        continue
+                    if not self.any_channel_available():
+                        logger.warning("د تلیګرام circuit خلاص دی - Telegram circuit open, pushed articles left for polling")
+                        break
+                    try:
+                        posted = self.process_and_post_article(article)
+                    except TranslationDeferred as e:
+                        logger.warning(f"د ژباړې بودیجه ختمه ده - Translation budget spent ({e}), pushed articles left for polling")
+                        break
+                    if posted:
+                        posted_count += 1
+            logger.info(f"{posted_count} خبرونه د WebSub څخه ولېږل شول - {posted_count} pushed articles posted from {feed_url}")
+    
     def run_periodic_checks(self):
         """د منظمو کتنو اجرا - Run periodic checks"""
         logger.info("د منظمو کتنو پروسه پیل شوه - Periodic checks started")
         
         while self.running:
             try:
-                self.check_and_post_new_articles()
+                with self.pipeline_lock:
+                    self.check_and_post_new_articles()
                 
                 # د هرو ۲۴ ساعتونو پاکول - Daily cleanup
                 if not hasattr(self, 'last_cleanup') or (datetime.now() - self.last_cleanup).total_seconds() > 86400:
                     self.cleanup_old_entries()
                     self.last_cleanup = datetime.now()
                 
-                # د ۱۰ دقیقو انتظار - Wait 10 minutes
-                logger.info("د راتلونکې کتنې لپاره ۱۰ دقیقې انتظار - Waiting 10 minutes for next check")
-                time.sleep(600)
+                # د فیډ سره سم انتظار - Wait as long as the feed cadence suggests
+                delay = max(1, self.poll_scheduler.seconds_until_next([self.rss_url]))
+                logger.info(f"د راتلونکې کتنې لپاره {delay:.0f} ثانیې انتظار - Waiting {delay:.0f} seconds for next check")
+                time.sleep(delay)
                 
             except KeyboardInterrupt:
                 logger.info("د کیبورډ څخه ودرولو غوښتنه - Keyboard interrupt received")
@@ -400,7 +811,8 @@ Provide only the summary text without any formatting or labels."""
         self.running = True
         
         # د لومړۍ کتنې ترسره کول - Initial check
-        self.check_and_post_new_articles()
+        with self.pipeline_lock:
+            self.check_and_post_new_articles()
         
         # د زړو ثبتونو پاکول - Cleanup old entries
         self.cleanup_old_entries()
@@ -415,15 +827,32 @@ Provide only the summary text without any formatting or labels."""
         """د بوټ ودرول - Stop bot"""
         logger.info("د کریپټو خبرونو بوټ ودریږي - Stopping crypto news bot")
         self.running = False
+        self.translation.close()
+        self.send_queue.close()
+        if self.article_extractor:
+            self.article_extractor.close()
     
     def get_stats(self):
         """د بوټ احصایې - Bot statistics"""
         return {
             'total_posted_articles': len(self.posted_articles),
+            'near_duplicate_index_size': len(self.near_duplicates),
             'bot_running': self.running,
             'rss_url': self.rss_url,
             'channel': self.channel_username,
-            'storage_file': self.storage_file
+            'language_channels': self.language_channels,
+            'broadcast_channels': self.broadcast.get_stats(),
+            'storage_file': self.storage_file,
+            'feed_validators': self.feed_cache.get_stats(),
+            'poll_intervals': self.poll_scheduler.get_stats(),
+            'websub': self.websub.get_stats() if self.websub else None,
+            'circuit_breakers': self.breakers.get_stats(),
+            'article_extraction': self.article_extractor.get_stats() if self.article_extractor else None,
+            'translation': self.translation.get_stats(),
+            'summaries': self.summarizer.get_stats(),
+            'messages': self.renderer.get_stats(),
+            'send_queue': self.send_queue.get_stats(),
+            'http': self.http.get_stats()
         }
 
 # د Flask د UptimeRobot لپاره routes - Flask routes for UptimeRobot
@@ -572,6 +1001,16 @@ def stats():
             'status': 'error'
         })
 
+@app.route('/websub/<key>', methods=['GET', 'POST'])
+def websub_callback(key):
+    """د WebSub hub callback - Hub verification (GET) and content push (POST)"""
+    if 'bot_instance' not in globals() or not bot_instance.websub:
+        return 'WebSub disabled', 404
+    
+    if request.method == 'GET':
+        return bot_instance.websub.verify_intent(key, request.args)
+    return bot_instance.websub.receive(key, request.get_data(), request.headers)
+
 def run_flask_server():
     """د Flask سرور اجرا - Run Flask server"""
     try:
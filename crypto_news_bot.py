@@ -13,8 +13,16 @@ import logging
 from datetime import datetime, timedelta
 from flask import Flask
 import feedparser
-import requests
-from googletrans import Translator
+from feed_cache import FeedValidatorCache
+from http_client import get_http_client
+from poll_scheduler import AdaptivePollScheduler
+from circuit_breaker import get_breaker_registry
+from persistent_cache import PersistentCache
+from translation_backends import create_translation_backends
+from translation import TranslationService
+from rate_governor import TranslationDeferred
+from message_renderer import escape
+from send_queue import create_send_queue, create_telegram_sender
 
 # د لاګنګ تنظیمات - Logging configuration
 logging.basicConfig(
@@ -34,12 +42,30 @@ class CryptoNewsBot:
         self.bot_token = bot_token
         self.channel_id = channel_id
         self.rss_url = "https://cointelegraph.com/rss"
-        self.translator = Translator()
+        self.translation_backends = create_translation_backends()
+        self.translation_cache = PersistentCache(
+            os.getenv('TRANSLATION_CACHE_FILE', 'translation_cache.db'),
+            max_entries=int(os.getenv('TRANSLATION_CACHE_SIZE', '20000')),
+            max_age=int(os.getenv('TRANSLATION_CACHE_DAYS', '30')) * 24 * 3600
+        )
+        self.http = get_http_client()
+        self.breakers = get_breaker_registry()
+        # د لېږلو کتار د تلیګرام له نرخ محدودیت سره - Send queue paced to Telegram's rate limits
+        self.send_queue = create_send_queue()
+        self.translation = TranslationService(self.translation_backends, self.translation_cache, self.breakers)
         self.posted_articles = self.load_posted_articles()
+        self.feed_cache = FeedValidatorCache('feed_validators.json')
+        self.poll_scheduler = AdaptivePollScheduler(
+            default_interval=int(os.getenv('CHECK_INTERVAL', '600')),
+            min_interval=int(os.getenv('MIN_CHECK_INTERVAL', '60')),
+            max_interval=int(os.getenv('MAX_CHECK_INTERVAL', '1800'))
+        )
         self.running = False
         
         # د تلیګرام API اساس URL - Telegram API base URL
         self.telegram_api_url = f"https://api.telegram.org/bot{bot_token}"
+        # کتنه، breaker او 429 له نورو بوټونو سره شریک - Validation, breaker and 429 handling shared by all bots
+        self.telegram_send = create_telegram_sender(self.telegram_api_url, self.send_queue, self.http, self.breakers)
         
     def load_posted_articles(self):
         """د پخوانیو خبرونو ډېټا لوستل - Load previously posted articles data"""
@@ -66,7 +92,16 @@ class CryptoNewsBot:
             logger.error(f"د ډېټا ساتلو کې تیروتنه: {e}")
     
     def fetch_rss_news(self):
-        """د RSS خبرونو راوړل - Fetch RSS news"""
+        """د RSS خبرونو راوړل - Fetch RSS news
+        
+        Returns None when the feed answered 304 Not Modified or its circuit is open.
+        """
+        # د فیډ circuit breaker - Feed circuit breaker
+        feed_breaker = self.breakers.get(f"feed:{self.rss_url}")
+        if not feed_breaker.allow():
+            logger.warning("د RSS circuit خلاص دی، کتنه پریښودل شوه")
+            return None
+        
         try:
             logger.info(f"د RSS خبرونو څانګه وړول: {self.rss_url}")
             
@@ -74,8 +109,18 @@ class CryptoNewsBot:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (compatible; CryptoNewsBot/1.0)'
             }
-            response = requests.get(self.rss_url, headers=headers, timeout=30)
+            headers.update(self.feed_cache.conditional_headers(self.rss_url))
+            response = self.http.get(self.rss_url, headers=headers)
+            
+            # د فیډ بدلون نه دی شوی - Feed not modified since last fetch
+            if response.status_code == 304:
+                feed_breaker.record_success()
+                logger.info("RSS فیډ بدل شوی نه دی (304)")
+                return None
+            
             response.raise_for_status()
+            feed_breaker.record_success()
+            self.feed_cache.remember(self.rss_url, response)
             
             # د RSS فیډ تحلیل - Parse RSS feed
             feed = feedparser.parse(response.content)
@@ -98,44 +143,27 @@ class CryptoNewsBot:
             return articles
             
         except Exception as e:
+            feed_breaker.record_failure()
             logger.error(f"د RSS خبرونو اخیستلو کې تیروتنه: {e}")
             return []
     
     def translate_to_pashto(self, text):
         """د انګلیسي متن پښتو ته ژباړل - Translate English text to Pashto"""
-        try:
-            # د ګوګل ژباړې کارول - Using Google Translate
-            translation = self.translator.translate(text, dest='ps', src='en')
-            return translation.text
-        except Exception as e:
-            logger.error(f"د ژباړې کې تیروتنه: {e}")
+        # دمخه ژباړل شوي متنونه له cache څخه - Pre-translated text comes from the cache
+        translated = self.translation.translate(text, dest='ps')
+        if translated is None:
             return f"[د ژباړې کې تیروتنه] {text}"
+        return translated
     
     def send_telegram_message(self, text):
         """د تلیګرام پیغام لېږل - Send Telegram message"""
-        try:
-            url = f"{self.telegram_api_url}/sendMessage"
-            data = {
-                'chat_id': self.channel_id,
-                'text': text,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': False
-            }
-            
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get('ok'):
-                logger.info("پیغام په بریالیتوب سره ولېږل شو")
-                return True
-            else:
-                logger.error(f"د پیغام لېږلو کې تیروتنه: {result}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"د تلیګرام پیغام لېږلو کې تیروتنه: {e}")
-            return False
+        result = self.telegram_send(self.channel_id, text)
+        if result and result.get('ok'):
+            logger.info("پیغام په بریالیتوب سره ولېږل شو")
+            return True
+        if result:
+            logger.error(f"د پیغام لېږلو کې تیروتنه: {result}")
+        return False
     
     def format_and_send_news(self, article):
         """د خبر تشکیل او لېږل - Format and send news"""
@@ -147,12 +175,12 @@ class CryptoNewsBot:
             title_ps = self.translate_to_pashto(title_en)
             
             # د پیغام تشکیل - Format message
-            message = f"""📰 {title_en}
-📘 {title_ps}
-🔗 {link}"""
+            message = f"""📰 {escape(title_en)}
+📘 {escape(title_ps)}
+🔗 {escape(link)}"""
             
-            # د پیغام لېږل - Send message
-            if self.send_telegram_message(message):
+            # د پیغام لېږل د کتار له لارې - Send through the rate-limited queue
+            if self.send_queue.send(self.channel_id, [message], self.send_telegram_message):
                 # د خبر د لېږل شوي په توګه ثبتول - Mark article as posted
                 article_id = article.get('id') or article.get('link', '')
                 self.posted_articles[article_id] = {
@@ -166,6 +194,9 @@ class CryptoNewsBot:
             else:
                 return False
                 
+        except TranslationDeferred:
+            # د ژباړې بودیجه ختمه ده - Translation budget spent, the caller defers the article
+            raise
         except Exception as e:
             logger.error(f"د خبر د تشکیل او لېږلو کې تیروتنه: {e}")
             return False
@@ -203,21 +234,49 @@ class CryptoNewsBot:
             
             # د RSS خبرونو اخیستل - Fetch RSS news
             articles = self.fetch_rss_news()
+            self.poll_scheduler.observe(self.rss_url, articles or [])
             
+            if articles is None:
+                return
             if not articles:
                 logger.warning("د RSS څانګې څخه خبرونه و نه موندل شول")
                 return
             
+            # د ټولو نویو سرلیکونو ګډه ژباړه - Translate all new titles in one batch before sending
+            new_titles = [
+                a.get('title', 'سرلیک نشته') for a in articles
+                if not self.is_duplicate(a.get('id') or a.get('link', ''))
+            ]
+            if new_titles:
+                try:
+                    self.translation.translate_batch(new_titles, dest='ps')
+                except TranslationDeferred as e:
+                    logger.warning(f"د ژباړې بودیجه ختمه ده: {e}")
+            
             new_count = 0
+            failed_count = 0
             for article in articles:
                 article_id = article.get('id') or article.get('link', '')
                 
                 # د تکراري خبر کتنه - Check for duplicate
                 if not self.is_duplicate(article_id):
-                    if self.format_and_send_news(article):
+                    try:
+                        posted = self.format_and_send_news(article)
+                    except TranslationDeferred as e:
+                        # بې ژباړې خبر نه لېږو - Never post untranslated; retry on a later check
+                        logger.warning(f"د ژباړې بودیجه ختمه ده، پاتې خبرونه بلې کتنې ته: {e}")
+                        failed_count += 1
+                        break
+                    if posted:
                         new_count += 1
-                        # د بریښنايي محدودیت د مخنیوي لپاره ډنډ - Delay to prevent rate limiting
-                        time.sleep(3)
+                    else:
+                        failed_count += 1
+            
+            # ناکام خبرونه باید بیا هڅه شي - Refetch the full feed while articles are failing
+            if failed_count:
+                self.feed_cache.discard()
+            else:
+                self.feed_cache.commit()
             
             if new_count > 0:
                 logger.info(f"{new_count} نوي خبرونه ولېږل شول")
@@ -234,9 +293,10 @@ class CryptoNewsBot:
                 # د خبرونو کتنه او لېږل - Check and post news
                 self.check_and_post_news()
                 
-                # د ۱۰ دقیقو انتظار - Wait for 10 minutes (600 seconds)
-                logger.info("د راتلونکې کتنې لپاره ۱۰ دقیقې انتظار...")
-                time.sleep(600)
+                # د فیډ سره سم انتظار - Wait as long as the feed cadence suggests
+                delay = max(1, self.poll_scheduler.seconds_until_next([self.rss_url]))
+                logger.info(f"د راتلونکې کتنې لپاره {delay:.0f} ثانیې انتظار...")
+                time.sleep(delay)
                 
             except Exception as e:
                 logger.error(f"د منظمې کتنې کې تیروتنه: {e}")
@@ -273,6 +333,7 @@ class CryptoNewsBot:
         """د بوټ ودرول - Stop the bot"""
         logger.info("د کریپټو خبرونو بوټ ودریږي...")
         self.running = False
+        self.send_queue.close()
 
 # د Flask د ژوندي ساتلو لپاره روټونه - Flask routes for keep-alive
 @app.route('/')
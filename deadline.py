@@ -0,0 +1,74 @@
+"""
+Per-article time budgets for the crypto news bot.
+A Deadline is created when an article enters the pipeline and handed to
+every stage, which caps its own timeouts by the time left, picks a cheaper
+path when the budget runs low and aborts once it is spent.
+"""
+
+import time
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage starts after the article's time budget is spent"""
+
+class Deadline:
+    """Monotonic point in time by which an article must be done"""
+
+    def __init__(self, budget):
+        """
+        Args:
+            budget (float): Seconds allowed from now
+        """
+        self.budget = budget
+        self.started = time.monotonic()
+        self.expires = self.started + budget
+
+    def remaining(self):
+        """Seconds left, never negative"""
+        return max(0.0, self.expires - time.monotonic())
+
+    def elapsed(self):
+        """Seconds since the deadline was created"""
+        return time.monotonic() - self.started
+
+    def expired(self):
+        """Check whether the budget is spent"""
+        return time.monotonic() >= self.expires
+
+    def allows(self, seconds):
+        """Check whether at least the given time is left, e.g. for a slow path"""
+        return self.remaining() >= seconds
+
+    def cap(self, timeout=None):
+        """
+        Limit a stage timeout to the time left
+
+        Args:
+            timeout (float): The stage's own timeout, None for no limit
+
+        Returns:
+            float: The smaller of timeout and the remaining budget
+        """
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def check(self, stage=''):
+        """
+        Abort a stage that has no time left
+
+        Raises:
+            DeadlineExceeded: When the budget is spent
+        """
+        if self.expired():
+            raise DeadlineExceeded(
+                f"{stage + ': ' if stage else ''}time budget of {self.budget:.0f}s spent "
+                f"after {self.elapsed():.1f}s"
+            )
+
+def cap(deadline, timeout=None):
+    """Deadline-aware timeout that also accepts deadline=None"""
+    return timeout if deadline is None else deadline.cap(timeout)
+
+def check(deadline, stage=''):
+    """Deadline check that also accepts deadline=None"""
+    if deadline is not None:
+        deadline.check(stage)
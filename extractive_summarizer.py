@@ -0,0 +1,133 @@
+"""
+Local extractive summaries for the crypto news bot.
+Ranks sentences with TextRank over TF-IDF vectors so a readable summary is
+available without the LLM. NumPy does the matrix work when installed; a
+pure-Python ranking by similarity to the document centroid covers the rest.
+"""
+
+import re
+import math
+from collections import Counter
+from text_utils import split_sentences
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his i in into is it its
+of on or our she that the their them they this to was we were which who will with
+would you your said says also after over than then there these those about more
+""".split())
+
+# Words and numbers; "1.5" and "don't" stay one token
+WORD = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+def tokenize(sentence):
+    """Lowercase content words of a sentence"""
+    return [w for w in WORD.findall(sentence.lower()) if w not in STOPWORDS and len(w) > 1]
+
+def _rank_numpy(token_lists, damping=0.85, iterations=50, tolerance=1e-6):
+    """TextRank-style centrality on the cosine-similarity graph of TF-IDF rows"""
+    vocabulary = {}
+    rows, cols, counts = [], [], []
+    for row, tokens in enumerate(token_lists):
+        for word, count in Counter(tokens).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+            counts.append(count)
+
+    n = len(token_lists)
+    if not vocabulary:
+        return np.full(n, 1.0 / n)
+    matrix = np.zeros((n, len(vocabulary)))
+    matrix[rows, cols] = counts
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + n) / (1 + document_frequency)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    # One scale for every row instead of per-row normalization, so two
+    # off-topic sentences that only resemble each other stay weak
+    strongest = similarity.sum(axis=1).max()
+    if strongest <= 0:
+        return np.full(n, 1.0 / n)
+    transition = similarity / strongest
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+def _rank_python(token_lists):
+    """Cosine similarity of each TF-IDF sentence vector to the document centroid"""
+    n = len(token_lists)
+    document_frequency = Counter(word for tokens in token_lists for word in set(tokens))
+    idf = {word: math.log((1 + n) / (1 + df)) + 1 for word, df in document_frequency.items()}
+
+    vectors = []
+    centroid = Counter()
+    for tokens in token_lists:
+        vector = {word: count * idf[word] for word, count in Counter(tokens).items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        vector = {word: v / norm for word, v in vector.items()}
+        vectors.append(vector)
+        centroid.update(vector)
+
+    return [sum(v * centroid[word] for word, v in vector.items()) for vector in vectors]
+
+def rank_sentences(sentences, lead_bias=0.3):
+    """
+    Score sentences by how central they are to the text
+
+    News puts the key facts first, so earlier sentences get a small boost.
+
+    Args:
+        sentences (list): Sentences of one document
+        lead_bias (float): Extra weight for the first sentence, decaying with position
+
+    Returns:
+        list: One score per sentence, higher is more important
+    """
+    if not sentences:
+        return []
+    token_lists = [tokenize(sentence) for sentence in sentences]
+    scores = _rank_numpy(token_lists) if np is not None else _rank_python(token_lists)
+    return [float(score) * (1 + lead_bias / (index + 1)) for index, score in enumerate(scores)]
+
+def summarize(text, max_sentences=3, max_chars=600):
+    """
+    Pick the most central sentences of a text
+
+    Args:
+        text (str): Plain article text
+        max_sentences (int): Sentences to keep
+        max_chars (int): Stop adding sentences past this length (the best
+            sentence is always kept)
+
+    Returns:
+        str: Selected sentences in their original order, or '' for empty text
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences and len(' '.join(sentences)) <= max_chars:
+        return ' '.join(sentences)
+
+    scores = rank_sentences(sentences)
+    chosen, length = [], 0
+    for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+        sentence_length = len(sentences[index]) + 1
+        if chosen and length + sentence_length > max_chars:
+            continue
+        chosen.append(index)
+        length += sentence_length
+        if len(chosen) == max_sentences:
+            break
+    return ' '.join(sentences[i] for i in sorted(chosen))
@@ -0,0 +1,96 @@
+"""
+HTTP validator cache for conditional RSS requests.
+Stores ETag / Last-Modified per feed URL so unchanged feeds answer with 304.
+"""
+
+import json
+import os
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class FeedValidatorCache:
+    """Keeps ETag and Last-Modified validators for each feed URL"""
+
+    def __init__(self, storage_file='feed_validators.json'):
+        self.storage_file = storage_file
+        self.validators = self._load_storage()
+        # Validators seen this cycle, only persisted once the cycle succeeded
+        self.pending = {}
+
+    def _load_storage(self):
+        """Load saved validators from JSON file"""
+        try:
+            if os.path.exists(self.storage_file):
+                with open(self.storage_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    logger.info(f"Loaded validators for {len(data)} feeds")
+                    return data
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading feed validators: {e}")
+            return {}
+
+    def _save_storage(self):
+        """Save validators to JSON file"""
+        try:
+            with open(self.storage_file, 'w', encoding='utf-8') as f:
+                json.dump(self.validators, f, indent=2, ensure_ascii=False)
+            logger.debug("Feed validators saved successfully")
+        except Exception as e:
+            logger.error(f"Error saving feed validators: {e}")
+
+    def conditional_headers(self, url):
+        """
+        Build conditional request headers for a feed
+
+        Args:
+            url (str): Feed URL
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers, empty if unknown
+        """
+        headers = {}
+        cached = self.validators.get(url, {})
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def remember(self, url, response):
+        """
+        Stage validators from a 200 response until the cycle is committed
+
+        Args:
+            url (str): Feed URL
+            response (requests.Response): Successful feed response
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.pending[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'updated_at': datetime.now().isoformat()
+            }
+
+    def commit(self):
+        """Persist staged validators after every new article was handled"""
+        if not self.pending:
+            return
+        self.validators.update(self.pending)
+        self.pending = {}
+        self._save_storage()
+
+    def discard(self):
+        """Drop staged validators so the next request fetches the full feed again"""
+        self.pending = {}
+
+    def get_stats(self):
+        """Get validator cache statistics"""
+        return {
+            'cached_feeds': len(self.validators),
+            'storage_file': self.storage_file
+        }
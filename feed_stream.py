@@ -0,0 +1,124 @@
+"""
+Incremental RSS/Atom parser for the crypto news bot.
+Reads a feed response chunk by chunk and stops at the first already-posted item.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 8192
+ENTRY_TAGS = ('item', 'entry')
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag name"""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+def _parse_date(value):
+    """
+    Parse an RFC 822 (RSS) or ISO 8601 (Atom) date
+
+    Returns:
+        time.struct_time: UTC time tuple like feedparser's *_parsed fields, or None
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.utctimetuple()
+
+def _entry_to_article(element):
+    """
+    Convert an <item> or <entry> element into an article dict
+
+    Args:
+        element (Element): Completed item/entry element
+
+    Returns:
+        dict: Article with the same keys the fetchers build from feedparser
+    """
+    fields = {}
+    link = ''
+    for child in element:
+        name = _local_name(child.tag)
+        if name == 'link':
+            # Atom links live in the href attribute, RSS links in the text
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                link = link or href
+            elif not href and child.text:
+                link = link or child.text.strip()
+        elif name not in fields:
+            fields[name] = (child.text or '').strip()
+
+    published = fields.get('pubDate') or fields.get('published') or fields.get('updated', '')
+    summary = fields.get('description') or fields.get('summary') or fields.get('encoded', '')
+
+    return {
+        'id': fields.get('guid') or fields.get('id') or link,
+        'title': fields.get('title', ''),
+        'link': link,
+        'published': published,
+        'published_parsed': _parse_date(published),
+        'summary': summary
+    }
+
+def iter_feed_entries(chunks):
+    """
+    Yield feed entries in document order while the feed is still downloading
+
+    Args:
+        chunks (iterable): Byte chunks of an RSS or Atom document
+
+    Yields:
+        dict: One article per <item>/<entry>
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if _local_name(element.tag) in ENTRY_TAGS:
+                yield _entry_to_article(element)
+                # Drop the parsed subtree so memory stays flat on large feeds
+                element.clear()
+    parser.close()
+
+def fetch_new_entries(response, is_known, max_articles=None):
+    """
+    Stream entries from a feed response until an already-posted one appears
+
+    Feeds list items newest-first, so everything after the first known id
+    has been seen before and the rest of the body is never downloaded.
+
+    Args:
+        response (requests.Response): Response opened with stream=True
+        is_known (callable): Returns True for article ids already posted
+        max_articles (int): Optional cap on returned entries
+
+    Returns:
+        list: New articles, newest first
+    """
+    articles = []
+    try:
+        for article in iter_feed_entries(response.iter_content(chunk_size=CHUNK_SIZE)):
+            if is_known(article['id'] or article['link']):
+                logger.debug(f"Reached already posted article, stopping parse: {article['id']}")
+                break
+            articles.append(article)
+            if max_articles and len(articles) >= max_articles:
+                break
+    except ET.ParseError as e:
+        logger.warning(f"Feed XML error after {len(articles)} entries: {e}")
+    finally:
+        response.close()
+    return articles
@@ -0,0 +1,107 @@
+"""
+Shared pooled HTTP client for the crypto news bot.
+Keeps one keep-alive connection pool per host for RSS and Telegram requests.
+"""
+
+import os
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+class HTTPClient:
+    """requests.Session wrapper with sized connection pools and reuse counters"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, timeout=30):
+        """
+        Args:
+            pool_connections (int): Number of per-host pools kept alive
+            pool_maxsize (int): Connections kept per host pool
+            timeout (float): Default request timeout in seconds
+        """
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the shared session using the default timeout"""
+        kwargs.setdefault('timeout', self.timeout)
+        with self.lock:
+            self.request_count += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self.lock:
+                self.error_count += 1
+            raise
+
+    def get(self, url, **kwargs):
+        """Send a GET request"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request"""
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self):
+        """
+        Get connection reuse statistics
+
+        Returns:
+            dict: Totals and per-host counts of requests and opened connections
+        """
+        hosts = {}
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            hosts[host] = {
+                'requests': pool.num_requests,
+                'connections_opened': pool.num_connections,
+                'connections_reused': max(0, pool.num_requests - pool.num_connections)
+            }
+
+        return {
+            'requests_sent': self.request_count,
+            'request_errors': self.error_count,
+            'connections_opened': sum(h['connections_opened'] for h in hosts.values()),
+            'connections_reused': sum(h['connections_reused'] for h in hosts.values()),
+            'hosts': hosts
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_http_client():
+    """
+    Get the process-wide HTTP client, creating it on first use
+
+    Pool sizes and timeout come from HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+    and HTTP_TIMEOUT environment variables.
+
+    Returns:
+        HTTPClient: Shared client instance
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient(
+                pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', '10')),
+                pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', '10')),
+                timeout=float(os.getenv('HTTP_TIMEOUT', '30'))
+            )
+            logger.info("Shared HTTP client created")
+        return _shared_client
@@ -5,7 +5,7 @@
 Bot Keep-Alive System for UptimeRobot
 """
 
-from flask import Flask
+from flask import Flask, request
 import threading
 import logging
 
@@ -15,6 +15,14 @@ logger = logging.getLogger(__name__)
 # د Flask اپلیکیشن جوړول - Create Flask application
 app = Flask(__name__)
 
+# د WebSub ګډون کوونکی، د بوټ لخوا ټاکل کیږي - WebSub subscriber, set by the bot
+websub_subscriber = None
+
+def set_websub_subscriber(subscriber):
+    """د WebSub ګډون کوونکی ټاکل - Register the bot's WebSub subscriber"""
+    global websub_subscriber
+    websub_subscriber = subscriber
+
 @app.route('/')
 def home():
     """د کور پاڼه - د UptimeRobot لپاره اصلي endpoint - Home page - Main endpoint for UptimeRobot"""
@@ -124,6 +132,16 @@ def status():
         'uptime_monitoring': 'ready'
     }
 
+@app.route('/websub/<key>', methods=['GET', 'POST'])
+def websub_callback(key):
+    """د WebSub hub callback - Hub verification (GET) and content push (POST)"""
+    if websub_subscriber is None:
+        return 'WebSub disabled', 404
+    
+    if request.method == 'GET':
+        return websub_subscriber.verify_intent(key, request.args)
+    return websub_subscriber.receive(key, request.get_data(), request.headers)
+
 def keep_alive():
     """د بوټ د ژوندي ساتلو اصلي فنکشن - Main keep-alive function"""
     def run():
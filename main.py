@@ -7,7 +7,7 @@ import threading
 import time
 from flask import Flask, render_template
 from bot import CryptoNewsBot
-from keep_alive import keep_alive  # د ژوندي ساتلو سیسټم - Keep-alive system
+from keep_alive import keep_alive, set_websub_subscriber  # د ژوندي ساتلو سیسټم - Keep-alive system
 import logging
 
 # Configure logging
@@ -42,6 +42,8 @@ def run_bot():
     """Run the Telegram bot in a separate thread"""
     try:
         bot = CryptoNewsBot()
+        # WebSub pushes arrive on the keep-alive server's public port
+        set_websub_subscriber(bot.websub)
         bot.start()
     except Exception as e:
         logger.error(f"Bot error: {e}")
@@ -0,0 +1,303 @@
+"""
+Telegram-safe HTML rendering for the crypto news bot.
+Escapes text, keeps only the tags Telegram's HTML parse mode supports,
+splits long messages at the 4096-character limit and validates every part
+before it is sent, caching rendered parts so a retry reuses them.
+"""
+
+import re
+import html
+import logging
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Telegram counts message length in UTF-16 code units
+TELEGRAM_LIMIT = 4096
+
+# Tags accepted by parse_mode=HTML and the attributes each may keep
+ALLOWED_TAGS = {
+    'b': (), 'strong': (), 'i': (), 'em': (), 'u': (), 'ins': (),
+    's': (), 'strike': (), 'del': (), 'tg-spoiler': (), 'blockquote': (),
+    'a': ('href',), 'code': ('class',), 'pre': (), 'span': ('class',)
+}
+
+TAG_NAME = re.compile(r'<([\w-]+)')
+
+class MessageRenderError(Exception):
+    """Raised when a message cannot be made valid for Telegram"""
+
+def escape(text):
+    """Escape plain text for parse_mode=HTML"""
+    return html.escape(text or '', quote=False)
+
+def telegram_length(text):
+    """Length as Telegram counts it (UTF-16 code units)"""
+    return len(text.encode('utf-16-le')) // 2
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds HTML as (kind, text) tokens with only allowed, balanced tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+        self.open_tags = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'br':
+            self.tokens.append(('text', '\n'))
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        kept = ''.join(
+            f' {name}="{html.escape(value or "", quote=True)}"'
+            for name, value in attrs if name in ALLOWED_TAGS[tag]
+        )
+        if tag == 'span' and 'tg-spoiler' not in kept:
+            return
+        self.open_tags.append(tag)
+        self.tokens.append(('open', f'<{tag}{kept}>'))
+
+    def handle_endtag(self, tag):
+        if tag not in self.open_tags:
+            return
+        # Close anything opened inside this tag first so nesting stays valid
+        while self.open_tags:
+            inner = self.open_tags.pop()
+            self.tokens.append(('close', f'</{inner}>'))
+            if inner == tag:
+                break
+
+    def handle_data(self, data):
+        if data:
+            self.tokens.append(('text', escape(data)))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.tokens.append(('close', f'</{self.open_tags.pop()}>'))
+        return self.tokens
+
+def sanitize_tokens(message):
+    """Parse HTML into a token list with only Telegram's tags, all balanced"""
+    parser = _Sanitizer()
+    parser.feed(message or '')
+    return parser.close()
+
+def sanitize(message):
+    """
+    Make HTML safe for parse_mode=HTML
+
+    Unsupported tags are dropped (their text is kept), stray "<" and "&"
+    are escaped and unclosed tags are closed.
+
+    Returns:
+        str: Sanitized HTML
+    """
+    return ''.join(text for _, text in sanitize_tokens(message))
+
+def _cut_point(text, limit):
+    """Best place to cut escaped text at or before limit: line, sentence, word"""
+    window = text[:limit]
+    for pattern in (r'\n', r'[.!?؟۔]\s', r'\s'):
+        matches = list(re.finditer(pattern, window))
+        if matches and matches[-1].end() > limit // 2:
+            return matches[-1].end()
+    # No boundary: cut hard, but never inside an entity like &amp;
+    amp = window.rfind('&')
+    if amp >= 0 and ';' not in window[amp:]:
+        if amp > 0:
+            return amp
+        # The window starts with the entity: take all of it
+        end = text.find(';', amp)
+        return end + 1 if end >= 0 else limit
+    return limit
+
+def split_message(message, limit=TELEGRAM_LIMIT):
+    """
+    Split sanitized HTML into parts of at most limit characters
+
+    Tags open at a cut are closed at the end of one part and reopened at the
+    start of the next. A tag that would leave less than an eighth of a part
+    for text (a very long <a href>, say) is left out of that part: its text
+    is kept, only the formatting is lost.
+
+    Returns:
+        list: Message parts, each valid on its own
+    """
+    tokens = sanitize_tokens(message)
+    # Room that opening tags must leave for text, at least one entity like &amp;
+    min_room = max(5, limit // 8)
+    # Open tags as [tag, shown in the current part]
+    parts, current, stack, has_text = [], '', [], False
+
+    def close_tag(tag):
+        return f'</{TAG_NAME.match(tag).group(1)}>'
+
+    def closing():
+        return ''.join(close_tag(tag) for tag, shown in reversed(stack) if shown)
+
+    def room():
+        return limit - telegram_length(current) - telegram_length(closing())
+
+    def cost(tag):
+        return telegram_length(tag) + telegram_length(close_tag(tag))
+
+    def reopen():
+        """Start a new part with every open tag that still leaves room for text"""
+        nonlocal current, has_text
+        current, has_text = '', False
+        for entry in stack:
+            entry[1] = False
+        for entry in stack:
+            entry[1] = room() - cost(entry[0]) >= min_room
+            if entry[1]:
+                current += entry[0]
+
+    def flush():
+        if has_text:
+            parts.append(current + closing())
+        reopen()
+
+    for kind, text in tokens:
+        if kind == 'open':
+            entry = [text, False]
+            if has_text and room() - cost(text) < limit // 4:
+                stack.append(entry)
+                flush()
+                continue
+            entry[1] = room() - cost(text) >= min_room
+            if entry[1]:
+                current += text
+            stack.append(entry)
+        elif kind == 'close':
+            if stack.pop()[1]:
+                current += text
+        else:
+            while text:
+                available = room()
+                if telegram_length(text) <= available:
+                    current += text
+                    has_text = True
+                    break
+                if has_text and available < limit // 4:
+                    flush()
+                    continue
+                # Fit by UTF-16 length, then back off to a natural boundary;
+                # always take at least one code point so the loop advances
+                fit = max(available, 0)
+                while fit and telegram_length(text[:fit]) > available:
+                    fit -= 1
+                cut = _cut_point(text, fit) or fit or 1
+                if cut > fit and has_text:
+                    # An entity at the cut does not fit here; start it in the next part
+                    flush()
+                    continue
+                current += text[:cut]
+                has_text = True
+                text = text[cut:].lstrip(' ')
+                flush()
+    if has_text:
+        parts.append(current + closing())
+    return [part.strip() for part in parts if part.strip()]
+
+def validate(message, limit=TELEGRAM_LIMIT):
+    """
+    Check a message the way Telegram would before sending it
+
+    Raises:
+        MessageRenderError: When it is empty, too long, or contains tags or
+            entities Telegram would reject
+    """
+    if not message or not message.strip():
+        raise MessageRenderError("empty message")
+    length = telegram_length(message)
+    if length > limit:
+        raise MessageRenderError(f"message is {length} characters, limit is {limit}")
+    if sanitize(message) != message:
+        raise MessageRenderError("unsupported, unbalanced or unescaped markup")
+
+class MessageRenderer:
+    """Renders messages once per article and language, keeping the parts for retries"""
+
+    def __init__(self, max_entries=500, limit=TELEGRAM_LIMIT):
+        """
+        Args:
+            max_entries (int): Rendered messages kept, least recently used go first
+            limit (int): Longest part in Telegram characters
+        """
+        self.max_entries = max_entries
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.rendered = 0
+        self.reused = 0
+        self.rejected = 0
+
+    def get(self, key):
+        """
+        Get a rendered message
+
+        Returns:
+            dict: {'parts': [...], 'sent': {channel: parts already delivered}},
+                or None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.reused += 1
+            return entry
+
+    def render(self, key, message):
+        """
+        Sanitize, split and validate a message and remember the result
+
+        Args:
+            key: Identifies the message, e.g. (article id, language)
+            message (str): HTML built by the caller with escape()
+
+        Returns:
+            dict: {'parts': [...], 'sent': {}}, shared by every channel that
+                receives the message
+
+        Raises:
+            MessageRenderError: When a part still fails validation
+        """
+        parts = split_message(message, self.limit)
+        try:
+            if not parts:
+                raise MessageRenderError("empty message")
+            for part in parts:
+                validate(part, self.limit)
+        except MessageRenderError:
+            self.rejected += 1
+            raise
+
+        entry = {'parts': parts, 'sent': {}}
+        with self.lock:
+            self.rendered += 1
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        if len(parts) > 1:
+            logger.info(f"Message split into {len(parts)} parts for the {self.limit}-character limit")
+        return entry
+
+    def forget(self, key):
+        """Drop a message once every part was delivered"""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def get_stats(self):
+        """Get render counters for /stats"""
+        with self.lock:
+            return {
+                'cached': len(self.entries),
+                'rendered': self.rendered,
+                'reused': self.reused,
+                'rejected': self.rejected
+            }
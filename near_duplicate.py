@@ -0,0 +1,162 @@
+"""
+Near-duplicate story detection for the crypto news bot.
+Fingerprints title + summary with a 64-bit SimHash and finds close
+fingerprints through LSH band buckets instead of scanning the archive.
+"""
+
+import re
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with after over says said new
+""".split())
+
+def _features(text):
+    """Normalized words and word bigrams of a text"""
+    text = re.sub(r'<[^>]+>', ' ', text or '').lower()
+    words = [w for w in re.findall(r"[a-z0-9$%.]+", text) if w not in STOP_WORDS]
+    words = [w.strip('.') for w in words if w.strip('.')]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def simhash(text):
+    """
+    Compute a 64-bit SimHash of a text
+
+    Args:
+        text (str): Plain text or HTML
+
+    Returns:
+        int: Fingerprint; similar texts differ in only a few bits
+    """
+    weights = [0] * HASH_BITS
+    for feature in _features(text):
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def article_fingerprint(article):
+    """SimHash of an article's title and summary"""
+    return simhash(f"{article.get('title', '')} {article.get('summary', '')}")
+
+class NearDuplicateIndex:
+    """LSH index over SimHash fingerprints"""
+
+    def __init__(self, max_distance=7):
+        """
+        Args:
+            max_distance (int): Largest Hamming distance still counted as a duplicate
+        """
+        self.max_distance = max_distance
+        # With max_distance + 1 bands, two fingerprints within max_distance bits
+        # must agree exactly on at least one band (pigeonhole principle)
+        band_count = max_distance + 1
+        width = HASH_BITS // band_count
+        self.bands = [
+            (i * width, HASH_BITS if i == band_count - 1 else (i + 1) * width)
+            for i in range(band_count)
+        ]
+        self.buckets = [{} for _ in self.bands]
+        self.fingerprints = {}
+
+    def _band_keys(self, fingerprint):
+        """Band values of a fingerprint, one per bucket table"""
+        return [
+            (fingerprint >> start) & ((1 << (end - start)) - 1)
+            for start, end in self.bands
+        ]
+
+    def add(self, article_id, fingerprint):
+        """Index a fingerprint under an article id"""
+        self.fingerprints[article_id] = fingerprint
+        for table, key in zip(self.buckets, self._band_keys(fingerprint)):
+            table.setdefault(key, set()).add(article_id)
+
+    def remove(self, article_id):
+        """Drop an article from the index"""
+        fingerprint = self.fingerprints.pop(article_id, None)
+        if fingerprint is None:
+            return
+        for table, key in zip(self.buckets, self._band_keys(fingerprint)):
+            bucket = table.get(key)
+            if bucket:
+                bucket.discard(article_id)
+                if not bucket:
+                    del table[key]
+
+    def find(self, fingerprint):
+        """
+        Find an indexed article close to a fingerprint
+
+        Returns:
+            str: Id of the nearest indexed article within max_distance, or None
+        """
+        candidates = set()
+        for table, key in zip(self.buckets, self._band_keys(fingerprint)):
+            candidates.update(table.get(key, ()))
+
+        best_id, best_distance = None, self.max_distance + 1
+        for article_id in candidates:
+            distance = (self.fingerprints[article_id] ^ fingerprint).bit_count()
+            if distance < best_distance:
+                best_id, best_distance = article_id, distance
+        return best_id
+
+    def rebuild(self, posted_articles):
+        """
+        Rebuild the index from stored article records
+
+        Args:
+            posted_articles (dict): article_id -> record with a hex 'fingerprint'
+        """
+        self.buckets = [{} for _ in self.bands]
+        self.fingerprints = {}
+        for article_id, data in posted_articles.items():
+            fingerprint = data.get('fingerprint') if isinstance(data, dict) else None
+            if fingerprint:
+                try:
+                    self.add(article_id, int(fingerprint, 16))
+                except ValueError:
+                    logger.debug(f"Skipping invalid fingerprint for {article_id}")
+        logger.info(f"Near-duplicate index holds {len(self.fingerprints)} fingerprints")
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+def batch_duplicates(articles, max_distance=7):
+    """
+    Find articles that repeat an earlier article of the same batch
+
+    Copies of one story fetched in the same cycle are not in the posted
+    index yet; this catches them before they are summarized and translated.
+
+    Args:
+        articles (list): Article dicts, in posting order
+        max_distance (int): Largest Hamming distance still counted as a duplicate
+
+    Returns:
+        dict: Id of each later copy -> id of the first article of its story
+    """
+    index = NearDuplicateIndex(max_distance)
+    copies = {}
+    for article in articles:
+        article_id = article.get('id') or article.get('link')
+        fingerprint = article_fingerprint(article)
+        original = index.find(fingerprint)
+        if original and original != article_id:
+            copies[article_id] = original
+        else:
+            index.add(article_id, fingerprint)
+    return copies
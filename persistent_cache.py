@@ -0,0 +1,137 @@
+"""
+Persistent key/value cache for the crypto news bot.
+Stores JSON values in SQLite so translations and other expensive results
+survive restarts, with LRU size and age based eviction.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PersistentCache:
+    """SQLite-backed cache with least-recently-used and age eviction"""
+
+    def __init__(self, path, max_entries=10000, max_age=30 * 24 * 3600, evict_every=100):
+        """
+        Args:
+            path (str): SQLite database file
+            max_entries (int): Entries kept after eviction, least recently used go first
+            max_age (float): Seconds after which an entry expires
+            evict_every (int): Run eviction after this many writes
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.evict_every = evict_every
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self.conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Build a cache key from its parts
+
+        Returns:
+            str: SHA-256 hex digest of the parts
+        """
+        joined = '\x1f'.join(str(part) for part in parts)
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a value
+
+        Returns:
+            The cached value, or None when missing or expired
+        """
+        now = time.time()
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or now - row[1] > self.max_age:
+                    self.misses += 1
+                    return None
+                self.conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.hits += 1
+            return json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Error reading cache {self.path}: {e}")
+            return None
+
+    def set(self, key, value):
+        """Store a JSON-serializable value"""
+        now = time.time()
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self.conn.commit()
+                self.writes += 1
+                due = self.writes % self.evict_every == 0
+            if due:
+                self.evict()
+        except Exception as e:
+            logger.error(f"Error writing cache {self.path}: {e}")
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        try:
+            with self.lock:
+                removed = self.conn.execute(
+                    "DELETE FROM cache WHERE created_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+                removed += self.conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+                self.conn.commit()
+                self.evicted += removed
+            if removed:
+                logger.info(f"Evicted {removed} entries from {self.path}")
+        except Exception as e:
+            logger.error(f"Error evicting cache {self.path}: {e}")
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get_stats(self):
+        """Get hit/miss counters for /stats"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evicted': self.evicted
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
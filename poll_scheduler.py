@@ -0,0 +1,132 @@
+"""
+Adaptive per-feed polling scheduler for the crypto news bot.
+Learns each feed's publishing cadence and polls busy feeds more often than quiet ones.
+"""
+
+import time
+import logging
+from collections import deque
+from rss_fetcher import published_timestamp
+
+logger = logging.getLogger(__name__)
+
+class AdaptivePollScheduler:
+    """Decides when each feed should be polled next"""
+
+    def __init__(self, default_interval=600, min_interval=60, max_interval=1800,
+                 history_size=20, poll_factor=0.5):
+        """
+        Args:
+            default_interval (int): Interval used until a feed has publish history
+            min_interval (int): Lower bound for any poll interval in seconds
+            max_interval (int): Upper bound for any poll interval in seconds
+            history_size (int): Publish timestamps remembered per feed
+            poll_factor (float): Fraction of the expected gap between items to wait
+        """
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.history_size = history_size
+        self.poll_factor = poll_factor
+        self.feeds = {}
+
+    def _state(self, url):
+        """Get or create the scheduling state for a feed"""
+        if url not in self.feeds:
+            self.feeds[url] = {
+                'timestamps': deque(maxlen=self.history_size),
+                'interval': self.default_interval,
+                'next_poll': 0.0
+            }
+        return self.feeds[url]
+
+    def _compute_interval(self, timestamps, now):
+        """
+        Estimate the next poll interval from recent publish times
+
+        The expected gap is the median gap between recent items, stretched by
+        how long the feed has been quiet since its latest item.
+        """
+        if len(timestamps) < 2:
+            return self.default_interval
+
+        ordered = sorted(timestamps)
+        gaps = sorted(b - a for a, b in zip(ordered, ordered[1:]) if b > a)
+        if not gaps:
+            return self.default_interval
+
+        median_gap = gaps[len(gaps) // 2]
+        quiet_for = max(0.0, now - ordered[-1])
+        interval = max(median_gap, quiet_for) * self.poll_factor
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+    def observe(self, url, articles, now=None, push_active=False):
+        """
+        Record a completed poll and schedule the next one
+
+        Args:
+            url (str): Feed URL that was polled
+            articles (list): Articles returned by the poll (may be empty)
+            now (float): Current UNIX time, defaults to time.time()
+            push_active (bool): Feed delivers WebSub pushes, poll only as a safety net
+
+        Returns:
+            int: Seconds until this feed should be polled again
+        """
+        now = now if now is not None else time.time()
+        state = self._state(url)
+
+        known = set(state['timestamps'])
+        for article in articles:
+            timestamp = published_timestamp(article)
+            # Ignore undated items and clocks far in the future
+            if timestamp and timestamp <= now + 300 and timestamp not in known:
+                state['timestamps'].append(timestamp)
+                known.add(timestamp)
+
+        if push_active:
+            state['interval'] = self.max_interval
+        else:
+            state['interval'] = self._compute_interval(state['timestamps'], now)
+        state['next_poll'] = now + state['interval']
+        logger.debug(f"Next poll for {url} in {state['interval']}s")
+        return state['interval']
+
+    def due_feeds(self, urls, now=None):
+        """
+        Get feeds whose poll time has come
+
+        Args:
+            urls (list): All configured feed URLs
+
+        Returns:
+            list: URLs that should be polled now
+        """
+        now = now if now is not None else time.time()
+        return [url for url in urls if self._state(url)['next_poll'] <= now]
+
+    def seconds_until_next(self, urls, now=None):
+        """
+        Get how long to sleep before any feed becomes due
+
+        Args:
+            urls (list): All configured feed URLs
+
+        Returns:
+            float: Seconds to wait, never below zero
+        """
+        now = now if now is not None else time.time()
+        if not urls:
+            return float(self.default_interval)
+        next_poll = min(self._state(url)['next_poll'] for url in urls)
+        return max(0.0, next_poll - now)
+
+    def get_stats(self):
+        """Get current poll interval per feed"""
+        return {
+            url: {
+                'interval': state['interval'],
+                'known_items': len(state['timestamps'])
+            }
+            for url, state in self.feeds.items()
+        }
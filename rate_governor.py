@@ -0,0 +1,227 @@
+"""
+Rate and quota governor for the crypto news bot's metered services.
+Admits calls through a token bucket and a rolling character quota, queueing
+callers for a bounded time and deferring them when the budget is spent.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class TranslationDeferred(Exception):
+    """Raised when the translation budget cannot admit a call in time"""
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate"""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Largest burst the bucket can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update (lock held)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available right now
+
+        Returns:
+            float: 0 on success, otherwise seconds until enough tokens accrue
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def release(self, tokens=1):
+        """Put back tokens that were taken but not used"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Wait for tokens
+
+        Args:
+            tokens (float): Tokens to take
+            timeout (float): Longest wait in seconds, None waits indefinitely
+
+        Returns:
+            bool: True if the tokens were taken within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < wait:
+                    return False
+            time.sleep(wait)
+
+class CharacterQuota:
+    """Rolling-window character budget"""
+
+    def __init__(self, limit, period=86400):
+        """
+        Args:
+            limit (int): Characters allowed per period, 0 disables the quota
+            period (float): Window length in seconds
+        """
+        self.limit = limit
+        self.period = period
+        self.usage = deque()
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        """Forget usage older than the window (lock held)"""
+        while self.usage and self.usage[0][0] <= now - self.period:
+            self.used -= self.usage.popleft()[1]
+
+    def reserve(self, chars):
+        """
+        Charge characters against the quota
+
+        Returns:
+            bool: False when the window has no room left for them
+        """
+        if not self.limit:
+            return True
+        with self.lock:
+            now = time.time()
+            self._expire(now)
+            if self.used + chars > self.limit:
+                return False
+            self.usage.append((now, chars))
+            self.used += chars
+            return True
+
+    def release(self, chars):
+        """Return a reservation that was not used"""
+        if not self.limit:
+            return
+        with self.lock:
+            for i in range(len(self.usage) - 1, -1, -1):
+                if self.usage[i][1] == chars:
+                    del self.usage[i]
+                    self.used -= chars
+                    return
+
+    def remaining(self):
+        """Characters still available in the current window"""
+        if not self.limit:
+            return None
+        with self.lock:
+            self._expire(time.time())
+            return self.limit - self.used
+
+class RateGovernor:
+    """Token bucket + character quota with a deadline-bounded wait queue"""
+
+    def __init__(self, name, requests_per_minute=60, burst=10, char_limit=0,
+                 quota_period=86400, max_wait=30):
+        """
+        Args:
+            name (str): Service name shown in logs and stats
+            requests_per_minute (float): Sustained request rate
+            burst (int): Requests allowed back to back
+            char_limit (int): Characters per quota period, 0 for no quota
+            quota_period (float): Quota window in seconds
+            max_wait (float): Longest time a caller queues for a request token
+        """
+        self.name = name
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.quota = CharacterQuota(char_limit, quota_period)
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.deferred = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def admit(self, chars, timeout=None):
+        """
+        Wait for permission to send a request of the given size
+
+        Args:
+            chars (int): Characters the request will send
+            timeout (float): Longest wait, capped at max_wait
+
+        Raises:
+            TranslationDeferred: When the quota is spent or no token arrives in time
+        """
+        if not self.quota.reserve(chars):
+            with self.lock:
+                self.deferred += 1
+            raise TranslationDeferred(f"{self.name}: character quota exhausted")
+
+        timeout = self.max_wait if timeout is None else min(timeout, self.max_wait)
+        started = time.monotonic()
+        admitted = False
+        with self.lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            admitted = self.bucket.acquire(timeout=timeout)
+        finally:
+            waited = time.monotonic() - started
+            with self.lock:
+                self.queue_depth -= 1
+                self.total_wait += waited
+                self.max_wait_seen = max(self.max_wait_seen, waited)
+                if admitted:
+                    self.admitted += 1
+                else:
+                    self.deferred += 1
+
+        if not admitted:
+            # Give the characters back, the request is not going out
+            self.quota.release(chars)
+            raise TranslationDeferred(f"{self.name}: no request token within {timeout:.1f}s")
+
+    def refund(self, chars):
+        """
+        Give back an admission whose request was not sent
+
+        Args:
+            chars (int): Characters passed to the matching admit call
+        """
+        self.bucket.release()
+        self.quota.release(chars)
+        with self.lock:
+            self.admitted -= 1
+
+    def get_stats(self):
+        """Get queue depth, wait time and admission counters"""
+        with self.lock:
+            calls = self.admitted + self.deferred
+            return {
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'admitted': self.admitted,
+                'deferred': self.deferred,
+                'avg_wait_ms': round(self.total_wait / calls * 1000, 1) if calls else 0.0,
+                'max_wait_ms': round(self.max_wait_seen * 1000, 1),
+                'quota_remaining': self.quota.remaining()
+            }
@@ -0,0 +1,199 @@
+"""
+Concurrent RSS fetcher for the crypto news bot.
+Fetches several feeds in a bounded thread pool and merges them into one stream.
+"""
+
+import time
+import calendar
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+from email.utils import parsedate_to_datetime
+import feedparser
+from feed_stream import fetch_new_entries
+from http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; CryptoNewsBot/1.0)'
+
+def published_timestamp(article):
+    """
+    Get article publish time as a UNIX timestamp
+
+    Args:
+        article (dict): Article with 'published_parsed' and/or 'published'
+
+    Returns:
+        float: Seconds since epoch, 0 when the date is missing or invalid
+    """
+    parsed = article.get('published_parsed')
+    if parsed:
+        try:
+            return float(calendar.timegm(parsed))
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+    published = article.get('published')
+    if published:
+        try:
+            return parsedate_to_datetime(published).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            pass
+
+    return 0.0
+
+class RSSFetcher:
+    """Fetches a list of RSS/Atom feeds concurrently"""
+
+    def __init__(self, feed_urls, timeout=15, max_workers=8, max_articles=10,
+                 validator_cache=None, streaming=False, http_client=None, websub=None,
+                 breakers=None):
+        if isinstance(feed_urls, str):
+            feed_urls = [feed_urls]
+        self.feed_urls = list(feed_urls)
+        self.timeout = timeout
+        self.max_articles = max_articles
+        self.validator_cache = validator_cache
+        self.streaming = streaming
+        self.http = http_client or get_http_client()
+        self.websub = websub
+        self.breakers = breakers
+        self.max_workers = max(1, min(max_workers, len(self.feed_urls)))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='rss-fetch'
+        )
+
+    def fetch_feed(self, url, is_known=None):
+        """
+        Fetch a single feed through its circuit breaker
+
+        Returns:
+            list: Article dicts, empty when the circuit is open
+        """
+        if self.breakers is None:
+            return self._fetch_feed(url, is_known)
+
+        breaker = self.breakers.get(f"feed:{url}")
+        if not breaker.allow():
+            logger.debug(f"Circuit open, skipping feed: {url}")
+            return []
+        try:
+            articles = self._fetch_feed(url, is_known)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return articles
+
+    def _fetch_feed(self, url, is_known=None):
+        """
+        Fetch and parse a single feed
+
+        Args:
+            url (str): Feed URL
+            is_known (callable): In streaming mode, stop parsing at the first
+                article id for which this returns True
+
+        Returns:
+            list: Article dicts, empty when the feed is unchanged (304)
+        """
+        headers = {
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/rss+xml, application/atom+xml, application/xml, text/xml'
+        }
+        if self.validator_cache:
+            headers.update(self.validator_cache.conditional_headers(url))
+
+        streaming = self.streaming and is_known is not None
+        response = self.http.get(url, headers=headers, timeout=self.timeout, stream=streaming)
+
+        if response.status_code == 304:
+            logger.debug(f"Feed not modified: {url}")
+            response.close()
+            return []
+
+        response.raise_for_status()
+        if self.validator_cache:
+            self.validator_cache.remember(url, response)
+
+        if streaming:
+            if self.websub:
+                self.websub.discover(url, response)
+            articles = fetch_new_entries(response, is_known, self.max_articles)
+            for article in articles:
+                article['source'] = url
+            return [a for a in articles if a['link'] and a['title']]
+
+        feed = feedparser.parse(response.content)
+        if feed.bozo:
+            logger.warning(f"RSS parsing issue for {url}: {feed.bozo_exception}")
+        if self.websub:
+            self.websub.discover(url, response, feed)
+
+        articles = []
+        for entry in feed.entries[:self.max_articles]:
+            link = getattr(entry, 'link', '')
+            title = getattr(entry, 'title', '')
+            if not link or not title:
+                continue
+
+            articles.append({
+                'id': getattr(entry, 'id', link),
+                'title': title,
+                'link': link,
+                'published': getattr(entry, 'published', ''),
+                'published_parsed': getattr(entry, 'published_parsed', None),
+                'summary': getattr(entry, 'summary', ''),
+                'source': url
+            })
+
+        return articles
+
+    def fetch_latest(self, feed_urls=None, is_known=None):
+        """
+        Fetch all feeds concurrently and merge them newest-first
+
+        Args:
+            feed_urls (list): Optional subset of feeds to fetch this cycle
+            is_known (callable): Already-posted check used by streaming mode
+
+        Returns:
+            list: Articles from every feed ordered by publish time, newest first
+        """
+        urls = feed_urls if feed_urls is not None else self.feed_urls
+        if not urls:
+            return []
+
+        started = time.monotonic()
+        futures = {self.executor.submit(self.fetch_feed, url, is_known): url for url in urls}
+
+        merged = {}
+        failed = 0
+        try:
+            # Slack over the per-request timeout covers queueing behind other feeds
+            deadline = self.timeout * (1 + len(urls) // self.max_workers) + 5
+            for future in as_completed(futures, timeout=deadline):
+                url = futures[future]
+                try:
+                    for article in future.result():
+                        merged.setdefault(article['id'], article)
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Failed to fetch feed {url}: {e}")
+        except TimeoutError:
+            pending = [futures[f] for f in futures if not f.done()]
+            failed += len(pending)
+            logger.error(f"Timed out waiting for {len(pending)} feeds: {pending}")
+
+        articles = sorted(merged.values(), key=published_timestamp, reverse=True)
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Fetched {len(articles)} articles from {len(urls) - failed}/{len(urls)} feeds "
+            f"in {elapsed:.2f}s"
+        )
+        return articles
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,310 @@
+"""
+Telegram send queue for the crypto news bot.
+Delivers messages from a pool of worker threads, pacing each chat with its
+own token bucket and the whole bot with a shared one, so different chats are
+served concurrently, each chat gets its messages in order and no caller has
+to sleep between posts. create_telegram_sender builds the sendMessage call
+the queue runs, shared by every bot.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from rate_governor import TokenBucket
+from http_client import get_http_client
+from circuit_breaker import get_breaker_registry
+from message_renderer import MessageRenderError, validate
+from deadline import cap, check
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows about 20 messages a minute in one group or channel and
+# about 30 a second across all chats of one bot
+CHAT_RATE_PER_MINUTE = 20
+CHAT_BURST = 3
+GLOBAL_RATE_PER_SECOND = 30
+# Times one message is sent again after Telegram paused its chat with a 429
+FLOOD_RETRIES = 3
+
+class SendQueue:
+    """Per-chat FIFO send queues drained by a shared worker pool"""
+
+    def __init__(self, workers=4, chat_rate_per_minute=CHAT_RATE_PER_MINUTE,
+                 chat_burst=CHAT_BURST, global_rate_per_second=GLOBAL_RATE_PER_SECOND):
+        """
+        Args:
+            workers (int): Chats served at the same time
+            chat_rate_per_minute (float): Sustained messages per minute in one chat
+            chat_burst (int): Messages one chat may receive back to back
+            global_rate_per_second (float): Messages per second across all chats
+        """
+        self.workers = workers
+        self.chat_rate = chat_rate_per_minute / 60.0
+        self.chat_burst = chat_burst
+        self.global_bucket = TokenBucket(global_rate_per_second, max(1, global_rate_per_second))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='telegram-send')
+        self.lock = threading.Lock()
+        self.chats = {}
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.waited = 0.0
+        self.pauses = 0
+        self.retried = 0
+
+    def _chat(self, chat):
+        """Queue state of a chat, created on first use (lock held)"""
+        state = self.chats.get(chat)
+        if state is None:
+            state = {
+                'bucket': TokenBucket(self.chat_rate, self.chat_burst),
+                'jobs': deque(),
+                'active': False,
+                'resume_at': 0.0
+            }
+            self.chats[chat] = state
+        return state
+
+    def submit(self, chat, messages, send):
+        """
+        Queue messages for one chat
+
+        Messages of one call go out in order and stop at the first failure;
+        calls for the same chat are delivered in the order they were made.
+
+        Args:
+            chat (str): Target chat id or @username
+            messages (list): Message texts
+            send (callable): send(message) -> bool, run on a worker thread
+
+        Returns:
+            Future: Resolves to the number of messages delivered
+        """
+        future = Future()
+        messages = list(messages)
+        with self.lock:
+            state = self._chat(chat)
+            state['jobs'].append((messages, send, future))
+            self.submitted += len(messages)
+            start = not state['active']
+            state['active'] = True
+        if start:
+            self.executor.submit(self._drain, chat)
+        return future
+
+    def pause(self, chat, seconds):
+        """
+        Hold back a chat, e.g. for the retry_after of a 429 reply
+
+        Args:
+            chat (str): Chat to pause
+            seconds (float): Time before its next message may go out
+        """
+        with self.lock:
+            state = self._chat(chat)
+            state['resume_at'] = max(state['resume_at'], time.monotonic() + seconds)
+            self.pauses += 1
+        logger.warning(f"Telegram asked to slow down, pausing {chat} for {seconds:.1f}s")
+
+    def _drain(self, chat):
+        """Deliver a chat's queued jobs one after another (worker thread)"""
+        finished = False
+        try:
+            while True:
+                with self.lock:
+                    state = self.chats[chat]
+                    if not state['jobs']:
+                        state['active'] = False
+                        finished = True
+                        return
+                    messages, send, future = state['jobs'].popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(self._deliver(chat, state, messages, send))
+                except Exception as e:
+                    # Whatever broke outside send, the caller must not wait forever
+                    logger.error(f"Delivery to {chat} failed: {e}")
+                    future.set_exception(e)
+        finally:
+            if not finished:
+                # Never leave the chat marked active with nobody draining it;
+                # the next submit starts a new drain for anything still queued
+                with self.lock:
+                    self.chats[chat]['active'] = False
+
+    def _throttle(self, state):
+        """Wait for the chat's pause, its bucket and the global bucket"""
+        started = time.monotonic()
+        while True:
+            with self.lock:
+                resume_at = state['resume_at']
+            wait = resume_at - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        state['bucket'].acquire()
+        self.global_bucket.acquire()
+        waited = time.monotonic() - started
+        if waited > 0:
+            with self.lock:
+                self.waited += waited
+
+    def _deliver(self, chat, state, messages, send):
+        """
+        Send messages in order until one fails
+
+        A message refused with flood control (send paused the chat) is sent
+        again once the pause is over, up to FLOOD_RETRIES times.
+        """
+        delivered = 0
+        for message in messages:
+            for attempt in range(FLOOD_RETRIES + 1):
+                self._throttle(state)
+                with self.lock:
+                    resume_at = state['resume_at']
+                try:
+                    ok = send(message)
+                except Exception as e:
+                    logger.warning(f"Send to {chat} aborted: {e}")
+                    ok = False
+                    break
+                if ok:
+                    break
+                with self.lock:
+                    paused = state['resume_at'] > resume_at
+                if not paused or attempt == FLOOD_RETRIES:
+                    break
+                with self.lock:
+                    self.retried += 1
+                logger.info(f"Sending to {chat} again after flood control")
+            if not ok:
+                with self.lock:
+                    self.failed += 1
+                break
+            delivered += 1
+        with self.lock:
+            self.sent += delivered
+        return delivered
+
+    def send(self, chat, messages, send):
+        """
+        Queue messages for one chat and wait for them
+
+        Returns:
+            bool: True if every message was delivered
+        """
+        messages = list(messages)
+        return self.submit(chat, messages, send).result() == len(messages)
+
+    def close(self):
+        """Stop the workers after the queued messages are sent"""
+        self.executor.shutdown(wait=False)
+
+    def get_stats(self):
+        """Get queue counters for /stats"""
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'chats': len(self.chats),
+                'active_chats': sum(1 for state in self.chats.values() if state['active']),
+                'queued_jobs': sum(len(state['jobs']) for state in self.chats.values()),
+                'chat_rate_per_minute': round(self.chat_rate * 60, 1),
+                'global_rate_per_second': self.global_bucket.rate,
+                'submitted': self.submitted,
+                'sent': self.sent,
+                'failed': self.failed,
+                'pauses': self.pauses,
+                'flood_retries': self.retried,
+                'throttled_seconds': round(self.waited, 1)
+            }
+
+def create_send_queue():
+    """
+    Build a send queue from SEND_WORKERS, TELEGRAM_CHAT_RATE_PER_MINUTE,
+    TELEGRAM_CHAT_BURST and TELEGRAM_GLOBAL_RATE_PER_SECOND
+
+    Returns:
+        SendQueue: Queue for one bot token
+    """
+    return SendQueue(
+        workers=int(os.getenv('SEND_WORKERS', '4')),
+        chat_rate_per_minute=float(os.getenv('TELEGRAM_CHAT_RATE_PER_MINUTE', str(CHAT_RATE_PER_MINUTE))),
+        chat_burst=int(os.getenv('TELEGRAM_CHAT_BURST', str(CHAT_BURST))),
+        global_rate_per_second=float(os.getenv('TELEGRAM_GLOBAL_RATE_PER_SECOND', str(GLOBAL_RATE_PER_SECOND)))
+    )
+
+def create_telegram_sender(api_url, send_queue=None, http_client=None, breakers=None):
+    """
+    Build the function that posts one message with sendMessage
+
+    The message is validated locally first (Telegram would answer 400), the
+    deadline and the chat's 'telegram:<chat>' breaker are checked before the
+    request, a 429 pauses the chat in the send queue for its retry_after
+    instead of counting as a failure (the queue sends the message again once
+    the pause is over), and a message Telegram cannot parse says nothing
+    about the chat's health, so it counts as neither success nor failure.
+
+    Args:
+        api_url (str): https://api.telegram.org/bot<token>
+        send_queue (SendQueue): Queue to pause on flood control, None to skip
+        http_client (HTTPClient): Shared client, the process-wide one by default
+        breakers (CircuitBreakerRegistry): Breakers, the process-wide ones by default
+
+    Returns:
+        callable: send(chat_id, text, deadline=None, parse_mode='HTML') ->
+            Telegram's reply, or None when nothing was sent or the request failed.
+            It raises DeadlineExceeded when the deadline is already spent.
+    """
+    http = http_client or get_http_client()
+    breakers = breakers or get_breaker_registry()
+    url = f"{api_url}/sendMessage"
+
+    def send(chat_id, text, deadline=None, parse_mode='HTML'):
+        if parse_mode == 'HTML':
+            try:
+                validate(text)
+            except MessageRenderError as e:
+                logger.error(f"Invalid message for {chat_id} not sent: {e}")
+                return None
+
+        check(deadline, f"send to {chat_id}")
+        breaker = breakers.get(f"telegram:{chat_id}")
+        if not breaker.allow():
+            logger.warning(f"Telegram circuit open for {chat_id}, message not sent")
+            return None
+
+        payload = {
+            'chat_id': chat_id,
+            'text': text,
+            'parse_mode': parse_mode,
+            'disable_web_page_preview': False
+        }
+        try:
+            response = http.post(url, json=payload, timeout=cap(deadline, http.timeout))
+            result = response.json()
+        except Exception as e:
+            breaker.record_failure()
+            logger.error(f"Failed to send message to {chat_id}: {e}")
+            return None
+
+        description = result.get('description', '').lower()
+        if response.status_code == 429:
+            # Flood control: hold back this chat's queue instead of counting a failure
+            breaker.record_success()
+            if send_queue:
+                retry_after = (result.get('parameters') or {}).get('retry_after', 30)
+                send_queue.pause(chat_id, float(retry_after))
+        elif result.get('ok'):
+            breaker.record_success()
+        elif response.status_code == 400 and "can't parse" in description:
+            # Our markup is at fault, not the chat: leave the failure count alone
+            breaker.release()
+        else:
+            breaker.record_failure()
+        return result
+
+    return send
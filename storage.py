@@ -53,25 +53,87 @@ class NewsStorage:
         """
         return article_id in self.posted_articles
     
-    def mark_as_posted(self, article_id, article_data):
+    def pending_channels(self, article_id, channels):
+        """
+        Get the channels an article still has to be posted to
+        
+        Args:
+            article_id (str): Unique identifier for the article
+            channels (list): All configured target channels
+            
+        Returns:
+            list: Channels without this article; records from before per-channel
+                tracking and near-duplicates count as posted everywhere, and
+                channels outside the record's targets are not waited on
+        """
+        data = self.posted_articles.get(article_id)
+        if data is None:
+            return list(channels)
+        if 'channels' not in data:
+            return []
+        targets = data.get('targets')
+        return [
+            channel for channel in channels
+            if (targets is None or channel in targets) and channel not in data['channels']
+        ]
+    
+    def mark_as_posted(self, article_id, article_data, fingerprint=None, channel=None, targets=None):
         """
         Mark article as posted
         
         Args:
             article_id (str): Unique identifier for the article
             article_data (dict): Article information
+            fingerprint (int): Optional SimHash used for near-duplicate detection
+            channel (str): Channel the article was posted to; without it (and
+                without targets) the article counts as posted to every channel
+            targets (list): Every channel the article is meant for, e.g. the
+                broadcast channels whose topics match it
+        """
+        try:
+            tracked = channel is not None or targets is not None
+            record = self.posted_articles.get(article_id)
+            if not tracked or record is None or 'channels' not in record:
+                record = {
+                    'title': article_data.get('title', ''),
+                    'link': article_data.get('link', ''),
+                    'posted_at': datetime.now().isoformat(),
+                    'published': article_data.get('published', '')
+                }
+                if tracked:
+                    record['channels'] = []
+                self.posted_articles[article_id] = record
+            if targets is not None:
+                record['targets'] = list(targets)
+            if channel is not None and channel not in record['channels']:
+                record['channels'].append(channel)
+            if fingerprint is not None:
+                record['fingerprint'] = format(fingerprint, '016x')
+            self._save_storage()
+            logger.debug(f"Marked article as posted: {article_id}")
+        except Exception as e:
+            logger.error(f"Error marking article as posted: {e}")
+    
+    def mark_as_duplicate(self, article_id, article_data, duplicate_of):
+        """
+        Record an article that was skipped as a near-duplicate of a posted one
+        
+        Args:
+            article_id (str): Unique identifier for the skipped article
+            article_data (dict): Article information
+            duplicate_of (str): Id of the posted article it duplicates
         """
         try:
             self.posted_articles[article_id] = {
                 'title': article_data.get('title', ''),
                 'link': article_data.get('link', ''),
                 'posted_at': datetime.now().isoformat(),
-                'published': article_data.get('published', '')
+                'duplicate_of': duplicate_of
             }
             self._save_storage()
-            logger.debug(f"Marked article as posted: {article_id}")
+            logger.debug(f"Marked article as duplicate of {duplicate_of}: {article_id}")
         except Exception as e:
-            logger.error(f"Error marking article as posted: {e}")
+            logger.error(f"Error marking article as duplicate: {e}")
     
     def cleanup_old_entries(self, days=30):
         """
@@ -0,0 +1,386 @@
+"""
+LLM summaries for the crypto news bot.
+Builds the summary prompt, calls the OpenAI chat API behind a circuit
+breaker and caches results by content hash, model and prompt version.
+Quota and rate-limit errors suspend LLM calls for a cooldown instead of
+costing a round trip per article. Several articles can share one request,
+and input is trimmed to a token budget.
+"""
+
+import re
+import json
+import time
+import logging
+from persistent_cache import PersistentCache
+from deadline import cap
+from token_budget import TokenBudget, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt or parameters change so old summaries are not reused
+PROMPT_VERSION = 'v1'
+
+SYSTEM_PROMPT = (
+    "You are a professional cryptocurrency news analyst. Create detailed, factual summaries "
+    "of crypto news articles that highlight key information and market significance."
+)
+
+PROMPT_TEMPLATE = """Create a detailed and comprehensive summary of this cryptocurrency news article in English. Make it informative and engaging (2-3 sentences), focusing on key developments, market impact, and significance to the crypto ecosystem.
+
+Title: {title}
+Content: {content}
+
+Requirements:
+- Write in clear, professional English
+- Focus on facts and impact
+- 2-3 sentences maximum
+- No promotional language
+- Include specific details when available
+
+Provide only the summary text without any formatting or labels."""
+
+BATCH_PROMPT_TEMPLATE = """Create a detailed and comprehensive summary of each of these {count} cryptocurrency news articles in English. Make each one informative and engaging (2-3 sentences), focusing on key developments, market impact, and significance to the crypto ecosystem.
+
+Articles (JSON):
+{articles}
+
+Requirements:
+- Write in clear, professional English
+- Focus on facts and impact
+- 2-3 sentences maximum per article
+- No promotional language
+- Include specific details when available
+
+Respond with only a JSON object of the form {{"summaries": [{{"id": <article id>, "summary": "<summary text>"}}]}} with one entry per article."""
+
+CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+# Error classes returned by classify_error
+QUOTA = 'quota'
+RATE_LIMIT = 'rate_limit'
+TRANSIENT = 'transient'
+
+def classify_error(error):
+    """
+    Classify an OpenAI error
+
+    Works with the exception attributes of openai 0.x (code, http_status,
+    headers) and falls back to the message text.
+
+    Returns:
+        tuple: (QUOTA, RATE_LIMIT or TRANSIENT, Retry-After seconds or None)
+    """
+    code = getattr(error, 'code', None)
+    status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+    message = str(error).lower()
+    if code == 'insufficient_quota' or 'insufficient_quota' in message or 'exceeded your current quota' in message:
+        return QUOTA, None
+
+    if status == 429 or type(error).__name__ == 'RateLimitError':
+        retry_after = None
+        headers = getattr(error, 'headers', None) or {}
+        try:
+            retry_after = float(headers.get('retry-after') or headers.get('Retry-After'))
+        except (TypeError, ValueError, AttributeError):
+            pass
+        return RATE_LIMIT, retry_after
+    return TRANSIENT, None
+
+def parse_batch_reply(reply, count):
+    """
+    Map a batch reply back to the articles by id
+
+    Returns:
+        list: Summaries aligned with the article ids 0..count-1 (None where
+            missing), or None when the reply is not valid JSON
+    """
+    try:
+        data = json.loads(CODE_FENCE.sub('', reply.strip()))
+    except ValueError:
+        return None
+    entries = data.get('summaries') if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return None
+
+    summaries = [None] * count
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get('id'))
+        except (TypeError, ValueError):
+            continue
+        summary = entry.get('summary')
+        if 0 <= index < count and isinstance(summary, str) and summary.strip():
+            summaries[index] = summary.strip()
+    return summaries
+
+def clean_content(text):
+    """Collapse whitespace so formatting-only changes hit the same cache entry"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+class SummaryService:
+    """OpenAI summaries with a persistent content-addressed cache"""
+
+    def __init__(self, client, cache=None, breaker=None, model='gpt-3.5-turbo',
+                 max_tokens=150, temperature=0.7, quota_cooldown=900, max_quota_cooldown=6 * 3600,
+                 rate_limit_cooldown=20, batch_size=10, timeout=30, min_time=5,
+                 max_input_tokens=1500, max_batch_tokens=6000):
+        """
+        Args:
+            client: The openai module (or None when no API key is configured)
+            cache (PersistentCache): Optional summary cache
+            breaker (CircuitBreaker): Optional breaker guarding the API
+            model (str): Chat model name
+            max_tokens (int): Completion token limit
+            temperature (float): Sampling temperature
+            quota_cooldown (float): First pause in seconds after insufficient_quota;
+                doubles while the quota stays exhausted, resets on success
+            max_quota_cooldown (float): Longest quota pause in seconds
+            rate_limit_cooldown (float): Pause after a 429 without Retry-After
+            batch_size (int): Articles per batched request
+            timeout (float): Longest wait for one request in seconds
+            min_time (float): Time budget an LLM call needs; with less left the
+                caller's local summary is used instead
+            max_input_tokens (int): Longest article content sent, longer content
+                keeps its most central sentences
+            max_batch_tokens (int): Content tokens per batched request
+        """
+        self.client = client
+        self.cache = cache
+        self.breaker = breaker
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.base_quota_cooldown = quota_cooldown
+        self.max_quota_cooldown = max_quota_cooldown
+        self.quota_cooldown = quota_cooldown
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.min_time = min_time
+        self.max_input_tokens = max_input_tokens
+        self.max_batch_tokens = max_batch_tokens
+        self.tokens = TokenBudget(model)
+        self.usage = TokenUsage()
+        self.calls = 0
+        self.batched_articles = 0
+        self.batch_splits = 0
+        self.failures = 0
+        self.errors = {QUOTA: 0, RATE_LIMIT: 0, TRANSIENT: 0}
+        self.skipped = 0
+        self.short_on_time = 0
+
+    def _cache_key(self, title, content):
+        return PersistentCache.make_key('summary', PROMPT_VERSION, self.model, title, content)
+
+    def _short_on_time(self, deadline):
+        """Check whether the time budget is too small for an LLM call"""
+        return deadline is not None and not deadline.allows(self.min_time)
+
+    def _chat(self, prompt, max_tokens, deadline=None):
+        """
+        Send one chat request through the breaker
+
+        Returns:
+            str: Reply text, or None when suspended, short on time or the call failed
+        """
+        if self._short_on_time(deadline):
+            self.short_on_time += 1
+            return None
+        if self.breaker and not self.breaker.allow():
+            # Suspended: go straight to the caller's local fallback
+            self.skipped += 1
+            return None
+
+        self.calls += 1
+        started = time.perf_counter()
+        try:
+            response = self.client.ChatCompletion.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                request_timeout=cap(deadline, self.timeout)
+            )
+            reply = response.choices[0].message.content.strip()
+        except Exception as e:
+            self.failures += 1
+            self._record_error(e)
+            return None
+
+        self._record_usage(response, prompt, reply, time.perf_counter() - started)
+
+        self.quota_cooldown = self.base_quota_cooldown
+        if self.breaker:
+            self.breaker.record_success()
+        return reply or None
+
+    def _record_usage(self, response, prompt, reply, latency):
+        """Record the token usage the API reports, or an estimate when it reports none"""
+        try:
+            prompt_tokens = response.usage.prompt_tokens
+            completion_tokens = response.usage.completion_tokens
+        except (AttributeError, KeyError, TypeError):
+            prompt_tokens = self.tokens.count(SYSTEM_PROMPT) + self.tokens.count(prompt)
+            completion_tokens = self.tokens.count(reply)
+        self.usage.record(prompt_tokens, completion_tokens, latency)
+
+    def _batches(self, items):
+        """Group pending articles by batch_size and max_batch_tokens"""
+        batch, size = [], 0
+        for item in items:
+            title, content = item[1][0]
+            cost = self.tokens.count(title) + self.tokens.count(content)
+            if batch and (len(batch) == self.batch_size or size + cost > self.max_batch_tokens):
+                yield batch
+                batch, size = [], 0
+            batch.append(item)
+            size += cost
+        if batch:
+            yield batch
+
+    def summarize(self, title, content, deadline=None):
+        """
+        Summarize an article, from the cache when the same content was seen
+
+        Args:
+            title (str): Article title
+            content (str): Cleaned article text
+            deadline (Deadline): Optional time budget for the LLM call
+
+        Returns:
+            str: Summary, or None when no client is configured, the breaker is
+                open or the call failed (callers use their own fallback)
+        """
+        return self.summarize_batch([(title, content)], deadline)[0]
+
+    def _summarize_group(self, group, deadline=None):
+        """
+        Summarize a group of articles in one request
+
+        A group whose request fails or whose reply cannot be mapped back is
+        split in half and retried, down to single-article requests. Nothing is
+        retried while the breaker is suspended.
+
+        Returns:
+            list: Summaries (or None) aligned with group
+        """
+        if len(group) == 1:
+            title, content = group[0]
+            return [self._chat(PROMPT_TEMPLATE.format(title=title, content=content), self.max_tokens, deadline)]
+
+        articles = json.dumps(
+            [{'id': i, 'title': title, 'content': content} for i, (title, content) in enumerate(group)],
+            ensure_ascii=False, indent=1
+        )
+        reply = self._chat(
+            BATCH_PROMPT_TEMPLATE.format(count=len(group), articles=articles),
+            self.max_tokens * len(group),
+            deadline
+        )
+        summaries = (reply and parse_batch_reply(reply, len(group))) or [None] * len(group)
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        self.batched_articles += len(group) - len(missing)
+        if not missing or (self.breaker and self.breaker.is_open()) or self._short_on_time(deadline):
+            return summaries
+
+        self.batch_splits += 1
+        logger.warning(f"Batch summary missed {len(missing)} of {len(group)} articles, splitting and retrying")
+        middle = (len(missing) + 1) // 2
+        for part in (missing[:middle], missing[middle:]):
+            if part:
+                for i, summary in zip(part, self._summarize_group([group[i] for i in part], deadline)):
+                    summaries[i] = summary
+        return summaries
+
+    def summarize_batch(self, articles, deadline=None):
+        """
+        Summarize many articles with as few requests as possible
+
+        Cached summaries are reused; the rest are trimmed to max_input_tokens
+        and go out up to batch_size articles (and max_batch_tokens) per
+        request with a JSON reply mapped back by article id.
+
+        Args:
+            articles (list): (title, content) pairs
+            deadline (Deadline): Optional time budget for the LLM calls
+
+        Returns:
+            list: Summaries aligned with articles (None where the caller
+                should use its fallback)
+        """
+        results = [None] * len(articles)
+        pending = {}
+        for index, (title, content) in enumerate(articles):
+            title, content = clean_content(title), clean_content(content)
+            if not content:
+                continue
+            key = self._cache_key(title, content)
+            if key in pending:
+                pending[key][1].append(index)
+                continue
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                logger.debug(f"Summary cache hit: {title[:50]}")
+                results[index] = cached
+                continue
+            pending[key] = ((title, self.tokens.trim(content, self.max_input_tokens)), [index])
+
+        if not pending or not self.client:
+            return results
+
+        for chunk in self._batches(pending.items()):
+            summaries = self._summarize_group([article for _, (article, _) in chunk], deadline)
+            for (key, (_, indexes)), summary in zip(chunk, summaries):
+                if not summary:
+                    continue
+                if self.cache is not None:
+                    self.cache.set(key, summary)
+                for index in indexes:
+                    results[index] = summary
+        return results
+
+    def _record_error(self, error):
+        """Suspend or count a failed call depending on its class"""
+        kind, retry_after = classify_error(error)
+        self.errors[kind] += 1
+        if kind == QUOTA:
+            cooldown = self.quota_cooldown
+            # A quota that is still gone after the pause gets a longer one next time
+            self.quota_cooldown = min(self.max_quota_cooldown, self.quota_cooldown * 2)
+            if self.breaker:
+                self.breaker.trip(cooldown, 'LLM quota exhausted')
+            logger.warning(f"LLM quota exhausted, using local summaries for {cooldown:.0f}s")
+        elif kind == RATE_LIMIT:
+            cooldown = retry_after or self.rate_limit_cooldown
+            if self.breaker:
+                self.breaker.trip(cooldown, 'LLM rate limited')
+            logger.warning(f"LLM rate limited, pausing for {cooldown:.0f}s")
+        else:
+            if self.breaker:
+                self.breaker.record_failure()
+            logger.error(f"Summary request failed: {error}")
+
+    def get_stats(self):
+        """Get LLM call counters, error classes and summary cache hit ratio"""
+        return {
+            'model': self.model,
+            'prompt_version': PROMPT_VERSION,
+            'llm_calls': self.calls,
+            'llm_failures': self.failures,
+            'llm_errors': dict(self.errors),
+            'llm_skipped': self.skipped,
+            'llm_short_on_time': self.short_on_time,
+            'batched_articles': self.batched_articles,
+            'batch_splits': self.batch_splits,
+            'quota_cooldown': self.quota_cooldown,
+            'max_input_tokens': self.max_input_tokens,
+            'trimmed_inputs': self.tokens.trimmed,
+            'tokenizer': 'tiktoken' if self.tokens.encoding is not None else 'estimate',
+            'tokens': self.usage.get_stats(),
+            'cache': self.cache.get_stats() if self.cache is not None else None
+        }
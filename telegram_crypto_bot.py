@@ -14,7 +14,16 @@ from datetime import datetime, timedelta
 from flask import Flask
 import feedparser
 import requests
-from googletrans import Translator
+from feed_cache import FeedValidatorCache
+from http_client import get_http_client
+from poll_scheduler import AdaptivePollScheduler
+from circuit_breaker import get_breaker_registry
+from persistent_cache import PersistentCache
+from translation_backends import create_translation_backends
+from translation import TranslationService
+from rate_governor import TranslationDeferred
+from message_renderer import escape
+from send_queue import create_send_queue, create_telegram_sender
 
 # د لاګنګ تنظیمات - Logging Setup
 logging.basicConfig(
@@ -42,20 +51,49 @@ class TelegramCryptoBot:
         # د RSS تنظیمات - RSS Configuration
         self.rss_url = "https://cointelegraph.com/rss"
         self.max_articles = 10  # د اخیستلو د خبرونو شمیر - Number of articles to fetch
-        self.check_interval = 600  # ۱۰ دقیقې - 10 minutes in seconds
+        self.check_interval = int(os.getenv('CHECK_INTERVAL', '600'))  # ۱۰ دقیقې - 10 minutes in seconds
         
-        # د ژباړې خدماتو پیل - Translation Service Initialization
-        self.translator = Translator()
+        # د فیډ د خپرولو د سرعت سره سم کتنه - Adaptive Polling from Feed Cadence
+        self.poll_scheduler = AdaptivePollScheduler(
+            default_interval=self.check_interval,
+            min_interval=int(os.getenv('MIN_CHECK_INTERVAL', '60')),
+            max_interval=int(os.getenv('MAX_CHECK_INTERVAL', '1800'))
+        )
+        
+        # ګډ HTTP client د keep-alive اړیکو سره - Shared Keep-Alive HTTP Client
+        self.http = get_http_client()
+        
+        # د هر بهرني خدمت لپاره circuit breaker - Circuit Breaker per External Endpoint
+        self.breakers = get_breaker_registry()
+        
+        # د لېږلو کتار د تلیګرام له نرخ محدودیت سره - Send Queue Paced to Telegram's Rate Limits
+        self.send_queue = create_send_queue()
+        
+        # د ژباړې خدماتو پیل - Translation Backends Initialization
+        self.translation_backends = create_translation_backends()
+        
+        # د ژباړو دایمي cache - Persistent Translation Cache
+        self.translation_cache = PersistentCache(
+            os.getenv('TRANSLATION_CACHE_FILE', 'translation_cache.db'),
+            max_entries=int(os.getenv('TRANSLATION_CACHE_SIZE', '20000')),
+            max_age=int(os.getenv('TRANSLATION_CACHE_DAYS', '30')) * 24 * 3600
+        )
+        self.translation = TranslationService(self.translation_backends, self.translation_cache, self.breakers)
         
         # د لېږل شویو خبرونو ډېټابیس - Posted Articles Database
         self.storage_file = 'posted_articles.json'
         self.posted_articles = self.load_posted_articles()
         
+        # د ETag/Last-Modified ساتنه - Conditional GET Validator Cache
+        self.feed_cache = FeedValidatorCache('feed_validators.json')
+        
         # د بوټ حالت - Bot Status
         self.running = False
         
         # د تلیګرام API ادرس - Telegram API URL
         self.telegram_api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        # کتنه، breaker او 429 له نورو بوټونو سره شریک - Validation, breaker and 429 handling shared by all bots
+        self.telegram_send = create_telegram_sender(self.telegram_api_url, self.send_queue, self.http, self.breakers)
         
         # د تنظیماتو تصدیق - Configuration Validation
         self.validate_configuration()
@@ -128,7 +166,15 @@ class TelegramCryptoBot:
             logger.error(f"د زړو ثبتونو پاکولو کې تیروتنه: {e} - Error during cleanup: {e}")
     
     def fetch_rss_articles(self):
-        """د RSS څخه خبرونو اخیستل - Fetch Articles from RSS"""
+        """د RSS څخه خبرونو اخیستل - Fetch Articles from RSS
+        
+        Returns None when the feed answered 304 Not Modified or its circuit is open.
+        """
+        feed_breaker = self.breakers.get(f"feed:{self.rss_url}")
+        if not feed_breaker.allow():
+            logger.warning("د RSS circuit خلاص دی - RSS circuit open, skipping fetch")
+            return None
+        
         try:
             logger.info(f"د RSS څخه خبرونو اخیستل: {self.rss_url} - Fetching articles from RSS: {self.rss_url}")
             
@@ -137,10 +183,20 @@ class TelegramCryptoBot:
                 'User-Agent': 'Mozilla/5.0 (compatible; TelegramCryptoBot/1.0; +https://t.me/your_bot)',
                 'Accept': 'application/rss+xml, application/xml, text/xml'
             }
+            headers.update(self.feed_cache.conditional_headers(self.rss_url))
             
             # د RSS فیډ اخیستل - Fetch RSS feed
-            response = requests.get(self.rss_url, headers=headers, timeout=30)
+            response = self.http.get(self.rss_url, headers=headers)
+            
+            # د فیډ بدلون نه دی شوی - Feed not modified since last fetch
+            if response.status_code == 304:
+                feed_breaker.record_success()
+                logger.info("RSS فیډ بدل شوی نه دی - RSS feed not modified (304)")
+                return None
+            
             response.raise_for_status()
+            feed_breaker.record_success()
+            self.feed_cache.remember(self.rss_url, response)
             
             # د RSS فیډ تحلیل - Parse RSS feed
             feed = feedparser.parse(response.content)
@@ -168,6 +224,7 @@ class TelegramCryptoBot:
             return articles
             
         except requests.exceptions.RequestException as e:
+            feed_breaker.record_failure()
             logger.error(f"د RSS اخیستلو کې د شبکې تیروتنه: {e} - Network error fetching RSS: {e}")
             return []
         except Exception as e:
@@ -176,53 +233,25 @@ class TelegramCryptoBot:
     
     def translate_to_pashto(self, text):
         """د انګلیسي متن پښتو ته ژباړل - Translate English Text to Pashto"""
-        try:
-            # د ګوګل ژباړې خدماتو کارول - Using Google Translate services
-            translation = self.translator.translate(text, dest='ps', src='en')
-            
-            if translation and translation.text:
-                logger.debug(f"ژباړه بریالۍ وه - Translation successful: {text[:50]}... -> {translation.text[:50]}...")
-                return translation.text
-            else:
-                logger.warning(f"د ژباړې خدماتو څخه تش ځواب - Empty response from translation service")
-                return f"[د ژباړې کې ستونزه] {text}"
-                
-        except Exception as e:
-            logger.error(f"د ژباړې کې تیروتنه: {e} - Translation error: {e}")
+        # دمخه ژباړل شوي متنونه له cache څخه - Pre-translated Text Comes from the Cache
+        translated = self.translation.translate(text, dest='ps')
+        if translated is None:
             return f"[د ژباړې کې ستونزه - Translation Error] {text}"
+        return translated
+    
+    def telegram_breaker(self):
+        """د چینل circuit breaker - Circuit Breaker for the Target Chat"""
+        return self.breakers.get(f"telegram:{self.channel_id}")
     
     def send_telegram_message(self, text):
         """د تلیګرام پیغام لېږل - Send Telegram Message"""
-        try:
-            url = f"{self.telegram_api_url}/sendMessage"
-            
-            # د پیغام ډېټا - Message data
-            payload = {
-                'chat_id': self.channel_id,
-                'text': text,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': False,
-                'disable_notification': False
-            }
-            
-            # د پیغام لېږل - Send message
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            
-            if result.get('ok'):
-                logger.info("پیغام بریالیتوب سره ولېږل شو - Message sent successfully")
-                return True
-            else:
-                logger.error(f"د پیغام لېږلو کې تیروتنه: {result} - Error sending message: {result}")
-                return False
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"د تلیګرام API کې د شبکې تیروتنه: {e} - Network error with Telegram API: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"د پیغام لېږلو کې عمومي تیروتنه: {e} - General error sending message: {e}")
-            return False
+        result = self.telegram_send(self.channel_id, text)
+        if result and result.get('ok'):
+            logger.info("پیغام بریالیتوب سره ولېږل شو - Message sent successfully")
+            return True
+        if result:
+            logger.error(f"د پیغام لېږلو کې تیروتنه: {result} - Error sending message: {result}")
+        return False
     
     def format_news_message(self, article):
         """د خبر د پیغام تشکیل - Format News Message"""
@@ -233,9 +262,9 @@ class TelegramCryptoBot:
         title_ps = self.translate_to_pashto(title_en)
         
         # د پیغام تشکیل - Format message according to requirements
-        message = f"""📰 {title_en}
-📘 {title_ps}
-🔗 {link}"""
+        message = f"""📰 {escape(title_en)}
+📘 {escape(title_ps)}
+🔗 {escape(link)}"""
         
         return message
     
@@ -263,8 +292,8 @@ class TelegramCryptoBot:
             # د پیغام تشکیل - Format message
             message = self.format_news_message(article)
             
-            # د پیغام لېږل - Send message
-            if self.send_telegram_message(message):
+            # د پیغام لېږل د کتار له لارې - Send through the rate-limited queue
+            if self.send_queue.send(self.channel_id, [message], self.send_telegram_message):
                 # د خبر د لېږل شوي په توګه ثبتول - Mark article as posted
                 self.mark_article_as_posted(article)
                 
@@ -275,6 +304,9 @@ class TelegramCryptoBot:
                 logger.error(f"د خبر لېږلو کې ناکامي - Failed to post article: {article.get('title', '')[:50]}...")
                 return False
                 
+        except TranslationDeferred:
+            # د ژباړې بودیجه ختمه ده - Translation budget spent, the caller defers the article
+            raise
         except Exception as e:
             logger.error(f"د خبر پروسس کولو کې تیروتنه: {e} - Error processing article: {e}")
             return False
@@ -286,26 +318,59 @@ class TelegramCryptoBot:
             
             # د RSS څخه خبرونو اخیستل - Fetch articles from RSS
             articles = self.fetch_rss_articles()
+            self.poll_scheduler.observe(self.rss_url, articles or [])
             
+            if articles is None:
+                return
             if not articles:
                 logger.warning("د RSS څخه خبرونه و نه موندل شول - No articles found from RSS")
                 return
             
+            # د ټولو نویو سرلیکونو ګډه ژباړه - Translate All New Titles in One Batch Before Sending
+            new_titles = [
+                a.get('title', 'سرلیک نشته - No title') for a in articles
+                if not self.is_article_posted(a.get('id') or a.get('link', ''))
+            ]
+            if new_titles and not self.telegram_breaker().is_open():
+                try:
+                    self.translation.translate_batch(new_titles, dest='ps')
+                except TranslationDeferred as e:
+                    logger.warning(f"د ژباړې بودیجه ختمه ده - Batch translation deferred: {e}")
+            
             # د نویو خبرونو شمیرنه - Count new articles
             new_articles_count = 0
+            failed_count = 0
             
             for article in articles:
                 article_id = article.get('id') or article.get('link', '')
                 
                 # د تکراري خبر کتنه - Check for duplicate article
                 if not self.is_article_posted(article_id):
-                    if self.process_and_post_article(article):
+                    # د تلیګرام circuit خلاص وي نو پاتې خبرونه پرېږدو - Stop early while the chat is failing
+                    if self.telegram_breaker().is_open():
+                        logger.warning("د تلیګرام circuit خلاص دی - Telegram circuit open, deferring remaining articles")
+                        failed_count += 1
+                        break
+                    try:
+                        posted = self.process_and_post_article(article)
+                    except TranslationDeferred as e:
+                        # بې ژباړې خبر نه لېږو - Never post untranslated; retry on a later check
+                        logger.warning(f"د ژباړې بودیجه ختمه ده - Translation budget spent ({e}), deferring remaining articles")
+                        failed_count += 1
+                        break
+                    if posted:
                         new_articles_count += 1
-                        # د نرخ محدودیت څخه مخنیوی لپاره ډنډ - Delay to prevent rate limiting
-                        time.sleep(2)
+                    else:
+                        failed_count += 1
                 else:
                     logger.debug(f"خبر دمخه لېږل شوی: {article.get('title', '')[:30]}... - Article already posted")
             
+            # ناکام خبرونه باید بیا هڅه شي - Refetch the full feed while articles are failing
+            if failed_count:
+                self.feed_cache.discard()
+            else:
+                self.feed_cache.commit()
+            
             if new_articles_count > 0:
                 logger.info(f"{new_articles_count} نوي خبرونه بریالیتوب سره ولېږل شول - {new_articles_count} new articles posted successfully")
             else:
@@ -330,8 +395,9 @@ class TelegramCryptoBot:
                     self.last_cleanup = current_time
                 
                 # د راتلونکي کتنې لپاره انتظار - Wait for next check
-                logger.info(f"د راتلونکې کتنې لپاره {self.check_interval} ثانیې انتظار - Waiting {self.check_interval} seconds for next check")
-                time.sleep(self.check_interval)
+                delay = max(1, self.poll_scheduler.seconds_until_next([self.rss_url]))
+                logger.info(f"د راتلونکې کتنې لپاره {delay:.0f} ثانیې انتظار - Waiting {delay:.0f} seconds for next check")
+                time.sleep(delay)
                 
             except KeyboardInterrupt:
                 logger.info("د کیبورډ څخه ودرولو غوښتنه ترلاسه شوه - Keyboard interrupt received")
@@ -368,6 +434,20 @@ class TelegramCryptoBot:
         """د بوټ ودرول - Stop the Bot"""
         logger.info("د کریپټو خبرونو بوټ ودریږي - Stopping Crypto News Bot")
         self.running = False
+        self.send_queue.close()
+    
+    def get_stats(self):
+        """د بوټ احصایې - Bot Statistics"""
+        return {
+            'total_posted_articles': len(self.posted_articles),
+            'bot_running': self.running,
+            'last_check': datetime.now().isoformat(),
+            'storage_file_exists': os.path.exists(self.storage_file),
+            'http': self.http.get_stats(),
+            'circuit_breakers': self.breakers.get_stats(),
+            'translation': self.translation.get_stats(),
+            'send_queue': self.send_queue.get_stats()
+        }
 
 # د Flask د ژوندي ساتلو روټونه - Flask Keep-Alive Routes
 @app.route('/')
@@ -452,6 +532,10 @@ def health_check():
 def stats():
     """د احصایو پاڼه - Statistics Endpoint"""
     try:
+        # د روان بوټ احصایې - Live statistics from the running bot
+        if 'bot_instance' in globals():
+            return bot_instance.get_stats()
+        
         if os.path.exists('posted_articles.json'):
             with open('posted_articles.json', 'r', encoding='utf-8') as f:
                 posted_data = json.load(f)
@@ -479,10 +563,11 @@ def run_flask_server():
 
 def run_telegram_bot():
     """د تلیګرام بوټ پرمخ وړل - Run Telegram Bot"""
+    global bot_instance
     try:
         # د بوټ جوړول او پیل کول - Create and start bot
-        bot = TelegramCryptoBot()
-        bot.start()
+        bot_instance = TelegramCryptoBot()
+        bot_instance.start()
     except Exception as e:
         logger.error(f"د تلیګرام بوټ کې تیروتنه: {e} - Telegram bot error: {e}")
         # د تیروتنې وروسته د ۶۰ ثانیو انتظار - Wait 60 seconds after error
@@ -0,0 +1,68 @@
+"""
+Shared fixtures for the crypto news bot tests.
+The bot modules live at the repository root and write their logs, caches
+and state files to the working directory, so every test runs in its own
+temporary directory.
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Keep files the bots create out of the repository and apart per test"""
+    monkeypatch.chdir(tmp_path)
+
+# Settings the bots read at construction that would reach real services or
+# change routing; tests get a fixed token and channel and none of these
+ENVIRONMENT_OVERRIDES = (
+    'LANGUAGE_CHANNELS', 'BROADCAST_CHANNELS', 'WEBSUB_CALLBACK_URL', 'OPENAI_API_KEY',
+    'TRANSLATION_BACKEND', 'ARTICLE_EXTRACTION', 'STREAMING_PARSE'
+)
+
+@pytest.fixture(autouse=True)
+def bot_env(monkeypatch):
+    """Set the variables the bots actually read, independent of the developer's shell"""
+    monkeypatch.setenv('BOT_TOKEN', 'test-token')
+    monkeypatch.setenv('CHANNEL_USERNAME', '@test_channel')
+    monkeypatch.setenv('CHANNEL_ID', '@test_channel')
+    for name in ENVIRONMENT_OVERRIDES:
+        monkeypatch.delenv(name, raising=False)
+
+@pytest.fixture
+def local_server():
+    """
+    Start a local HTTP server whose handler is supplied by the test
+
+    Yields:
+        callable: start(handle) -> base URL; handle(request) is called with
+            the BaseHTTPRequestHandler for every GET and POST
+    """
+    servers = []
+
+    def start(handle):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                handle(self)
+
+            def do_POST(self):
+                handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,86 @@
+"""Article extraction bookkeeping: timed-out extractions finish in the background"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('trafilatura')
+
+import article_extractor
+from article_extractor import ArticleExtractor
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    extractor = ArticleExtractor(cache_dir=str(tmp_path / 'cache'), timeout=5)
+    # Threads instead of spawned processes so the patched download is used
+    extractor.executor = ThreadPoolExecutor(max_workers=2)
+    yield extractor
+    extractor.close()
+
+def test_timed_out_extraction_is_cached_when_done(extractor, monkeypatch):
+    def slow(url, timeout):
+        time.sleep(0.3)
+        return 'Full article text.'
+
+    monkeypatch.setattr(article_extractor, '_download_and_extract', slow)
+    url = 'https://example.com/a?utm_source=x'
+    assert extractor.get_text(url, timeout=0.01) is None
+    assert extractor.get_stats()['in_flight'] == 1
+
+    assert wait_for(lambda: extractor.get_stats()['in_flight'] == 0)
+    assert extractor.get_text(url) == 'Full article text.'
+    stats = extractor.get_stats()
+    assert (stats['cache_hits'], stats['cache_misses']) == (1, 1)
+
+def test_failed_extraction_is_counted_once_and_cached_empty(extractor, monkeypatch):
+    def broken(url, timeout):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(article_extractor, '_download_and_extract', broken)
+    url = 'https://example.com/b'
+    assert extractor.get_text(url) is None
+    assert wait_for(lambda: extractor.get_stats()['in_flight'] == 0)
+    assert extractor.get_stats()['failures'] == 1
+    # The empty result is cached, so the page is not fetched again
+    assert extractor.get_text(url) is None
+    assert extractor.get_stats()['cache_hits'] == 1
+
+def test_failed_extraction_is_retried_after_failure_ttl(extractor, monkeypatch):
+    attempts = []
+
+    def flaky(url, timeout):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise RuntimeError('503 Service Unavailable')
+        return 'Full article text.'
+
+    monkeypatch.setattr(article_extractor, '_download_and_extract', flaky)
+    url = 'https://example.com/c'
+    assert extractor.get_text(url) is None
+    assert wait_for(lambda: extractor.get_stats()['in_flight'] == 0)
+    extractor.failure_ttl = 0
+    assert extractor.get_text(url) == 'Full article text.'
+    assert len(attempts) == 2
+
+def test_cache_keeps_only_the_most_recently_used_articles(extractor, monkeypatch):
+    monkeypatch.setattr(article_extractor, '_download_and_extract', lambda url, timeout: f'Text of {url}')
+    extractor.max_entries = 2
+    urls = [f'https://example.com/{n}' for n in range(3)]
+    for url in urls[:2]:
+        assert extractor.get_text(url)
+    assert wait_for(lambda: extractor.get_stats()['cached_articles'] == 2)
+    # Reading the first one makes the second the least recently used
+    assert extractor.get_text(urls[0]) == f'Text of {urls[0]}'
+    assert extractor.get_text(urls[2])
+    assert wait_for(lambda: extractor.get_stats()['evictions'] == 1)
+    assert extractor._load_cached(urls[1]) is None
+    assert extractor._load_cached(urls[0]) == f'Text of {urls[0]}'
+    assert len(os.listdir(extractor.cache_dir)) == 2
@@ -0,0 +1,103 @@
+"""Broadcast routing and per-channel posted state"""
+
+import pytest
+
+from broadcast import BroadcastRouter, BroadcastTarget, parse_broadcast_channels
+from storage import NewsStorage
+
+BITCOIN = {'title': 'Bitcoin ETF sees record inflows', 'summary': 'Funds bought more BTC on Monday.'}
+ETHER = {'title': 'Ether upgrade goes live', 'summary': 'The network upgrade cut fees.'}
+
+def test_parse_broadcast_channels():
+    targets = parse_broadcast_channels(
+        "ps:@news_ps, ps:@btc_ps:bitcoin| btc ,fa:https://t.me/news_fa:ether,"
+        ":@nolanguage,en:,ps:@news_ps:ignored,,"
+    )
+    assert [target.describe() for target in targets] == [
+        {'channel': '@news_ps', 'language': 'ps', 'topics': []},
+        {'channel': '@btc_ps', 'language': 'ps', 'topics': ['bitcoin', 'btc']},
+        {'channel': 'https://t.me/news_fa', 'language': 'fa', 'topics': ['ether']},
+    ]
+    assert parse_broadcast_channels('') == []
+    assert parse_broadcast_channels(None) == []
+
+def test_topics_match_whole_words_in_title_or_summary():
+    target = BroadcastTarget('ps', '@btc_ps', ['Bitcoin', 'btc'])
+    assert target.matches(BITCOIN)
+    assert target.matches({'title': 'Markets', 'summary': 'btc fell.'})
+    assert not target.matches(ETHER)
+    # A keyword inside a longer word is no match
+    assert not target.matches({'title': 'Bitcoiners gather', 'summary': 'The BTCUSD pair was flat.'})
+    assert BroadcastTarget('ps', '@news_ps').matches(ETHER)
+
+def test_route_groups_matching_pending_channels_by_language():
+    router = BroadcastRouter(parse_broadcast_channels(
+        "ps:@news_ps,fa:@news_fa,ps:@btc_ps:bitcoin,fa:@eth_fa:ether"
+    ))
+    assert router.languages == ['ps', 'fa']
+    assert router.channels_for(BITCOIN) == ['@news_ps', '@news_fa', '@btc_ps']
+    assert router.route(BITCOIN) == {'ps': ['@news_ps', '@btc_ps'], 'fa': ['@news_fa']}
+    assert router.route(ETHER) == {'ps': ['@news_ps'], 'fa': ['@news_fa', '@eth_fa']}
+    assert router.route(BITCOIN, pending=['@btc_ps', '@eth_fa']) == {'ps': ['@btc_ps']}
+    assert router.route(BITCOIN, pending=[]) == {}
+
+def test_storage_tracks_each_channel_until_every_target_has_the_article():
+    storage = NewsStorage('posted.json')
+    channels = ['@news_ps', '@btc_ps', '@eth_fa']
+    targets = ['@news_ps', '@btc_ps']
+    assert storage.pending_channels('urn:1', channels) == channels
+
+    storage.mark_as_posted('urn:1', BITCOIN, channel='@news_ps', targets=targets)
+    assert storage.pending_channels('urn:1', channels) == ['@btc_ps']
+    # The state survives a restart
+    assert NewsStorage('posted.json').pending_channels('urn:1', channels) == ['@btc_ps']
+
+    storage.mark_as_posted('urn:1', BITCOIN, channel='@btc_ps', targets=targets)
+    assert storage.pending_channels('urn:1', channels) == []
+
+    # Records from before per-channel tracking count as posted everywhere
+    storage.mark_as_posted('urn:2', ETHER)
+    assert storage.pending_channels('urn:2', channels) == []
+
+class UpperBackend:
+    """Stand-in backend that 'translates' by upper-casing"""
+
+    name = 'upper'
+    remote = False
+    governor = None
+    timeout = 5
+
+    def translate(self, text, dest, src='en', timeout=None):
+        return text.upper()
+
+def test_retry_after_partial_failure_sends_only_to_the_missing_channel(monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('feedparser')
+    monkeypatch.setenv('BROADCAST_CHANNELS', 'ps:@news_ps,ps:@btc_ps:bitcoin')
+    import crypto_bot_main
+    from translation import TranslationService
+
+    bot = crypto_bot_main.CryptoNewsBot()
+    monkeypatch.setattr(bot, 'translation', TranslationService([UpperBackend()]))
+    sent = []
+    down = {'@btc_ps'}
+
+    def send(text, channel, deadline=None):
+        if channel in down:
+            return False
+        sent.append(channel)
+        return True
+
+    monkeypatch.setattr(bot, 'send_telegram_message', send)
+    article = dict(BITCOIN, id='urn:1', link='https://news.example/1', summary_en=BITCOIN['summary'])
+
+    assert not bot.process_and_post_article(article)
+    assert sent == ['@news_ps']
+    assert bot.pending_channels('urn:1') == ['@btc_ps']
+    assert not bot.is_article_posted('urn:1')
+
+    down.clear()
+    assert bot.process_and_post_article(article)
+    assert sent == ['@news_ps', '@btc_ps']
+    assert bot.pending_channels('urn:1') == []
+    assert bot.is_article_posted('urn:1')
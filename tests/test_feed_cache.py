@@ -0,0 +1,75 @@
+"""Conditional GET: a 304 from the feed server must skip parsing"""
+
+import pytest
+
+pytest.importorskip('feedparser')
+pytest.importorskip('flask')
+pytest.importorskip('requests')
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Stub feed</title>
+<item><title>Bitcoin rises</title><link>https://example.com/1</link><guid>1</guid></item>
+<item><title>Ether falls</title><link>https://example.com/2</link><guid>2</guid></item>
+</channel></rss>"""
+
+ETAG = '"v1"'
+
+@pytest.fixture
+def bot():
+    import crypto_bot_main
+    bot = crypto_bot_main.CryptoNewsBot()
+    assert bot.bot_token == 'test-token' and bot.channel_username == '@test_channel'
+    return bot
+
+def test_not_modified_skips_parse(bot, local_server, monkeypatch):
+    import crypto_bot_main
+
+    requests_seen = []
+
+    def handle(request):
+        requests_seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == ETAG:
+            request.send_response(304)
+            request.end_headers()
+            return
+        request.send_response(200)
+        request.send_header('Content-Type', 'application/rss+xml')
+        request.send_header('ETag', ETAG)
+        request.send_header('Content-Length', str(len(RSS)))
+        request.end_headers()
+        request.wfile.write(RSS)
+
+    bot.rss_url = local_server(handle) + '/rss'
+
+    articles = bot.fetch_rss_news()
+    assert [a['title'] for a in articles] == ['Bitcoin rises', 'Ether falls']
+    bot.feed_cache.commit()
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("feedparser.parse called for a 304 response")
+
+    monkeypatch.setattr(crypto_bot_main.feedparser, 'parse', fail_parse)
+    assert bot.fetch_rss_news() is None
+    assert requests_seen == [None, ETAG]
+
+def test_uncommitted_validators_refetch_full_feed(bot, local_server):
+    requests_seen = []
+
+    def handle(request):
+        requests_seen.append((request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since')))
+        request.send_response(200)
+        request.send_header('ETag', ETAG)
+        request.send_header('Last-Modified', 'Mon, 06 May 2024 10:00:00 GMT')
+        request.send_header('Content-Length', str(len(RSS)))
+        request.end_headers()
+        request.wfile.write(RSS)
+
+    bot.rss_url = local_server(handle) + '/rss'
+    assert bot.fetch_rss_news()
+    assert bot.feed_cache.pending[bot.rss_url]['etag'] == ETAG
+    # A failed cycle discards the staged validators; a later commit must not persist them
+    bot.feed_cache.discard()
+    bot.feed_cache.commit()
+    assert bot.rss_url not in bot.feed_cache.validators
+    bot.fetch_rss_news()
+    assert requests_seen == [(None, None), (None, None)]
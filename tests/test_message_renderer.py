@@ -0,0 +1,80 @@
+"""split_message always terminates and every part fits and validates"""
+
+import re
+import html
+import random
+import threading
+
+import pytest
+
+from message_renderer import MessageRenderer, _cut_point, split_message, telegram_length, validate
+
+def split(message, limit):
+    """split_message on a daemon thread so a regression fails instead of hanging"""
+    result = []
+    worker = threading.Thread(target=lambda: result.append(split_message(message, limit)), daemon=True)
+    worker.start()
+    worker.join(10)
+    assert result, "split_message did not finish"
+    return result[0]
+
+def plain(message):
+    """Text without tags or whitespace, to compare what the parts carry"""
+    return re.sub(r'\s+', '', html.unescape(re.sub(r'<[^>]+>', '', message)))
+
+def check_parts(message, parts, limit):
+    for part in parts:
+        assert telegram_length(part) <= limit
+        validate(part, limit)
+    assert ''.join(plain(part) for part in parts) == plain(message)
+
+def test_long_link_wrapping_long_text():
+    href = 'https://example.com/' + 'x' * 3100
+    message = f'<a href="{href}">' + ' '.join(['bitcoin'] * 250) + '</a>'
+    parts = split(message, 4096)
+    check_parts(message, parts, 4096)
+    assert all(part.startswith(f'<a href="{href}">') for part in parts)
+
+def test_tag_longer_than_a_part_is_dropped():
+    message = '<a href="https://example.com/' + 'x' * 300 + '">' + 'word ' * 100 + '</a>'
+    parts = split(message, 200)
+    check_parts(message, parts, 200)
+    assert not any('<a' in part for part in parts)
+
+@pytest.mark.parametrize('limit', [5, 9, 200, 201])
+def test_astral_characters_always_advance(limit):
+    message = '<b>' + '😀' * 300 + '</b> ok'
+    check_parts(message, split(message, limit), limit)
+
+def test_reopened_tags_count_against_the_limit():
+    rng = random.Random(7)
+    tags = ['<b>', '<i>', '<u>', '<code>', '<a href="https://e.com/{}">']
+    closes = ['</b>', '</i>', '</u>', '</code>', '</a>']
+    for _ in range(300):
+        pieces = []
+        for _ in range(rng.randint(1, 40)):
+            roll = rng.random()
+            if roll < 0.15:
+                pieces.append(rng.choice(tags).format('q' * rng.randint(0, 60)))
+            elif roll < 0.3:
+                pieces.append(rng.choice(closes))
+            elif roll < 0.45:
+                pieces.append('😀' * rng.randint(1, 30))
+            elif roll < 0.5:
+                pieces.append('&<>' * rng.randint(1, 5))
+            else:
+                pieces.append(' '.join(rng.choice(['bitcoin', 'rose', 'Sharply.', '\n']) for _ in range(rng.randint(1, 30))))
+        message = ''.join(pieces)
+        check_parts(message, split(message, 200), 200)
+
+def test_hard_cut_never_splits_a_leading_entity():
+    assert _cut_point('&amp;&amp;abc', 3) == 5
+    message = '&' * 20
+    parts = split(message, 5)
+    check_parts(message, parts, 5)
+    assert parts == ['&amp;'] * 20
+    MessageRenderer(limit=7).render('entities', 'x' + '&' * 10)
+
+def test_tags_stay_on_every_part_when_they_fit():
+    message = '<b>' + '&' * 4 + '</b>'
+    assert split(message, 12) == ['<b>&amp;</b>'] * 4
@@ -0,0 +1,39 @@
+"""Near-duplicate copies within one fetch are dropped before summarize/translate"""
+
+import pytest
+
+from near_duplicate import batch_duplicates
+
+STORY = "Bitcoin price jumps above $70,000 as spot ETF inflows surge to a record high"
+
+ARTICLES = [
+    {'id': 'a', 'title': STORY, 'summary': 'Spot bitcoin ETFs took in record inflows on Monday.'},
+    {'id': 'b', 'title': 'Ethereum developers schedule the next network upgrade', 'summary': 'Core developers agreed on a date.'},
+    {'id': 'c', 'title': STORY + '.', 'summary': 'Spot bitcoin ETFs took in record inflows on Monday!'},
+]
+
+def test_batch_duplicates_maps_copies_to_first_article():
+    assert batch_duplicates(ARTICLES) == {'c': 'a'}
+
+def test_batch_duplicates_ignores_repeated_ids():
+    assert batch_duplicates([ARTICLES[0], dict(ARTICLES[0])]) == {}
+
+def test_copies_are_not_summarized_or_translated(monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('feedparser')
+    import crypto_bot_main
+
+    bot = crypto_bot_main.CryptoNewsBot()
+    prepared, processed = [], []
+    monkeypatch.setattr(bot, 'fetch_rss_news', lambda: [dict(a) for a in ARTICLES])
+    monkeypatch.setattr(bot, 'prepare_articles', lambda articles: prepared.extend(a['id'] for a in articles))
+
+    def post(article):
+        processed.append(article['id'])
+        bot.mark_article_as_posted(article, bot.channel_username)
+        return True
+
+    monkeypatch.setattr(bot, 'process_and_post_article', post)
+    bot.check_and_post_new_articles()
+    assert prepared == ['a', 'b']
+    assert processed == ['a', 'b']
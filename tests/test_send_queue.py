@@ -0,0 +1,114 @@
+"""Send queue delivery and the shared sendMessage wiring"""
+
+import json
+import time
+
+import pytest
+
+pytest.importorskip('requests')
+
+from circuit_breaker import CircuitBreakerRegistry
+from http_client import HTTPClient
+from send_queue import SendQueue, create_telegram_sender
+
+def test_error_outside_send_resolves_future_and_resets_chat(monkeypatch):
+    queue = SendQueue(workers=1, chat_rate_per_minute=6000, chat_burst=10, global_rate_per_second=100)
+    sent = []
+
+    def broken_throttle(state):
+        raise RuntimeError("bucket exploded")
+
+    monkeypatch.setattr(queue, '_throttle', broken_throttle)
+    with pytest.raises(RuntimeError):
+        queue.submit('@chat', ['one'], sent.append).result(timeout=5)
+    monkeypatch.undo()
+
+    # The chat is free again, so a new submit starts a fresh drain
+    assert queue.submit('@chat', ['two'], lambda message: sent.append(message) or True).result(timeout=5) == 1
+    assert sent == ['two']
+    queue.close()
+
+def test_telegram_sender_pauses_on_flood_control(local_server):
+    posts = []
+
+    def handle(request):
+        body = json.loads(request.rfile.read(int(request.headers['Content-Length'])))
+        posts.append(body)
+        if body['text'] == 'slow down':
+            status, reply = 429, {'ok': False, 'parameters': {'retry_after': 7}}
+        else:
+            status, reply = 200, {'ok': True, 'result': {}}
+        data = json.dumps(reply).encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    queue = SendQueue(workers=1)
+    breakers = CircuitBreakerRegistry(failure_threshold=1)
+    send = create_telegram_sender(local_server(handle), queue, HTTPClient(timeout=5), breakers)
+
+    assert send('@chat', '<b>hello</b>')['ok']
+    assert not send('@chat', 'slow down')['ok']
+    assert queue.get_stats()['pauses'] == 1
+    # Flood control is not a failure of the chat
+    assert not breakers.get('telegram:@chat').is_open()
+
+    # Invalid markup never reaches Telegram
+    assert send('@chat', '<b>unclosed') is None
+    assert [post['text'] for post in posts] == ['<b>hello</b>', 'slow down']
+    queue.close()
+
+def _reply(request, status, reply):
+    data = json.dumps(reply).encode()
+    request.send_response(status)
+    request.send_header('Content-Type', 'application/json')
+    request.send_header('Content-Length', str(len(data)))
+    request.end_headers()
+    request.wfile.write(data)
+
+def test_queue_sends_again_after_flood_control(local_server):
+    posts = []
+
+    def handle(request):
+        body = json.loads(request.rfile.read(int(request.headers['Content-Length'])))
+        posts.append(body['text'])
+        if len(posts) == 2:
+            _reply(request, 429, {'ok': False, 'parameters': {'retry_after': 0.2}})
+        else:
+            _reply(request, 200, {'ok': True, 'result': {}})
+
+    queue = SendQueue(workers=1, chat_rate_per_minute=6000, chat_burst=10, global_rate_per_second=100)
+    send = create_telegram_sender(local_server(handle), queue, HTTPClient(timeout=5), CircuitBreakerRegistry())
+
+    def deliver(part):
+        reply = send('@chat', part)
+        return bool(reply and reply.get('ok'))
+
+    assert queue.send('@chat', ['one', 'two', 'three'], deliver)
+    # The refused part went out again after the pause, before the next one
+    assert posts == ['one', 'two', 'two', 'three']
+    stats = queue.get_stats()
+    assert (stats['sent'], stats['failed'], stats['flood_retries']) == (3, 0, 1)
+    queue.close()
+
+def test_unparsable_message_is_neither_success_nor_failure(local_server):
+    def handle(request):
+        request.rfile.read(int(request.headers['Content-Length']))
+        _reply(request, 400, {'ok': False, 'description': "Bad Request: can't parse entities"})
+
+    breakers = CircuitBreakerRegistry(failure_threshold=2, base_delay=0.01)
+    breaker = breakers.get('telegram:@chat')
+    breaker.record_failure()
+    send = create_telegram_sender(local_server(handle), None, HTTPClient(timeout=5), breakers)
+
+    assert not send('@chat', 'hello')['ok']
+    # Neither reset nor increased
+    assert breaker.consecutive_failures == 1
+
+    # A half-open breaker's probe is handed back, not counted either way
+    breaker.record_failure()
+    time.sleep(0.05)
+    assert not send('@chat', 'hello')['ok']
+    assert breaker.allow()
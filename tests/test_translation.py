@@ -0,0 +1,155 @@
+"""Translation service and how the bots use its results"""
+
+import pytest
+
+from circuit_breaker import CircuitBreakerRegistry
+from rate_governor import RateGovernor, TranslationDeferred
+from text_utils import split_sentences
+from translation import TranslationService
+from translation_backends import TranslationBackendError
+
+def test_failed_batch_translation_is_not_retried(monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('feedparser')
+    import crypto_bot_main
+
+    bot = crypto_bot_main.CryptoNewsBot()
+    calls = []
+    monkeypatch.setattr(bot.translation, 'translate', lambda *args, **kwargs: calls.append(args))
+    article = {'title': 'Bitcoin rallies', 'summary_en': 'Bitcoin rallied on Monday.'}
+
+    message = bot.format_news_message(article, 'ps', None)
+    assert calls == []
+    assert 'Bitcoin rallied on Monday.' in message.splitlines()[1]
+
+    bot.format_news_message(article, 'ps')
+    assert len(calls) == 1
+
+class UpperBackend:
+    """Stand-in backend that 'translates' by upper-casing"""
+
+    name = 'upper'
+    remote = False
+    governor = None
+    timeout = 5
+
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text, dest, src='en', timeout=None):
+        self.calls.append(text)
+        return text.upper()
+
+@pytest.mark.parametrize('text, expected', [
+    ("Plan B. It is fine.", ["Plan B.", "It is fine."]),
+    ("John F. Kennedy spoke. Then he left.", ["John F. Kennedy spoke.", "Then he left."]),
+    ("J. P. Morgan bought more. Shares rose.", ["J. P. Morgan bought more.", "Shares rose."]),
+    ("It is the No. 1 exchange. Volume rose.", ["It is the No. 1 exchange.", "Volume rose."]),
+    ("Asked about a ban, he said no. The market rallied.", ["Asked about a ban, he said no.", "The market rallied."]),
+])
+def test_split_sentences_initials_and_no(text, expected):
+    assert split_sentences(text) == expected
+
+def test_translate_batch_keeps_paragraph_breaks():
+    backend = UpperBackend()
+    service = TranslationService([backend])
+    text = "Bitcoin rose. Ether fell.\n\nAnalysts were calm."
+    assert service.translate_batch([text])[0] == "BITCOIN ROSE. ETHER FELL.\n\nANALYSTS WERE CALM."
+    assert len(backend.calls) == 1
+
+class RefusingBreaker:
+    """Breaker that looks closed but refuses the call, like a taken half-open probe"""
+
+    def is_open(self):
+        return False
+
+    def allow(self):
+        return False
+
+class RefusingRegistry:
+    def get(self, name):
+        return RefusingBreaker()
+
+def test_breaker_refusal_refunds_governor_admission():
+    backend = UpperBackend()
+    backend.governor = RateGovernor('upper', requests_per_minute=1, burst=1, char_limit=100, max_wait=0)
+    service = TranslationService([backend], breakers=RefusingRegistry())
+
+    for _ in range(3):
+        assert service.translate_batch(["Bitcoin rose."])[0] is None
+    assert backend.calls == []
+    stats = backend.governor.get_stats()
+    assert stats['admitted'] == 0
+    assert stats['deferred'] == 0
+    assert stats['quota_remaining'] == 100
+
+class RateLimitedBackend(UpperBackend):
+    """Stand-in backend refused the way googletrans reports it"""
+
+    name = 'limited'
+
+    def translate(self, text, dest, src='en', timeout=None):
+        self.calls.append(text)
+        try:
+            raise RuntimeError("429 (Too Many Requests) from TSA server")
+        except RuntimeError as e:
+            raise TranslationBackendError(f"{self.name}: translation failed") from e
+
+def test_backend_rate_limit_defers_instead_of_failing(monkeypatch):
+    backend = RateLimitedBackend()
+    backend.governor = RateGovernor('limited', requests_per_minute=60, burst=5, char_limit=100, max_wait=0)
+    breakers = CircuitBreakerRegistry(failure_threshold=1)
+    service = TranslationService([backend], breakers=breakers)
+
+    with pytest.raises(TranslationDeferred):
+        service.translate_batch(["Bitcoin rose."])
+    assert backend.calls == ["Bitcoin rose."]
+    # The refused request gives its admission back and is no breaker failure
+    stats = backend.governor.get_stats()
+    assert stats['admitted'] == 0
+    assert stats['quota_remaining'] == 100
+    assert not breakers.get('translator:limited').is_open()
+
+    # The bot defers the article instead of publishing the placeholder
+    pytest.importorskip('flask')
+    pytest.importorskip('feedparser')
+    import crypto_bot_main
+
+    bot = crypto_bot_main.CryptoNewsBot()
+    monkeypatch.setattr(bot, 'translation', service)
+    with pytest.raises(TranslationDeferred):
+        bot.format_news_message({'title': 'Bitcoin rallies', 'summary_en': 'Bitcoin rose.'}, 'ps')
+
+class FailingBackend(UpperBackend):
+    """Stand-in backend that never manages a translation"""
+
+    name = 'failing'
+
+    def translate(self, text, dest, src='en', timeout=None):
+        self.calls.append(text)
+        raise TranslationBackendError(f"{self.name}: empty translation")
+
+def test_failed_batch_results_are_reused_when_posting(monkeypatch):
+    pytest.importorskip('flask')
+    pytest.importorskip('feedparser')
+    import crypto_bot_main
+
+    bot = crypto_bot_main.CryptoNewsBot()
+    backend = FailingBackend()
+    monkeypatch.setattr(bot, 'translation', TranslationService([backend]))
+    sent = []
+    monkeypatch.setattr(bot, 'send_telegram_message', lambda text, channel, deadline=None: sent.append(text) or True)
+    article = {
+        'id': 'urn:1', 'title': 'Bitcoin rallies', 'link': 'https://news.example/1',
+        'summary': 'Bitcoin rallied on Monday.', 'summary_en': 'Bitcoin rallied on Monday.'
+    }
+
+    bot.prepare_articles([article])
+    attempts = len(backend.calls)
+    assert attempts > 0
+    assert article['translations'] == {'ps': None}
+
+    assert bot.process_and_post_article(article)
+    # The failure from the batch is final: posting sends nothing to the backends
+    assert len(backend.calls) == attempts
+    assert len(sent) == 1
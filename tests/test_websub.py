@@ -0,0 +1,154 @@
+"""WebSub subscription against a local hub stand-in, driven through the Flask callback route"""
+
+import hmac
+import hashlib
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('requests')
+
+PUSH = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Hub feed</title>
+<item><title>Bitcoin rises</title><link>https://example.com/1</link><guid>1</guid></item>
+</channel></rss>"""
+
+def sign(secret, body):
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+@pytest.fixture
+def hub(local_server):
+    """Hub stand-in that accepts subscription requests and remembers them"""
+    requests_seen = []
+
+    def handle(request):
+        length = int(request.headers.get('Content-Length', 0))
+        form = {k: v[0] for k, v in parse_qs(request.rfile.read(length).decode('utf-8')).items()}
+        requests_seen.append(form)
+        request.send_response(202)
+        request.send_header('Content-Length', '0')
+        request.end_headers()
+
+    return local_server(handle) + '/hub', requests_seen
+
+@pytest.fixture
+def subscriber():
+    import keep_alive
+    from websub import WebSubSubscriber
+
+    received = []
+    delivered = threading.Event()
+
+    def on_entries(feed_url, articles):
+        received.append((feed_url, articles))
+        delivered.set()
+
+    subscriber = WebSubSubscriber('https://bot.example.com/websub', on_entries)
+    keep_alive.set_websub_subscriber(subscriber)
+    yield subscriber, keep_alive.app.test_client(), received, delivered
+    keep_alive.set_websub_subscriber(None)
+
+def verify(client, request, lease='3600'):
+    """Send the hub's verification GET for a subscription request"""
+    path = urlparse(request['hub.callback']).path
+    return client.get(path, query_string={
+        'hub.mode': 'subscribe',
+        'hub.topic': request['hub.topic'],
+        'hub.challenge': 'challenge-123',
+        'hub.lease_seconds': lease
+    })
+
+def push(client, request, secret, body=PUSH):
+    path = urlparse(request['hub.callback']).path
+    return client.post(path, data=body, headers={'X-Hub-Signature': sign(secret, body)})
+
+def test_subscribe_verify_and_signed_push(hub, subscriber):
+    hub_url, hub_requests = hub
+    websub, client, received, delivered = subscriber
+    feed_url = 'https://example.com/rss'
+
+    assert websub.subscribe(feed_url, hub_url, feed_url)
+    request = hub_requests[0]
+    assert request['hub.mode'] == 'subscribe'
+    assert request['hub.topic'] == feed_url
+    assert not websub.is_active(feed_url)
+
+    answer = verify(client, request)
+    assert answer.status_code == 200
+    assert answer.get_data(as_text=True) == 'challenge-123'
+    assert websub.is_active(feed_url)
+
+    assert push(client, request, 'wrong secret').status_code == 202
+    assert websub.pushes_rejected == 1
+    assert push(client, request, request['hub.secret']).status_code == 202
+    assert delivered.wait(5)
+    assert received[0][0] == feed_url
+    assert [a['title'] for a in received[0][1]] == ['Bitcoin rises']
+
+def test_invalid_lease_is_rejected(hub, subscriber):
+    hub_url, hub_requests = hub
+    websub, client, _, _ = subscriber
+    feed_url = 'https://example.com/rss'
+
+    websub.subscribe(feed_url, hub_url, feed_url)
+    answer = verify(client, hub_requests[0], lease='forever')
+    assert answer.status_code == 400
+    assert not websub.is_active(feed_url)
+
+def test_renewal_keeps_old_secret_until_verified(hub, subscriber):
+    hub_url, hub_requests = hub
+    websub, client, _, _ = subscriber
+    feed_url = 'https://example.com/rss'
+
+    websub.subscribe(feed_url, hub_url, feed_url)
+    verify(client, hub_requests[0])
+    old_secret = hub_requests[0]['hub.secret']
+
+    websub.subscribe(feed_url, hub_url, feed_url)
+    renewal = hub_requests[1]
+    assert renewal['hub.secret'] != old_secret
+    assert websub.is_active(feed_url)
+
+    # Pushes signed before the hub saw the renewal still count
+    push(client, renewal, old_secret)
+    assert websub.pushes_received == 1 and websub.pushes_rejected == 0
+
+    verify(client, renewal)
+    push(client, renewal, old_secret)
+    assert websub.pushes_rejected == 1
+    push(client, renewal, renewal['hub.secret'])
+    assert websub.pushes_received == 2
+
+def test_callback_key_is_random(hub, subscriber):
+    hub_url, hub_requests = hub
+    websub, _, _, _ = subscriber
+    feed_url = 'https://example.com/rss'
+
+    websub.subscribe(feed_url, hub_url, feed_url)
+    key = urlparse(hub_requests[0]['hub.callback']).path.rsplit('/', 1)[-1]
+    assert key != hashlib.sha256(feed_url.encode('utf-8')).hexdigest()[:16]
+    assert len(key) >= 32
+
+def test_verification_without_outstanding_request_is_refused(hub, subscriber):
+    import websub as websub_module
+
+    hub_url, hub_requests = hub
+    websub, client, _, _ = subscriber
+    feed_url = 'https://example.com/rss'
+
+    websub.subscribe(feed_url, hub_url, feed_url)
+    assert verify(client, hub_requests[0], lease='60').status_code == 200
+    expires_at = websub.subscriptions[next(iter(websub.subscriptions))]['expires_at']
+
+    # A replayed or forged GET cannot extend the lease once nothing is pending
+    assert verify(client, hub_requests[0], lease='864000').status_code == 404
+    assert websub.subscriptions[next(iter(websub.subscriptions))]['expires_at'] == expires_at
+
+    # Nor can it promote a renewal's secret once that request is no longer outstanding
+    websub.subscribe(feed_url, hub_url, feed_url)
+    subscription = next(iter(websub.subscriptions.values()))
+    subscription['requested_at'] -= websub_module.PENDING_TIMEOUT + 1
+    assert verify(client, hub_requests[1]).status_code == 404
+    assert subscription['secret'] == hub_requests[0]['hub.secret']
@@ -0,0 +1,104 @@
+"""
+Text helpers shared by the crypto news bot's summarizers and translators.
+"""
+
+import re
+
+# Abbreviations whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sr jr st inc ltd co corp vs etc e.g i.e u.s u.k u.n e.u
+jan feb mar apr jun jul aug sep sept oct nov dec est approx
+""".split())
+
+# Capitalized words that start sentences far more often than they are surnames,
+# so "Plan B. It is fine." ends after "B." while "John F. Kennedy" does not
+SENTENCE_STARTERS = frozenset("""
+a an the this that these those it its he she they we i you his her their our my
+there here in on at to of by for from with as if so but and or nor yet then now
+when while after before since until once however meanwhile also still what
+which who why how where some many most all any each both few more no not one
+""".split())
+
+# Dotted initials such as "J.P" or "U.S.A" (trailing period already stripped)
+INITIALISM = re.compile(r'(?:[a-z]\.)+[a-z]')
+
+# Candidate boundary: terminal punctuation, optional closing quote/bracket, then whitespace
+BOUNDARY = re.compile(r'([.!?؟۔]+["\'”’)\]]*)(\s+)')
+
+# First word after a candidate boundary, with its period if it has one
+NEXT_WORD = re.compile(r'[\w’\'-]+\.?')
+
+def _ends_with_abbreviation(chunk, rest):
+    """
+    Check whether the text before a period ends in a known abbreviation or initial
+
+    Args:
+        chunk (str): Sentence so far, ending with the period
+        rest (str): Text after the whitespace that follows the period
+    """
+    word = chunk.rstrip('.').rsplit(None, 1)[-1] if chunk.strip() else ''
+    word = word.lstrip('("\'')
+    lower = word.lower()
+    if lower in ABBREVIATIONS or INITIALISM.fullmatch(lower):
+        return True
+    match = NEXT_WORD.match(rest)
+    following = match.group() if match else ''
+    if lower == 'no':
+        # "No. 1 exchange", but "said no. The"
+        return following[:1].isdigit()
+    if len(word) == 1 and word.isalpha() and word.isupper():
+        # An initial runs into another initial or a surname: "J. P. Morgan", "John F. Kennedy"
+        if len(following) == 2 and following[0].isupper() and following.endswith('.'):
+            return True
+        return following[:1].isupper() and following.rstrip('.').lower() not in SENTENCE_STARTERS
+    return False
+
+def split_sentences_with_separators(text):
+    """
+    Split text into sentences, keeping the whitespace between them
+
+    Returns:
+        list: (sentence, separator) pairs; joining sentence + separator for
+            every pair gives back the stripped text
+    """
+    text = (text or '').strip()
+    if not text:
+        return []
+
+    pairs, start = [], 0
+    for match in BOUNDARY.finditer(text):
+        end = match.end(1)
+        following = text[match.end():match.end() + 1]
+        if not following or not (following.isupper() or following.isdigit() or following in '$"\'“(['
+                                 or not following.isascii()):
+            continue
+        if match.group(1).startswith('.') and _ends_with_abbreviation(
+                text[start:match.start(1) + 1], text[match.end():]):
+            continue
+        pairs.append((text[start:end], match.group(2)))
+        start = match.end()
+
+    tail = text[start:]
+    if tail:
+        pairs.append((tail, ''))
+    return pairs
+
+def split_sentences(text):
+    """
+    Split text into sentences
+
+    Periods inside numbers ("$1.5B", "3.2%"), known abbreviations ("U.S.",
+    "Inc.") and initials ("J.P. Morgan") do not end a sentence. "No." only
+    counts as an abbreviation before a number, and a single capital initial
+    only before another initial or a surname ("John F. Kennedy", but
+    "Plan B. It is fine." is two sentences). A boundary also needs the next
+    sentence to start with an uppercase letter, digit, currency sign or
+    quote. Arabic-script question marks and full stops count.
+
+    Args:
+        text (str): Plain text
+
+    Returns:
+        list: Sentences without surrounding whitespace
+    """
+    return [sentence for sentence, _ in split_sentences_with_separators(text)]
@@ -0,0 +1,154 @@
+"""
+Token budgets and usage accounting for the crypto news bot's LLM calls.
+Counts tokens with tiktoken when installed (about four characters per
+token otherwise), trims prompt input to a token limit and records prompt
+tokens, completion tokens and latency per call.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from text_utils import split_sentences
+from extractive_summarizer import rank_sentences
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Characters per token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+class TokenBudget:
+    """Cached token counts and input trimming for one model"""
+
+    def __init__(self, model='gpt-3.5-turbo', max_cached=4096):
+        """
+        Args:
+            model (str): Model whose tokenizer to use
+            max_cached (int): Token counts kept, least recently used go first
+        """
+        self.model = model
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                try:
+                    self.encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self.encoding = tiktoken.get_encoding('cl100k_base')
+            except Exception as e:
+                # The encoding is downloaded on first use and may be unreachable
+                logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        self.max_cached = max_cached
+        self.counts = OrderedDict()
+        self.lock = threading.Lock()
+        self.trimmed = 0
+
+    def count(self, text):
+        """
+        Count the tokens of a text (cached)
+
+        Returns:
+            int: Token count, estimated when tiktoken is not installed
+        """
+        if not text:
+            return 0
+        with self.lock:
+            if text in self.counts:
+                self.counts.move_to_end(text)
+                return self.counts[text]
+        if self.encoding is not None:
+            tokens = len(self.encoding.encode(text))
+        else:
+            tokens = -(-len(text) // CHARS_PER_TOKEN)
+        with self.lock:
+            self.counts[text] = tokens
+            while len(self.counts) > self.max_cached:
+                self.counts.popitem(last=False)
+        return tokens
+
+    def _cut(self, text, max_tokens):
+        """Hard cut to max_tokens"""
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    def trim(self, text, max_tokens):
+        """
+        Fit a text into a token limit
+
+        Keeps the most central sentences that fit, in their original order;
+        a single oversized sentence is cut hard.
+
+        Args:
+            text (str): Plain text
+            max_tokens (int): Token limit, 0 or None for no limit
+
+        Returns:
+            str: The text itself when it fits, otherwise a trimmed version
+        """
+        if not max_tokens or self.count(text) <= max_tokens:
+            return text
+
+        self.trimmed += 1
+        sentences = split_sentences(text)
+        scores = rank_sentences(sentences)
+        chosen, used = [], 0
+        for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            # +1 for the joining space
+            cost = self.count(sentences[index]) + 1
+            if used + cost <= max_tokens:
+                chosen.append(index)
+                used += cost
+        if not chosen:
+            return self._cut(text, max_tokens)
+        logger.debug(f"Trimmed input from {len(sentences)} to {len(chosen)} sentences for {max_tokens} tokens")
+        return ' '.join(sentences[i] for i in sorted(chosen))
+
+class TokenUsage:
+    """Prompt/completion token and latency totals across LLM calls"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last = None
+
+    def record(self, prompt_tokens, completion_tokens, latency):
+        """
+        Record one call
+
+        Args:
+            prompt_tokens (int): Tokens sent
+            completion_tokens (int): Tokens generated
+            latency (float): Seconds the call took
+        """
+        with self.lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.last = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'latency_ms': round(latency * 1000, 1)
+            }
+
+    def get_stats(self):
+        """Get token totals and latency for /stats"""
+        with self.lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'avg_prompt_tokens': round(self.prompt_tokens / self.calls, 1) if self.calls else 0.0,
+                'avg_latency_ms': round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+                'max_latency_ms': round(self.max_latency * 1000, 1),
+                'last_call': self.last
+            }
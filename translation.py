@@ -0,0 +1,363 @@
+"""
+Translation service for the crypto news bot.
+Puts a sentence-level translation memory (the persistent cache) and
+per-backend circuit breakers in front of the translation backends, packs
+many sentences into one backend request, and fans out to several target
+languages concurrently.
+"""
+
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from persistent_cache import PersistentCache
+from text_utils import split_sentences_with_separators
+from rate_governor import TranslationDeferred
+from deadline import cap, check
+
+logger = logging.getLogger(__name__)
+
+# Numbered markers on their own lines survive translation and let a packed
+# response be split back into its segments
+SEGMENT_MARKER = "[[{}]]"
+SEGMENT_PATTERN = re.compile(r'\[\s*\[\s*(\d+)\s*\]\s*\]')
+
+# Stands for "no translation attempted yet"; None is a failed translation
+NOT_TRANSLATED = object()
+
+# Backend errors meaning "slow down" rather than "broken"
+RATE_LIMIT_PATTERN = re.compile(r'\b429\b|too many requests|rate.?limit', re.IGNORECASE)
+
+def is_rate_limited(error):
+    """
+    Tell whether a backend error is a rate-limit refusal
+
+    Looks through the exception chain for an HTTP 429 response or a message
+    such as googletrans' "429 Too Many Requests".
+
+    Args:
+        error (Exception): Error raised by a backend
+
+    Returns:
+        bool: True if the backend asked us to slow down
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        response = getattr(error, 'response', None)
+        if getattr(error, 'status_code', None) == 429 or getattr(response, 'status_code', None) == 429:
+            return True
+        if RATE_LIMIT_PATTERN.search(str(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def parse_language_channels(value, default_channel, default_language='ps'):
+    """
+    Parse a LANGUAGE_CHANNELS setting such as "ps:@news_ps,fa:@news_fa"
+
+    Args:
+        value (str): Comma-separated language:channel pairs
+        default_channel (str): Channel used when value is empty
+        default_language (str): Language of the default channel
+
+    Returns:
+        dict: Language code -> channel, in configured order
+    """
+    channels = {}
+    for pair in (value or '').split(','):
+        if not pair.strip():
+            continue
+        language, _, channel = pair.partition(':')
+        language, channel = language.strip(), channel.strip()
+        if not language or not channel:
+            logger.warning(f"Ignoring malformed language channel entry: {pair!r}")
+            continue
+        if channel in channels.values():
+            logger.warning(f"Channel {channel} is configured for more than one language")
+        channels[language] = channel
+    return channels or {default_language: default_channel}
+
+class TranslationService:
+    """Cached, breaker-guarded translation with batch packing"""
+
+    def __init__(self, backends, cache=None, breakers=None, src='en', max_batch_chars=4500,
+                 max_workers=3):
+        """
+        Args:
+            backends (list): TranslationBackend instances, tried in order
+            cache (PersistentCache): Translation cache, None disables caching
+            breakers (CircuitBreakerRegistry): Registry holding a 'translator:<backend>' breaker each
+            src (str): Source language of every text
+            max_batch_chars (int): Longest packed request sent to a backend
+            max_workers (int): Target languages translated at the same time
+        """
+        self.backends = list(backends)
+        self.cache = cache
+        self.breakers = breakers
+        self.src = src
+        self.max_batch_chars = max_batch_chars
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+        self.requests = 0
+        self.batched_segments = 0
+        self.split_failures = 0
+        self.sentences_seen = 0
+        self.sentences_remembered = 0
+        self.chars_sent = 0
+        self.chars_saved = 0
+
+    def _cache_key(self, text, dest):
+        return PersistentCache.make_key(self.src, dest, text)
+
+    def _cached(self, text, dest):
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(text, dest))
+
+    def _store_if_primary(self, text, dest, translated, backend):
+        # Fallback output is not cached so the primary backend gets another chance later
+        if self.cache is not None and translated is not None and backend is self.backends[0]:
+            self.cache.set(self._cache_key(text, dest), translated)
+
+    def _request(self, text, dest, deadline=None):
+        """
+        Send one request, falling back through the backends in order
+
+        A backend whose breaker is open is skipped without a call, and a
+        backend whose rate governor refuses the request is skipped too. A
+        backend that answers with a rate-limit error gets its admission back
+        and counts as deferred, not as a failure.
+
+        Returns:
+            tuple: (translated text or None when every backend failed or was
+                skipped, backend that produced it)
+
+        Raises:
+            TranslationDeferred: When no backend could run because of rate limits
+                or quota; the caller should retry the article later
+            DeadlineExceeded: When the article's time budget ran out
+        """
+        self.requests += 1
+        deferred = None
+        for backend in self.backends:
+            check(deadline, f"translate via {backend.name}")
+            breaker = self.breakers.get(f"translator:{backend.name}") if self.breakers else None
+            if breaker and breaker.is_open():
+                logger.debug(f"Translator circuit open for {backend.name}, skipping")
+                continue
+            if backend.governor:
+                try:
+                    backend.governor.admit(len(text), timeout=cap(deadline))
+                except TranslationDeferred as e:
+                    logger.warning(f"Translation deferred: {e}")
+                    deferred = e
+                    continue
+            if breaker and not breaker.allow():
+                # The circuit opened or its probe was taken while we queued: give the admission back
+                if backend.governor:
+                    backend.governor.refund(len(text))
+                logger.debug(f"Translator circuit open for {backend.name}, skipping")
+                continue
+            try:
+                translated = backend.translate(text, dest, src=self.src, timeout=cap(deadline, backend.timeout))
+            except Exception as e:
+                if is_rate_limited(e):
+                    if backend.governor:
+                        backend.governor.refund(len(text))
+                    if breaker:
+                        breaker.release()
+                    logger.warning(f"Translation deferred, {backend.name} is rate limited: {e}")
+                    deferred = TranslationDeferred(f"{backend.name} rate limited: {e}")
+                    continue
+                if breaker:
+                    breaker.record_failure()
+                logger.error(f"Translation error: {e}")
+                continue
+            if breaker:
+                breaker.record_success()
+            return translated, backend
+
+        if deferred is not None:
+            raise deferred
+        logger.warning("No translation backend available")
+        return None, None
+
+    def translate(self, text, dest='ps', deadline=None):
+        """
+        Translate one text
+
+        Returns:
+            str: Translated text, or None when translation failed
+        """
+        return self.translate_batch([text], dest, deadline)[0]
+
+    def _pack(self, texts):
+        """Group texts into packed requests no longer than max_batch_chars"""
+        groups, group, size = [], [], 0
+        for text in texts:
+            cost = len(text) + 16
+            if group and size + cost > self.max_batch_chars:
+                groups.append(group)
+                group, size = [], 0
+            group.append(text)
+            size += cost
+        if group:
+            groups.append(group)
+        return groups
+
+    def _translate_group(self, group, dest, deadline=None):
+        """
+        Translate a group of texts in one request
+
+        Returns:
+            list: (translation or None, backend) pairs aligned with group
+        """
+        if len(group) == 1:
+            return [self._request(group[0], dest, deadline)]
+
+        packed = '\n'.join(
+            f"{SEGMENT_MARKER.format(i)}\n{text}" for i, text in enumerate(group)
+        )
+        translated, backend = self._request(packed, dest, deadline)
+        if translated is None:
+            return [(None, None)] * len(group)
+
+        parts = SEGMENT_PATTERN.split(translated)
+        # parts = [prefix, index, text, index, text, ...]
+        indexes = parts[1::2]
+        if indexes != [str(i) for i in range(len(group))] or parts[0].strip():
+            # The backend mangled a marker; translate one by one instead
+            self.split_failures += 1
+            logger.warning(f"Could not split batched translation of {len(group)} segments, retrying one by one")
+            return [self._request(text, dest, deadline) for text in group]
+
+        self.batched_segments += len(group)
+        return [(segment.strip(), backend) for segment in parts[2::2]]
+
+    def translate_batch(self, texts, dest='ps', deadline=None):
+        """
+        Translate many texts with as few requests as possible
+
+        Whole texts seen before are answered from the cache. Other texts are
+        split into sentences; sentences already in the translation memory are
+        reused and only unseen sentences are packed into backend requests of
+        up to max_batch_chars characters, then the texts are reassembled.
+
+        Args:
+            texts (list): Texts to translate
+            dest (str): Target language code
+            deadline (Deadline): Optional time budget; backend timeouts are
+                capped by it
+
+        Returns:
+            list: Translations aligned with texts (None where translation failed)
+
+        Raises:
+            TranslationDeferred: When the translation budget is exhausted
+            DeadlineExceeded: When the time budget runs out before a request
+        """
+        results = {}
+        sentences_of = {}
+        for text in texts:
+            if text in results or text in sentences_of:
+                continue
+            if not text or not text.strip():
+                results[text] = text
+                continue
+            cached = self._cached(text, dest)
+            if cached is not None:
+                results[text] = cached
+            else:
+                sentences_of[text] = split_sentences_with_separators(text)
+
+        # Sentence translations: sentence -> (translated, cacheable)
+        memory = {}
+        missing = []
+        for sentences in sentences_of.values():
+            for sentence, _ in sentences:
+                self.sentences_seen += 1
+                if sentence in memory:
+                    self.sentences_remembered += 1
+                    self.chars_saved += len(sentence)
+                    continue
+                cached = self._cached(sentence, dest)
+                if cached is not None:
+                    memory[sentence] = (cached, True)
+                    self.sentences_remembered += 1
+                    self.chars_saved += len(sentence)
+                else:
+                    memory[sentence] = (None, False)
+                    missing.append(sentence)
+
+        for group in self._pack(missing):
+            self.chars_sent += sum(len(sentence) for sentence in group)
+            for sentence, (translated, backend) in zip(group, self._translate_group(group, dest, deadline)):
+                memory[sentence] = (translated, backend is self.backends[0])
+                self._store_if_primary(sentence, dest, translated, backend)
+
+        for text, sentences in sentences_of.items():
+            parts = [memory[sentence] for sentence, _ in sentences]
+            if any(translated is None for translated, _ in parts):
+                results[text] = None
+                continue
+            # Rejoin with the original separators so paragraph breaks survive
+            results[text] = ''.join(
+                translated + separator for (translated, _), (_, separator) in zip(parts, sentences)
+            )
+            if self.cache is not None and all(cacheable for _, cacheable in parts):
+                self.cache.set(self._cache_key(text, dest), results[text])
+
+        if missing:
+            logger.info(f"Sent {len(missing)} unseen sentences to the translation backends for '{dest}'")
+        return [results[text] for text in texts]
+
+    def translate_many(self, text, dests, deadline=None):
+        """
+        Translate one text into several languages concurrently
+
+        Args:
+            text (str): Text to translate
+            dests (list): Target language codes
+            deadline (Deadline): Optional time budget shared by all languages
+
+        Returns:
+            dict: Language code -> translated text (None where translation failed)
+        """
+        dests = list(dests)
+        if len(dests) <= 1:
+            return {dest: self.translate(text, dest, deadline) for dest in dests}
+        futures = {dest: self.executor.submit(self.translate, text, dest, deadline) for dest in dests}
+        return {dest: future.result() for dest, future in futures.items()}
+
+    def translate_batch_many(self, texts, dests, deadline=None):
+        """
+        Batch-translate texts into several languages, one batch per language in parallel
+
+        Returns:
+            dict: Language code -> translations aligned with texts
+        """
+        dests = list(dests)
+        if len(dests) <= 1:
+            return {dest: self.translate_batch(texts, dest, deadline) for dest in dests}
+        futures = {dest: self.executor.submit(self.translate_batch, texts, dest, deadline) for dest in dests}
+        return {dest: future.result() for dest, future in futures.items()}
+
+    def get_stats(self):
+        """Get translation request statistics"""
+        return {
+            'requests': self.requests,
+            'batched_segments': self.batched_segments,
+            'split_failures': self.split_failures,
+            'sentences_seen': self.sentences_seen,
+            'sentences_remembered': self.sentences_remembered,
+            'chars_sent': self.chars_sent,
+            'chars_saved': self.chars_saved,
+            'backends': {backend.name: backend.get_stats() for backend in self.backends},
+            'cache': self.cache.get_stats() if self.cache is not None else None
+        }
+
+    def close(self):
+        """Stop the language worker threads and the backends"""
+        self.executor.shutdown(wait=False)
+        for backend in self.backends:
+            backend.close()
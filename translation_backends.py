@@ -0,0 +1,295 @@
+"""
+Pluggable translation backends for the crypto news bot.
+Every backend enforces a per-call timeout and a concurrency limit and
+records its own latency, so backends can be compared and chained.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError
+from rate_governor import RateGovernor
+
+logger = logging.getLogger(__name__)
+
+class TranslationBackendError(Exception):
+    """Raised when a backend cannot translate a text"""
+
+class TranslationBackend:
+    """Base class: subclasses implement _translate(text, dest, src)"""
+
+    name = 'base'
+    # Remote backends are metered and get a rate governor
+    remote = False
+
+    def __init__(self, timeout=10, max_concurrency=4):
+        """
+        Args:
+            timeout (float): Longest wait for one translation in seconds
+            max_concurrency (int): Translations allowed in flight at once
+        """
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.governor = None
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.executor = None
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+
+    def _make_executor(self):
+        """Executor running _translate calls"""
+        return ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix=self.name)
+
+    def _submit(self, text, dest, src):
+        """Start one translation on the executor"""
+        return self.executor.submit(self._translate, text, dest, src)
+
+    def _translate(self, text, dest, src):
+        raise NotImplementedError
+
+    def translate(self, text, dest, src='en', timeout=None):
+        """
+        Translate a text within the time limit
+
+        Args:
+            text (str): Text to translate
+            dest (str): Target language code
+            src (str): Source language code
+            timeout (float): Overrides the backend timeout for this call
+
+        Returns:
+            str: Translated text
+
+        Raises:
+            TranslationBackendError: On failure, empty output, timeout or when
+                every concurrency slot stays busy for the whole timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        if not self.slots.acquire(timeout=timeout):
+            with self.lock:
+                self.calls += 1
+                self.timeouts += 1
+            raise TranslationBackendError(f"{self.name}: no free slot within {timeout:.1f}s")
+
+        try:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = self._make_executor()
+            future = self._submit(text, dest, src)
+        except Exception:
+            self.slots.release()
+            raise
+        # The slot is held until the call really finishes, even after a timeout,
+        # so a hung backend cannot pile up unbounded work
+        future.add_done_callback(lambda _: self.slots.release())
+
+        remaining = max(0.0, timeout - (time.perf_counter() - started))
+        try:
+            result = future.result(timeout=remaining)
+        except TimeoutError:
+            with self.lock:
+                self.calls += 1
+                self.timeouts += 1
+            raise TranslationBackendError(f"{self.name}: timed out after {timeout:.1f}s")
+        except Exception as e:
+            with self.lock:
+                self.calls += 1
+                self.failures += 1
+            raise TranslationBackendError(f"{self.name}: {e}") from e
+
+        with self.lock:
+            self.calls += 1
+            if not result:
+                self.failures += 1
+            else:
+                self.total_latency += time.perf_counter() - started
+        if not result:
+            raise TranslationBackendError(f"{self.name}: empty translation")
+        return result
+
+    def get_stats(self):
+        """Get call counters, average latency and rate governor metrics"""
+        with self.lock:
+            succeeded = self.calls - self.failures - self.timeouts
+            stats = {
+                'calls': self.calls,
+                'failures': self.failures,
+                'timeouts': self.timeouts,
+                'avg_latency_ms': round(self.total_latency / succeeded * 1000, 1) if succeeded > 0 else None
+            }
+        stats['governor'] = self.governor.get_stats() if self.governor else None
+        return stats
+
+    def close(self):
+        """Shut down the executor"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Remote backend on the unofficial googletrans client"""
+
+    name = 'google'
+    remote = True
+
+    def __init__(self, timeout=10, max_concurrency=4):
+        super().__init__(timeout, max_concurrency)
+        from googletrans import Translator
+        self.translator = Translator()
+
+    def _translate(self, text, dest, src):
+        translation = self.translator.translate(text, dest=dest, src=src)
+        return translation.text if translation else None
+
+_glossaries = {}
+
+def _load_glossary(path):
+    """Load a glossary once per process"""
+    if path not in _glossaries:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        _glossaries[path] = {
+            pair: {phrase.lower(): target for phrase, target in entries.items()}
+            for pair, entries in raw.items()
+        }
+    return _glossaries[path]
+
+def dictionary_translate(text, dest, src, glossary_path, min_coverage=0.6):
+    """
+    Translate word by word with a phrase glossary (runs in a worker process)
+
+    The glossary JSON maps "src-dest" pairs to phrase -> translation entries,
+    e.g. {"en-ps": {"bitcoin": "...", "price rose": "..."}}. Longest phrases
+    match first; numbers and symbols pass through unchanged.
+
+    Returns:
+        str: Translated text
+
+    Raises:
+        ValueError: When too few words are covered by the glossary
+    """
+    entries = _load_glossary(glossary_path).get(f"{src}-{dest}")
+    if not entries:
+        raise ValueError(f"no glossary entries for {src}-{dest}")
+    longest = max(len(phrase.split()) for phrase in entries)
+
+    tokens = re.findall(r"\w+(?:[.,']\w+)*|[^\w\s]", text)
+    output, covered, words, i = [], 0, 0, 0
+    while i < len(tokens):
+        token = tokens[i]
+        if not re.match(r'\w', token):
+            output.append(token)
+            i += 1
+            continue
+        words += 1
+        for size in range(min(longest, len(tokens) - i), 0, -1):
+            phrase = ' '.join(tokens[i:i + size]).lower()
+            if phrase in entries:
+                output.append(entries[phrase])
+                covered += size
+                words += size - 1
+                i += size
+                break
+        else:
+            if re.fullmatch(r'[\d.,]+', token):
+                covered += 1
+            output.append(token)
+            i += 1
+
+    if not words or covered / words < min_coverage:
+        raise ValueError(f"glossary covers {covered}/{words} words")
+    joined = re.sub(r'\s+([.,;:!?%)\]])', r'\1', ' '.join(output))
+    return re.sub(r'([$(\[])\s+', r'\1', joined)
+
+class DictionaryBackend(TranslationBackend):
+    """Offline glossary backend running in a process pool"""
+
+    name = 'dictionary'
+
+    def __init__(self, glossary_path='translation_glossary.json', timeout=5, max_concurrency=2,
+                 min_coverage=0.6):
+        """
+        Args:
+            glossary_path (str): Glossary JSON file (see dictionary_translate)
+            timeout (float): Longest wait for one translation in seconds
+            max_concurrency (int): Worker processes
+            min_coverage (float): Share of words the glossary must cover
+        """
+        super().__init__(timeout, max_concurrency)
+        if not os.path.exists(glossary_path):
+            raise TranslationBackendError(f"glossary not found: {glossary_path}")
+        self.glossary_path = glossary_path
+        self.min_coverage = min_coverage
+
+    def _make_executor(self):
+        # spawn avoids forking a process that already runs Flask and worker threads
+        return ProcessPoolExecutor(
+            max_workers=self.max_concurrency,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def _submit(self, text, dest, src):
+        return self.executor.submit(
+            dictionary_translate, text, dest, src, self.glossary_path, self.min_coverage
+        )
+
+BACKENDS = {
+    'google': GoogleTranslateBackend,
+    'dictionary': DictionaryBackend
+}
+
+def create_translation_backends(names=None, timeout=None, max_concurrency=None, glossary_path=None):
+    """
+    Build the configured backend chain
+
+    Settings come from TRANSLATION_BACKEND (comma-separated, tried in order,
+    default "google"), TRANSLATION_TIMEOUT, TRANSLATION_CONCURRENCY and
+    TRANSLATION_GLOSSARY environment variables. Remote backends get a rate
+    governor from TRANSLATION_RATE_PER_MINUTE, TRANSLATION_BURST,
+    TRANSLATION_CHAR_QUOTA, TRANSLATION_QUOTA_PERIOD and TRANSLATION_MAX_WAIT.
+
+    Returns:
+        list: Backends in fallback order; unavailable ones are skipped
+    """
+    names = names or os.getenv('TRANSLATION_BACKEND', 'google')
+    timeout = timeout if timeout is not None else float(os.getenv('TRANSLATION_TIMEOUT', '10'))
+    max_concurrency = max_concurrency or int(os.getenv('TRANSLATION_CONCURRENCY', '4'))
+    glossary_path = glossary_path or os.getenv('TRANSLATION_GLOSSARY', 'translation_glossary.json')
+
+    backends = []
+    for name in [n.strip() for n in names.split(',') if n.strip()]:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            logger.error(f"Unknown translation backend: {name}")
+            continue
+        try:
+            if backend_class is DictionaryBackend:
+                backend = DictionaryBackend(
+                    glossary_path,
+                    timeout=timeout,
+                    max_concurrency=max_concurrency
+                )
+            else:
+                backend = backend_class(timeout=timeout, max_concurrency=max_concurrency)
+            if backend.remote:
+                backend.governor = RateGovernor(
+                    backend.name,
+                    requests_per_minute=float(os.getenv('TRANSLATION_RATE_PER_MINUTE', '60')),
+                    burst=int(os.getenv('TRANSLATION_BURST', '10')),
+                    char_limit=int(os.getenv('TRANSLATION_CHAR_QUOTA', '0')),
+                    quota_period=float(os.getenv('TRANSLATION_QUOTA_PERIOD', '86400')),
+                    max_wait=float(os.getenv('TRANSLATION_MAX_WAIT', '30'))
+                )
+            backends.append(backend)
+        except Exception as e:
+            logger.error(f"Translation backend {name} unavailable: {e}")
+
+    logger.info(f"Translation backends: {', '.join(b.name for b in backends) or 'none'}")
+    return backends
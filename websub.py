@@ -0,0 +1,304 @@
+"""
+WebSub (PubSubHubbub) subscriber for the crypto news bot.
+Subscribes to feed hubs, answers verification challenges and turns
+signed content pushes into articles for the posting pipeline.
+"""
+
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+import logging
+from urllib.parse import urljoin
+from feed_stream import iter_feed_entries
+from http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_ALGORITHMS = {
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha384': hashlib.sha384,
+    'sha512': hashlib.sha512
+}
+
+# A subscription request the hub never verified is sent again after this long
+PENDING_TIMEOUT = 3600
+
+def find_hub(response, feed=None):
+    """
+    Discover the hub and topic URLs advertised by a feed
+
+    Looks at the HTTP Link header first, then at <link rel="hub"> /
+    <link rel="self"> elements parsed by feedparser.
+
+    Args:
+        response (requests.Response): Feed response
+        feed (FeedParserDict): Optional parsed feed
+
+    Returns:
+        tuple: (hub_url, topic_url), hub_url is None when the feed has no hub
+    """
+    hub = response.links.get('hub', {}).get('url')
+    topic = response.links.get('self', {}).get('url')
+
+    if feed is not None:
+        for link in feed.feed.get('links', []):
+            if link.get('rel') == 'hub' and not hub:
+                hub = link.get('href')
+            elif link.get('rel') == 'self' and not topic:
+                topic = link.get('href')
+
+    if hub:
+        hub = urljoin(response.url, hub)
+    return hub, topic or response.url
+
+class WebSubSubscriber:
+    """Manages hub subscriptions and incoming push notifications"""
+
+    def __init__(self, callback_base_url, on_entries, lease_seconds=86400, http_client=None):
+        """
+        Args:
+            callback_base_url (str): Public URL of the /websub route, e.g. https://bot.example.com/websub
+            on_entries (callable): Called as on_entries(feed_url, articles) for every valid push
+            lease_seconds (int): Lease requested from hubs
+            http_client (HTTPClient): Client for subscription requests
+        """
+        self.callback_base_url = callback_base_url.rstrip('/')
+        self.on_entries = on_entries
+        self.lease_seconds = lease_seconds
+        self.http = http_client or get_http_client()
+        self.lock = threading.Lock()
+        # callback key -> subscription state; the key is a random token only the hub learns
+        self.subscriptions = {}
+        # feed URL -> callback key
+        self.keys = {}
+        self.pushes_received = 0
+        self.pushes_rejected = 0
+
+    def _find_by_feed(self, feed_url):
+        """Get the subscription for a feed URL, if any"""
+        return self.subscriptions.get(self.keys.get(feed_url))
+
+    @staticmethod
+    def _awaiting_verification(subscription):
+        """Whether a subscribe request for this subscription is still outstanding"""
+        return (
+            (subscription['state'] == 'pending' or bool(subscription.get('pending_secret')))
+            and subscription.get('requested_at', 0) > time.time() - PENDING_TIMEOUT
+        )
+
+    def is_active(self, feed_url):
+        """
+        Check whether a feed currently receives pushes
+
+        Returns:
+            bool: True when the hub verified a subscription that has not expired
+        """
+        subscription = self._find_by_feed(feed_url)
+        return bool(
+            subscription
+            and subscription['state'] == 'active'
+            and subscription['expires_at'] > time.time()
+        )
+
+    def discover(self, feed_url, response, feed=None):
+        """
+        Subscribe to a feed's hub if it advertises one and we are not subscribed
+
+        Feeds without a hub are left to the polling loop.
+        """
+        subscription = self._find_by_feed(feed_url)
+        if subscription and self._awaiting_verification(subscription):
+            return
+        # Renew an hour before the lease runs out
+        if subscription and subscription['expires_at'] - time.time() > 3600:
+            return
+
+        hub, topic = find_hub(response, feed)
+        if not hub:
+            logger.debug(f"No WebSub hub for {feed_url}, polling only")
+            return
+
+        self.subscribe(feed_url, hub, topic)
+
+    def subscribe(self, feed_url, hub, topic):
+        """
+        Send a subscription request to a hub
+
+        Each new subscription gets a random callback token, so nobody but
+        the hub can address its callback. A renewal keeps the token and the
+        current secret valid until the hub verifies the new lease, so signed
+        pushes already on their way are still accepted.
+
+        Args:
+            feed_url (str): Feed URL the bot polls
+            hub (str): Hub URL
+            topic (str): Topic (self) URL of the feed
+
+        Returns:
+            bool: True when the hub accepted the request
+        """
+        secret = secrets.token_hex(20)
+        with self.lock:
+            key = self.keys.get(feed_url)
+            previous = self.subscriptions.get(key)
+            if previous and previous['state'] == 'active' and previous['topic'] == topic:
+                previous['pending_secret'] = secret
+                previous['requested_at'] = time.time()
+            else:
+                previous = None
+                self.subscriptions.pop(key, None)
+                key = secrets.token_urlsafe(24)
+                self.keys[feed_url] = key
+                self.subscriptions[key] = {
+                    'feed_url': feed_url,
+                    'hub': hub,
+                    'topic': topic,
+                    'secret': secret,
+                    'state': 'pending',
+                    'expires_at': 0,
+                    'requested_at': time.time()
+                }
+
+        try:
+            response = self.http.post(hub, data={
+                'hub.mode': 'subscribe',
+                'hub.topic': topic,
+                'hub.callback': f"{self.callback_base_url}/{key}",
+                'hub.secret': secret,
+                'hub.lease_seconds': str(self.lease_seconds)
+            })
+            if response.status_code not in (202, 204):
+                raise ValueError(f"hub answered {response.status_code}: {response.text[:200]}")
+            logger.info(f"WebSub subscription requested for {topic} at {hub}")
+            return True
+        except Exception as e:
+            logger.error(f"WebSub subscription failed for {topic}: {e}")
+            with self.lock:
+                if previous is not None:
+                    # The current lease still holds; try again on a later fetch
+                    previous.pop('pending_secret', None)
+                    previous['requested_at'] = 0
+                else:
+                    self.subscriptions.pop(key, None)
+                    if self.keys.get(feed_url) == key:
+                        del self.keys[feed_url]
+            return False
+
+    def verify_intent(self, key, args):
+        """
+        Answer a hub verification request (GET on the callback)
+
+        Args:
+            key (str): Callback key from the URL
+            args (dict): Query parameters
+
+        Returns:
+            tuple: (response body, HTTP status)
+        """
+        subscription = self.subscriptions.get(key)
+        mode = args.get('hub.mode')
+        if not subscription or args.get('hub.topic') != subscription['topic']:
+            logger.warning(f"WebSub verification for unknown topic: {args.get('hub.topic')}")
+            return 'unknown topic', 404
+
+        if mode == 'denied':
+            logger.warning(f"WebSub subscription denied for {subscription['topic']}: {args.get('hub.reason')}")
+            with self.lock:
+                self.subscriptions.pop(key, None)
+                if self.keys.get(subscription['feed_url']) == key:
+                    del self.keys[subscription['feed_url']]
+            return '', 200
+
+        if mode != 'subscribe' or 'hub.challenge' not in args:
+            return 'unsupported mode', 404
+
+        if not self._awaiting_verification(subscription):
+            # Only a hub answering our own request may (re)activate a subscription
+            logger.warning(f"Unexpected WebSub verification for {subscription['topic']}, no request outstanding")
+            return 'no pending subscription', 404
+
+        try:
+            lease = int(args.get('hub.lease_seconds') or self.lease_seconds)
+        except ValueError:
+            logger.warning(f"WebSub verification with invalid lease: {args.get('hub.lease_seconds')!r}")
+            return 'invalid lease', 400
+        with self.lock:
+            if subscription.get('pending_secret'):
+                # The renewal is verified: pushes are signed with the new secret from now on
+                subscription['secret'] = subscription.pop('pending_secret')
+            subscription['state'] = 'active'
+            subscription['expires_at'] = time.time() + lease
+        logger.info(f"WebSub subscription active for {subscription['topic']} ({lease}s lease)")
+        return args['hub.challenge'], 200
+
+    def _signature_valid(self, secret, body, header):
+        """Check the X-Hub-Signature header against the shared secret"""
+        if not header or '=' not in header:
+            return False
+        method, signature = header.split('=', 1)
+        digest = SIGNATURE_ALGORITHMS.get(method.lower())
+        if digest is None:
+            return False
+        expected = hmac.new(secret.encode('utf-8'), body, digest).hexdigest()
+        return hmac.compare_digest(expected, signature.strip().lower())
+
+    def receive(self, key, body, headers):
+        """
+        Handle a content distribution request (POST on the callback)
+
+        Invalid signatures are acknowledged but ignored, as the WebSub spec asks.
+
+        Args:
+            key (str): Callback key from the URL
+            body (bytes): Raw request body
+            headers (Mapping): Request headers
+
+        Returns:
+            tuple: (response body, HTTP status)
+        """
+        subscription = self.subscriptions.get(key)
+        if not subscription:
+            return 'unknown subscription', 410
+
+        signature = headers.get('X-Hub-Signature')
+        secrets_in_use = [subscription['secret'], subscription.get('pending_secret')]
+        if not any(secret and self._signature_valid(secret, body, signature) for secret in secrets_in_use):
+            self.pushes_rejected += 1
+            logger.warning(f"Rejected WebSub push with bad signature for {subscription['topic']}")
+            return '', 202
+
+        self.pushes_received += 1
+        try:
+            articles = [
+                a for a in iter_feed_entries([body])
+                if a['link'] and a['title']
+            ]
+        except Exception as e:
+            logger.error(f"Could not parse WebSub push for {subscription['topic']}: {e}")
+            return '', 202
+
+        for article in articles:
+            article['source'] = subscription['feed_url']
+
+        logger.info(f"WebSub push with {len(articles)} entries for {subscription['topic']}")
+        # Hubs expect a fast answer, so posting happens off the request thread
+        threading.Thread(
+            target=self.on_entries,
+            args=(subscription['feed_url'], articles),
+            daemon=True
+        ).start()
+        return '', 202
+
+    def get_stats(self):
+        """Get subscription and push statistics"""
+        return {
+            'subscriptions': {
+                s['feed_url']: {'hub': s['hub'], 'state': s['state']}
+                for s in self.subscriptions.values()
+            },
+            'pushes_received': self.pushes_received,
+            'pushes_rejected': self.pushes_rejected
+        }